@@ -1,8 +1,25 @@
+import bz2
+import codecs
 import csv
 import gzip
 import io
-import json
+import lzma
+import mmap
+import os
+import queue
+import random
+import re
+import struct
+import threading
+import zipfile
+import zlib
+from collections import deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from importlib import import_module
+
+import G2Json
+from G2S3 import G2S3
 
 
 class G2UnsupportedFileTypeException(Exception):
@@ -29,47 +46,682 @@ def getSuffix(str_):
     return str_[suffixIdx:]
 
 
-def isCompressedFile(filename_):
+# Compression formats by file suffix and by the magic bytes starting the file
+COMPRESSED_SUFFIXES = {
+    '.gz': 'gzip',
+    '.gzip': 'gzip',
+    '.zip': 'zip',
+    '.zst': 'zstd',
+    '.zstd': 'zstd',
+    '.bz2': 'bz2',
+    '.xz': 'xz',
+    '.lzma': 'xz',
+}
+
+COMPRESSED_MAGIC_BYTES = (
+    (b'\x1f\x8b', 'gzip'),
+    (b'PK\x03\x04', 'zip'),
+    (b'\x28\xb5\x2f\xfd', 'zstd'),
+    (b'BZh', 'bz2'),
+    (b'\xfd7zXZ\x00', 'xz'),
+)
+
+
+def hasCompressedSuffix(filename_):
 
     suffix = getSuffix(filename_)
 
-    return True if suffix and suffix.lower() in ('.gz', '.gzip', '.zip') else False
+    return True if suffix and suffix.lower() in COMPRESSED_SUFFIXES else False
 
 
-def openPossiblyCompressedFile(filename_, options_, encoding_='utf-8-sig'):
+def compressionFormat(filename_):
+    ''' Compression format of a file from its magic bytes, or its suffix if it can't be read. None if not compressed '''
 
-    suffix = getSuffix(filename_)
+    try:
+        with open(filename_, 'rb') as f:
+            return magicCompressionFormat(f.read(6))
+    except OSError:
+        suffix = getSuffix(filename_)
+        return COMPRESSED_SUFFIXES.get(suffix.lower()) if suffix else None
 
-    if suffix and suffix.lower() == '.zip':
-        raise G2UnsupportedFileTypeException('zip files are not currently supported, please use gzip')
 
-    if suffix and suffix.lower() in ('.gz', '.gzip'):
-        try:
-            f = gzip.open(filename_, options_)
+def magicCompressionFormat(magic_):
+    ''' Compression format from the bytes starting a file, None if not compressed '''
+
+    for magicBytes, compression in COMPRESSED_MAGIC_BYTES:
+        if magic_.startswith(magicBytes):
+            return compression
+
+    return None
+
+
+def isCompressedFile(filename_):
+
+    return compressionFormat(filename_) is not None
+
+
+def openPossiblyCompressedFile(filename_, options_, encoding_='utf-8-sig', threadedDecompress_=False):
+    ''' Open a file or S3 URI for reading as text, the compression format is detected from the file content.
+
+        S3 objects are streamed with ranged requests, nothing is downloaded to a temporary file. gzip files are
+        decompressed in a separate thread when threadedDecompress_. The members of a zip file are read in order as one
+        file. zstd requires the zstandard package.
+    '''
+
+    if G2S3.isS3Uri(filename_):
+        source = io.BufferedReader(G2S3(filename_).openReader(), buffer_size=1024 * 1024)
+        compression = magicCompressionFormat(source.peek(6)[:6])
+    else:
+        source = filename_
+        compression = compressionFormat(filename_)
+
+    if compression == 'gzip':
+        # The threaded reader checks it's a gzip file when opened
+        if threadedDecompress_:
+            f = ThreadedGzipReader(source)
+        else:
+            f = gzip.open(source, options_)
             # read the first line to make sure we can read this gzip file
             peekLine(f)
-            return io.TextIOWrapper(io.BufferedReader(f), encoding=encoding_, errors='ignore')
-        except IOError:
-            # handle regular ZIP (non gzip) files later
-            # if 'Not a gzipped file' in e.message:
-            #     return zipfile.ZipFile(filename_, mode=options_)
-            raise
+            f = ClosingReader(f, source) if source is not filename_ else f
+        return io.TextIOWrapper(io.BufferedReader(f), encoding=encoding_, errors='ignore')
+
+    if compression == 'bz2':
+        f = bz2.open(source, 'rb')
+        f = ClosingReader(f, source) if source is not filename_ else f
+        return io.TextIOWrapper(io.BufferedReader(f), encoding=encoding_, errors='ignore')
+
+    if compression == 'xz':
+        f = lzma.open(source, 'rb')
+        f = ClosingReader(f, source) if source is not filename_ else f
+        return io.TextIOWrapper(io.BufferedReader(f), encoding=encoding_, errors='ignore')
+
+    if compression == 'zstd':
+        try:
+            zstandard = import_module('zstandard')
+        except ImportError:
+            raise G2UnsupportedFileTypeException('zstd files require the zstandard package, pip install zstandard')
+        f = zstandard.ZstdDecompressor().stream_reader(open(source, 'rb') if source is filename_ else source, closefd=True)
+        return io.TextIOWrapper(io.BufferedReader(f), encoding=encoding_, errors='ignore')
+
+    if compression == 'zip':
+        f = ZipMembersReader(source)
+        f = ClosingReader(f, source) if source is not filename_ else f
+        return io.TextIOWrapper(io.BufferedReader(f), encoding=encoding_, errors='ignore')
 
     # not a compressed archive
+    if source is not filename_:
+        return io.TextIOWrapper(source, encoding=encoding_)
+
     return io.open(filename_, options_, encoding=encoding_)
 
 
+class ClosingReader(io.RawIOBase):
+    ''' Binary reader closing the file a decompressor reads from when the decompressor is closed. The decompressors
+        don't close file objects they are given, only files they open.
+    '''
+
+    def __init__(self, reader_, file_):
+
+        super().__init__()
+        self.reader = reader_
+        self.file = file_
+
+    def readable(self):
+        return True
+
+    def readinto(self, b_):
+        return self.reader.readinto(b_)
+
+    def close(self):
+
+        if not self.closed:
+            self.reader.close()
+            self.file.close()
+        super().close()
+
+
+class ZipMembersReader(io.RawIOBase):
+    ''' Binary reader of the file members of a zip archive in name order, as one file
+
+        A newline is added between members not ending with one. Members of delimited files should not repeat the
+        header row after the first member.
+    '''
+
+    def __init__(self, filename_):
+
+        super().__init__()
+        self.zip = zipfile.ZipFile(filename_)
+        self.members = sorted(info.filename for info in self.zip.infolist() if not info.is_dir())
+        if not self.members:
+            self.zip.close()
+            raise G2UnsupportedFileTypeException(f'No files in zip archive {filename_}')
+        self.member = None
+        self.lastByte = b'\n'
+
+    def readable(self):
+        return True
+
+    def readinto(self, b_):
+
+        while True:
+            if not self.member:
+                if not self.members:
+                    return 0
+                self.member = self.zip.open(self.members.pop(0))
+
+            size = self.member.readinto(b_)
+            if size:
+                self.lastByte = bytes(b_[size - 1:size])
+                return size
+
+            self.member.close()
+            self.member = None
+
+            if self.lastByte != b'\n' and self.members:
+                b_[:1] = b'\n'
+                self.lastByte = b'\n'
+                return 1
+
+    def close(self):
+
+        if not self.closed:
+            if self.member:
+                self.member.close()
+            self.zip.close()
+        super().close()
+
+
+class ThreadedGzipReader(io.RawIOBase):
+    ''' Binary reader decompressing a gzip file in a separate thread, ahead of the reader by up to readAhead_ chunks
+
+        zlib releases the GIL while decompressing, so decompression runs on another core to parsing the lines. Files
+        of concatenated members are supported. BGZF files (bgzip) are made of small independent members that
+        are decompressed in parallel by decompressThreads_ threads.
+    '''
+
+    BGZF_HEADER = struct.Struct('<4BI2BH2B2H')
+
+    def __init__(self, filename_, readAhead_=16, chunkSize_=256 * 1024, decompressThreads_=4):
+
+        super().__init__()
+        # A file name or an opened seekable binary file, such as an S3 object reader
+        self.file = open(filename_, 'rb') if isinstance(filename_, (str, os.PathLike)) else filename_
+        if self.file.read(2) != b'\x1f\x8b':
+            self.file.close()
+            raise gzip.BadGzipFile(f'Not a gzipped file ({getattr(filename_, "name", filename_)})')
+        self.file.seek(0)
+
+        self.chunkSize = chunkSize_
+        self.decompressThreads = decompressThreads_
+        self.chunks = queue.Queue(maxsize=max(1, readAhead_))
+        self.stopping = threading.Event()
+        self.buffer = memoryview(b'')
+        self.finished = False
+
+        self.thread = threading.Thread(target=self.decompress, daemon=True)
+        self.thread.start()
+
+    def readable(self):
+        return True
+
+    def isBgzf(self):
+        ''' BGZF members have an extra field with the BC subfield holding the compressed member size '''
+
+        header = self.file.read(self.BGZF_HEADER.size)
+        self.file.seek(0)
+        if len(header) < self.BGZF_HEADER.size:
+            return False
+
+        _, _, _, flags, _, _, _, extraLen, si1, si2, _, _ = self.BGZF_HEADER.unpack(header)
+        return bool(flags & 4) and extraLen >= 6 and (si1, si2) == (66, 67)
+
+    def bgzfMembers(self):
+        ''' Compressed BGZF members, each a complete gzip member '''
+
+        while not self.stopping.is_set():
+            header = self.file.read(self.BGZF_HEADER.size)
+            if not header:
+                return
+            if len(header) < self.BGZF_HEADER.size:
+                raise EOFError('Truncated BGZF member')
+
+            blockSize = self.BGZF_HEADER.unpack(header)[-1] + 1
+            yield header + self.file.read(blockSize - len(header))
+
+    def put(self, item_):
+        ''' Blocks while the read ahead is full, returns False if the reader was closed '''
+
+        while not self.stopping.is_set():
+            try:
+                self.chunks.put(item_, timeout=0.5)
+                return True
+            except queue.Full:
+                pass
+
+        return False
+
+    def decompress(self):
+
+        try:
+            if self.isBgzf():
+                # Chunks are futures, the read ahead limits the members being decompressed at once
+                with ThreadPoolExecutor(max_workers=self.decompressThreads) as executor:
+                    for member in self.bgzfMembers():
+                        if not self.put(executor.submit(zlib.decompress, member, 31)):
+                            return
+            else:
+                decompressor = zlib.decompressobj(31)
+                while not self.stopping.is_set():
+                    data = self.file.read(self.chunkSize)
+                    if not data:
+                        break
+
+                    while data:
+                        # Start of the next member of a multi member file, ignoring trailing zero padding
+                        if decompressor.eof:
+                            data = data.lstrip(b'\x00')
+                            if not data:
+                                break
+                            decompressor = zlib.decompressobj(31)
+
+                        chunk = decompressor.decompress(data)
+                        if chunk and not self.put(chunk):
+                            return
+                        data = decompressor.unused_data if decompressor.eof else b''
+
+                if not self.stopping.is_set() and not decompressor.eof:
+                    raise EOFError('Compressed file ended before the end-of-stream marker was reached')
+
+            self.put(None)
+
+        except Exception as ex:
+            self.put(ex)
+
+    def readinto(self, b_):
+
+        while not self.buffer:
+            if self.finished:
+                return 0
+
+            item = self.chunks.get()
+            if item is None:
+                self.finished = True
+                return 0
+            if isinstance(item, Exception):
+                self.finished = True
+                raise item
+            if not isinstance(item, bytes):
+                item = item.result()
+
+            self.buffer = memoryview(item)
+
+        size = min(len(b_), len(self.buffer))
+        b_[:size] = self.buffer[:size]
+        self.buffer = self.buffer[size:]
+
+        return size
+
+    def close(self):
+
+        if not self.closed:
+            self.stopping.set()
+            self.thread.join()
+            self.file.close()
+        super().close()
+
+
+class ShuffledLineReader:
+    ''' Bounded memory streaming shuffle of lines read from any file reader
+
+        Keeps a window of window_size_ lines, or fewer when they total window_bytes_, each line returned is picked at
+        random from the window and replaced by the next line read. Works on compressed and S3 sourced files as it never
+        needs to seek or write a copy of the file.
+
+        The first in_order_ lines are returned in source order before shuffling and reading stops after stop_ lines, so
+        lines skipped or stopped at by row number are the same lines as without shuffling.
+    '''
+
+    def __init__(self, reader_, window_size_=100000, seed_=None, window_bytes_=0, in_order_=0, stop_=0):
+
+        self.reader = reader_
+        self.window_size = max(1, window_size_)
+        self.window_bytes = window_bytes_
+        self.in_order = in_order_
+        self.stop = stop_
+        self.window = []
+        self.bytes = 0
+        self.rows_read = 0
+        self.exhausted = False
+        self.random = random.Random(seed_)
+
+    def __iter__(self):
+        return self
+
+    def readLine(self):
+
+        if self.stop and self.rows_read >= self.stop:
+            raise StopIteration
+
+        # Lines that fail to read are counted, as callers count them as rows
+        self.rows_read += 1
+        return next(self.reader)
+
+    def __next__(self):
+
+        # Lines at the start are returned in source order
+        if not self.exhausted and self.rows_read < self.in_order:
+            try:
+                return self.readLine()
+            except StopIteration:
+                self.exhausted = True
+
+        # Fill the window, errors reading a line are raised to the caller and the next call resumes filling
+        while not self.exhausted and len(self.window) < self.window_size and (not self.window_bytes or self.bytes < self.window_bytes):
+            try:
+                line = self.readLine()
+            except StopIteration:
+                self.exhausted = True
+                break
+            self.window.append(line)
+            self.bytes += rowSize(line)
+
+        if not self.window:
+            raise StopIteration
+
+        idx = self.random.randrange(len(self.window))
+        self.window[idx], self.window[-1] = self.window[-1], self.window[idx]
+
+        line = self.window.pop()
+        self.bytes -= rowSize(line)
+
+        return line
+
+    def close(self):
+        self.window = []
+        self.reader.close()
+
+
+def rowSize(row_):
+    ''' Approximate size of a row read, rows from DelimitedRowReader are lists of fields '''
+
+    return sum(map(len, row_)) if isinstance(row_, list) else len(row_)
+
+
+def lineAlignedRanges(filename_, numRanges_, startOffset_=0):
+    ''' Split an uncompressed file from startOffset_ into numRanges_ (start, end) byte ranges starting on line boundaries.
+        Ranges can be empty for small files.
+    '''
+
+    fileSize = os.path.getsize(filename_)
+    rangeSize = max(1, (fileSize - startOffset_) // numRanges_)
+    boundaries = [min(startOffset_, fileSize)]
+
+    with open(filename_, 'rb') as f:
+        for rangeNum in range(1, numRanges_):
+            pos = max(startOffset_ + rangeNum * rangeSize, boundaries[-1])
+            if pos >= fileSize:
+                boundaries.append(fileSize)
+                continue
+
+            # Move to the start of the next line, pos is already a line start if the prior byte is a newline
+            f.seek(pos - 1)
+            f.readline()
+            boundaries.append(min(f.tell(), fileSize))
+
+    boundaries.append(fileSize)
+
+    return list(zip(boundaries[:-1], boundaries[1:]))
+
+
+class LineRangeReader:
+    ''' Read the lines in a byte range of an uncompressed file, see lineAlignedRanges() '''
+
+    def __init__(self, filename_, start_, end_, encoding_='utf-8-sig'):
+
+        self.file = open(filename_, 'rb')
+        self.file.seek(start_)
+        self.pos = start_
+        self.end = end_
+        self.encoding = encoding_
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+
+        if self.pos >= self.end:
+            raise StopIteration
+
+        line = self.file.readline()
+        if not line:
+            raise StopIteration
+        self.pos += len(line)
+
+        # Position has moved on, a line that can't be decoded is raised to the caller and the next call continues
+        return line.decode(self.encoding)
+
+    def close(self):
+        self.file.close()
+
+
+class MappedLineReader:
+    ''' Read the lines of an uncompressed file, or a byte range of it, from a memory map
+
+        Lines are returned as bytes without decoding, the JSON parser reads UTF-8 bytes directly and fileRowParser()
+        decodes other formats. Avoids the decode to str and the buffered reader copies of a text mode file.
+    '''
+
+    def __init__(self, filename_, start_=0, end_=None):
+
+        self.file = open(filename_, 'rb')
+        fileSize = os.fstat(self.file.fileno()).st_size
+        self.end = fileSize if end_ is None else min(end_, fileSize)
+        self.pos = start_
+
+        # An empty file can't be mapped
+        self.map = None
+        if fileSize:
+            self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+            if hasattr(self.map, 'madvise'):
+                self.map.madvise(mmap.MADV_SEQUENTIAL)
+
+            # Skip a UTF-8 byte order mark, as the utf-8-sig encoding does for text mode files
+            if start_ == 0 and self.map[:len(codecs.BOM_UTF8)] == codecs.BOM_UTF8:
+                self.pos = len(codecs.BOM_UTF8)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+
+        if self.pos >= self.end:
+            raise StopIteration
+
+        lineEnd = self.map.find(b'\n', self.pos, self.end)
+        lineEnd = self.end if lineEnd == -1 else lineEnd + 1
+        line = self.map[self.pos:lineEnd]
+        self.pos = lineEnd
+
+        return line
+
+    def close(self):
+        if self.map:
+            self.map.close()
+        self.file.close()
+
+
+class DelimitedRowReader:
+    ''' Parse the lines of a delimited file with one csv reader over the whole file, returns lists of fields
+
+        Avoids creating a csv reader for each line and quoted fields spanning lines are returned as one row. Lines
+        can be str or bytes, bytes are decoded. The lists are handled by fileRowParser() as already parsed rows.
+        Multi character delimiters aren't supported by the csv module, use fileRowParser() on the lines.
+
+        A row spanning more than maxRowLines_ lines has an unbalanced quote, it raises csv.Error and the lines after
+        its first are read again. A line that isn't valid UTF-8 is returned as read for fileRowParser() to report.
+    '''
+
+    def __init__(self, reader_, delimiter_, maxRowLines_=100):
+
+        self.reader = reader_
+        self.maxRowLines = maxRowLines_
+        self.pending = deque()
+        self.rowLines = []
+        self.undecodable = None
+        # A callable iterator carries on after the callable raises, a generator would end
+        self.rows = csv.reader(iter(self.nextLine, None), delimiter=delimiter_, skipinitialspace=True)
+
+    def nextLine(self):
+
+        if len(self.rowLines) >= self.maxRowLines:
+            self.pending.extendleft(reversed(self.rowLines[1:]))
+            self.rowLines = []
+            raise csv.Error(f'quoted field spans more than {self.maxRowLines} lines, unbalanced quote')
+
+        line = self.pending.popleft() if self.pending else next(self.reader)
+        if isinstance(line, bytes):
+            try:
+                line = line.decode('utf-8')
+            except UnicodeDecodeError:
+                self.undecodable = line
+                raise
+
+        self.rowLines.append(line)
+        return line
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        # A row the csv module can't parse raises csv.Error, the next call continues with the following line
+        self.rowLines = []
+        try:
+            return next(self.rows)
+        except UnicodeDecodeError:
+            if self.undecodable is None:
+                raise
+            line, self.undecodable = self.undecodable, None
+            return line
+
+    def close(self):
+        self.reader.close()
+
+
+def isDelimitedRowFile(fileData_):
+    ''' True if the rows of the file can be read with DelimitedRowReader '''
+
+    return fileData_['FILE_FORMAT'] not in ('JSON', 'JSONL', 'UMF') and len(fileData_.get('DELIMITER') or '') == 1
+
+
 def removeQuoteChar(s):
     if len(s) > 1 and s[0] + s[-1] in ("''", '""'):
         return s[1:-1]
     return s
 
 
-def fileRowParser(line, fileData, rowNum=0, errors_file=None, errors_short=False, errors_disable=False):
+# A JSON row sent to the engine as read, see fileRowPassThrough()
+PassThroughRecord = namedtuple('PassThroughRecord', ['DATA_SOURCE', 'RECORD_ID', 'JSON'])
+
+PASS_THROUGH_KEYS = {key: re.compile(f'"{key}"\\s*:\\s*') for key in ('DATA_SOURCE', 'RECORD_ID', 'LOAD_ID', 'DSRC_ACTION')}
+PASS_THROUGH_STRING = re.compile(r'"([^"\\]*)"')
+PASS_THROUGH_INTEGER = re.compile(r'-?\d+(?=\s*[,}])')
+PASS_THROUGH_TOKENS = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"|[{}\[\]]')
+
+
+def passThroughTopLevel(line, end):
+    ''' Starts of the strings directly in the top level object of a JSON row up to end, skipping over strings and
+        tracking the depth of nested objects and arrays
+    '''
+
+    starts = set()
+    depth = 0
+    for token in PASS_THROUGH_TOKENS.finditer(line, 0, end):
+        char = line[token.start()]
+        if char == '"':
+            if depth == 1:
+                starts.add(token.start())
+        elif char in '{[':
+            depth += 1
+        else:
+            depth -= 1
+
+    return starts
+
+
+def fileRowPassThrough(line, fileData):
+    ''' Scan a JSON row for the keys the loader needs without parsing it. Returns a PassThroughRecord with the row,
+        DATA_SOURCE and LOAD_ID file defaults are added to the text if missing.
+
+        Returns None for rows that need parsing, when a key occurs more than once or in a nested object or array,
+        DSRC_ACTION is present, a value isn't a plain string or integer or the row doesn't look like a JSON object.
+    '''
+
+    if fileData['FILE_FORMAT'] not in ('JSON', 'JSONL'):
+        return None
+
+    if isinstance(line, bytes):
+        try:
+            line = line.decode('utf-8')
+        except UnicodeDecodeError:
+            return None
+
+    line = line.strip()
+    if not (line.startswith('{') and line.endswith('}')) or not line[1:-1].strip():
+        return None
+
+    keyMatches = {}
+    for key, keyPattern in PASS_THROUGH_KEYS.items():
+        matches = list(keyPattern.finditer(line))
+        if not matches:
+            continue
+        if len(matches) > 1 or key == 'DSRC_ACTION':
+            return None
+        keyMatches[key] = matches[0]
+
+    # Keys must be in the top level object, rows with nested objects or arrays are scanned up to the last key
+    if keyMatches and (line.count('{') > 1 or '[' in line):
+        topLevel = passThroughTopLevel(line, max(match.end() for match in keyMatches.values()))
+        if any(match.start() not in topLevel for match in keyMatches.values()):
+            return None
+
+    values = {}
+    for key, match in keyMatches.items():
+        value = PASS_THROUGH_STRING.match(line, match.end())
+        if not value and key == 'RECORD_ID':
+            value = PASS_THROUGH_INTEGER.match(line, match.end())
+            values[key] = value.group() if value else None
+        else:
+            values[key] = value.group(1) if value else None
+        if values[key] is None:
+            return None
+
+    # File defaults, added at the start of the object
+    defaults = []
+    if 'DATA_SOURCE' not in values:
+        if 'DATA_SOURCE' not in fileData:
+            return None
+        values['DATA_SOURCE'] = fileData['DATA_SOURCE']
+        defaults.append(f'"DATA_SOURCE": {G2Json.dumps(fileData["DATA_SOURCE"])}')
+    if 'LOAD_ID' not in values:
+        defaults.append(f'"LOAD_ID": {G2Json.dumps(fileData["FILE_NAME"])}')
+
+    if defaults:
+        rest = line[1:].lstrip()
+        line = '{' + ', '.join(defaults) + ('' if rest.startswith('}') else ', ') + rest
+
+    return PassThroughRecord(values['DATA_SOURCE'], values.get('RECORD_ID', ''), line)
+
+
+def fileRowParser(line, fileData, rowNum=0, errors_file=None, errors_short=False, errors_disable=False, quiet=False):
+    ''' Parse a source row, bad and blank rows are reported unless quiet, when the caller reports them later '''
 
     def write_error(row_num, line, msg='ERROR: Unknown error'):
         ''' Write error to terminal and file if not disabled '''
 
+        if quiet:
+            return
+
         print(f'  ERROR: {msg} {row_num} ({line[:50]})', flush=True)
 
         if errors_file and not errors_disable:
@@ -79,18 +731,38 @@ def fileRowParser(line, fileData, rowNum=0, errors_file=None, errors_short=False
                 errors_file.write(f'\n{str(datetime.now())} ERROR: {msg} {rowNum}\n')
             errors_file.flush()
 
+    # Rows from DelimitedRowReader are already parsed into fields
+    if isinstance(line, list):
+        rowData = [removeQuoteChar(x.strip()) for x in line]
+        if len(''.join(rowData).strip()) == 0:
+            if not quiet:
+                print(f'  WARNING: Row {rowNum} is blank')
+            return None if not line else ''
+        if 'HEADER_ROW' in fileData:
+            rowData = dict(zip(fileData['HEADER_ROW'], rowData))
+        return rowData
+
+    # Lines from MappedLineReader are bytes, JSON is parsed from the bytes and other formats are decoded
+    if isinstance(line, bytes) and fileData['FILE_FORMAT'] not in ('JSON', 'JSONL'):
+        try:
+            line = line.decode('utf-8')
+        except UnicodeDecodeError:
+            write_error(rowNum, line.decode('utf-8', errors='replace').strip(), 'Row could not be decoded')
+            return None
+
     line = line.strip()
 
     if len(line) == 0:
-        print(f'  WARNING: Row {rowNum} is blank')
+        if not quiet:
+            print(f'  WARNING: Row {rowNum} is blank')
         return None
 
     # Its a JSON string
     if fileData['FILE_FORMAT'] in ('JSON', 'JSONL'):
         try:
-            rowData = json.loads(line)
+            rowData = G2Json.loads(line)
         except Exception:
-            write_error(rowNum, line, 'Invalid JSON in row')
+            write_error(rowNum, line.decode('utf-8', errors='replace') if isinstance(line, bytes) else line, 'Invalid JSON in row')
             return None
 
         return rowData
@@ -116,13 +788,15 @@ def fileRowParser(line, fileData, rowNum=0, errors_file=None, errors_short=False
         except Exception:
             write_error(rowNum, line, 'Row could not be parsed')
             try:
-                print(line)
+                if not quiet:
+                    print(line)
             except Exception:
                 pass
             return None
 
         if len(''.join(map(str, rowData)).strip()) == 0:
-            print(f'  WARNING: Row {rowNum} is blank')
+            if not quiet:
+                print(f'  WARNING: Row {rowNum} is blank')
             return ''  # skip rows with no data
         if 'HEADER_ROW' in fileData:
             rowData = dict(zip(fileData['HEADER_ROW'], rowData))
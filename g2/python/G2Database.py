@@ -3,14 +3,143 @@
 import os
 import sys
 import json
+import threading
+import time
 import urllib.parse
+import weakref
+from collections import deque
+from contextlib import suppress
 from importlib import import_module
 
+
+# ======================
+class ThreadCheckout:
+    """ kept in the thread local data of a thread with a connection checked out, deleted when the thread ends """
+
+
+# ======================
+class G2ConnectionPool:
+    """ connections to one database node, each thread checks out its own connection and keeps it until it
+        releases it or the thread ends. Idle connections are health checked before reuse and reconnected if lost.
+    """
+
+    # ----------------------------------------
+    def __init__(self, connectFunc, checkFunc, minSize=1, maxSize=None, timeout=60, idleCheckSecs=30):
+        self.connectFunc = connectFunc
+        self.checkFunc = checkFunc
+        self.maxSize = maxSize
+        self.timeout = timeout
+        self.idleCheckSecs = idleCheckSecs
+        self.condition = threading.Condition()
+        self.local = threading.local()
+        self.closed = False
+
+        # --idle connections and when they were returned, the most recently used is reused first
+        self.idle = deque()
+        self.size = 0
+        for i in range(minSize):
+            self.idle.append((self.connectFunc(), time.monotonic()))
+            self.size += 1
+
+    # ----------------------------------------
+    def checkout(self):
+        """ the calling thread's connection, checked out of the pool on first use """
+        box = getattr(self.local, 'box', None)
+        if box:
+            return box['dbo']
+
+        with self.condition:
+            if self.closed:
+                raise Exception('ERROR: database connection pool is closed')
+            while not self.idle and self.maxSize and self.size >= self.maxSize:
+                if not self.condition.wait(self.timeout):
+                    raise Exception(f'ERROR: timed out after {self.timeout} seconds waiting for one of {self.maxSize} database connections')
+            if self.idle:
+                dbo, lastUsed = self.idle.pop()
+            else:
+                dbo, lastUsed = None, None
+                self.size += 1
+
+        try:
+            if not dbo:
+                dbo = self.connectFunc()
+            elif time.monotonic() - lastUsed >= self.idleCheckSecs and not self.checkFunc(dbo):
+                with suppress(Exception):
+                    dbo.close()
+                dbo = self.connectFunc()
+        except Exception:
+            self.checkin({'dbo': None})
+            raise
+
+        # --returned to the pool by release() or when the thread ends and its thread local data is deleted
+        box = {'dbo': dbo}
+        self.local.box = box
+        self.local.checkout = ThreadCheckout()
+        self.local.release = weakref.finalize(self.local.checkout, self.checkin, box)
+        return dbo
+
+    # ----------------------------------------
+    def checkin(self, box):
+        dbo = box['dbo']
+        with self.condition:
+            if dbo and not self.closed:
+                self.idle.append((dbo, time.monotonic()))
+            else:
+                self.size -= 1
+                if dbo:
+                    with suppress(Exception):
+                        dbo.close()
+            self.condition.notify()
+
+    # ----------------------------------------
+    def release(self):
+        """ return the calling thread's connection to the pool, cursors on it must not be used after """
+        release = getattr(self.local, 'release', None)
+        self.local.__dict__.clear()
+        if release:
+            release()
+
+    # ----------------------------------------
+    def reconnect(self):
+        """ replace the calling thread's connection, returns True if it was lost and has been replaced """
+        box = getattr(self.local, 'box', None)
+        if not box or self.checkFunc(box['dbo']):
+            return False
+
+        with suppress(Exception):
+            box['dbo'].close()
+        try:
+            box['dbo'] = self.connectFunc()
+        except Exception:
+            box['dbo'] = None
+            self.release()
+            raise
+        return True
+
+    # ----------------------------------------
+    def close(self):
+        """ close idle connections, connections checked out are closed when returned """
+        self.release()
+        with self.condition:
+            self.closed = True
+            while self.idle:
+                with suppress(Exception):
+                    self.idle.pop()[0].close()
+                self.size -= 1
+            self.condition.notify_all()
+
+
 # ======================
 class G2Database:
 
+    # --cheapest statement for each database type, run to check idle connections are still alive
+    CHECK_SQL = {'OCI': 'SELECT 1 FROM DUAL', 'DB2': 'SELECT 1 FROM SYSIBM.SYSDUMMY1'}
+
     # ----------------------------------------
-    def __init__(self, param_str):
+    def __init__(self, param_str, pool_min=1, pool_max=None, pool_timeout=60):
+        """ each thread gets its own connection to each node from a pool of pool_min to pool_max connections
+            (no limit if None), waiting up to pool_timeout seconds for one when all are in use
+        """
         self.success = False
         self.imports = []
         if not param_str.startswith('{'): # for backwards compatibility
@@ -18,6 +147,7 @@ class G2Database:
         else:
             param_data = json.loads(param_str)
 
+        self.pool_settings = {'minSize': max(pool_min, 1), 'maxSize': pool_max, 'timeout': pool_timeout}
         self.connections = {'MAIN': {}}
         self.tables_by_connection = {}
         self.statement_cache = {}
@@ -79,30 +209,38 @@ class G2Database:
             except ImportError as err:
                 raise ImportError('ERROR: could not import sqlite3 module\n\nPlease ensure the python sqlite3 module is available')
 
+        self.connections[node]['pool'] = G2ConnectionPool(lambda: self.newConnection(node), lambda dbo: self.checkConnection(node, dbo), **self.pool_settings)
+
+        # --for backwards compatibility, the connection of the thread creating the G2Database
+        self.connections[node]['dbo'] = self.getConnection(node)
+
+    # ----------------------------------------
+    def newConnection(self, node):
+        """ open a connection to a node """
         try:
             if self.connections[node]['dbtype'] == 'MYSQL':
-                self.connections[node]['dbo'] = self.pyodbc.connect('DRIVER={' + self.connections[node]['dbtype'] + '};SERVER=' + self.connections[node]['dsn'] + ';PORT=' + self.connections[node]['port'] + ';DATABASE=' + self.connections[node]['schema'] + ';UID=' + self.connections[node]['userid'] + '; PWD=' + self.connections[node]['password'], autocommit=True)
+                dbo = self.pyodbc.connect('DRIVER={' + self.connections[node]['dbtype'] + '};SERVER=' + self.connections[node]['dsn'] + ';PORT=' + self.connections[node]['port'] + ';DATABASE=' + self.connections[node]['schema'] + ';UID=' + self.connections[node]['userid'] + '; PWD=' + self.connections[node]['password'], autocommit=True)
             elif self.connections[node]['dbtype'] == 'SQLITE3':
                 if not os.path.isfile(self.connections[node]['dsn']):
                     raise Exception('ERROR: sqlite3 database file not found ' + self.connections[node]['dsn'])
-                self.connections[node]['dbo'] = self.sqlite3.connect(self.connections[node]['dsn'], isolation_level=None)
-                self.connections[node]['dbo'].text_factory = str
-                c = self.connections[node]['dbo'].cursor()
+                dbo = self.sqlite3.connect(self.connections[node]['dsn'], isolation_level=None, check_same_thread=False)
+                dbo.text_factory = str
+                c = dbo.cursor()
                 c.execute("PRAGMA journal_mode=wal")
                 c.execute("PRAGMA synchronous=0")
             elif self.connections[node]['dbtype'] == 'DB2':
-                self.connections[node]['dbo'] = self.pyodbc.connect('DSN=' + self.connections[node]['dsn'] + '; UID=' + self.connections[node]['userid'] + '; PWD=' + self.connections[node]['password'], autocommit=True)
+                dbo = self.pyodbc.connect('DSN=' + self.connections[node]['dsn'] + '; UID=' + self.connections[node]['userid'] + '; PWD=' + self.connections[node]['password'], autocommit=True)
             elif self.connections[node]['dbtype'] == 'POSTGRESQL':
                 conn_str = 'DSN=' + self.connections[node]['dsn'] + ';UID=' + self.connections[node]['userid'] + ';PWD=' + self.connections[node]['password'] + ';'
                 if self.connections[node]['psycopg2']:
-                    self.connections[node]['dbo'] = self.psycopg2.connect(host=self.connections[node]['host'], port=self.connections[node]['port'], dbname=self.connections[node]['dsn'], user=self.connections[node]['userid'], password=self.connections[node]['password'])
-                    self.connections[node]['dbo'].set_session(autocommit=True, isolation_level='READ UNCOMMITTED')
+                    dbo = self.psycopg2.connect(host=self.connections[node]['host'], port=self.connections[node]['port'], dbname=self.connections[node]['dsn'], user=self.connections[node]['userid'], password=self.connections[node]['password'])
+                    dbo.set_session(autocommit=True, isolation_level='READ UNCOMMITTED')
                 else:
-                    self.connections[node]['dbo'] = self.pyodbc.connect(conn_str, autocommit=True)
+                    dbo = self.pyodbc.connect(conn_str, autocommit=True)
             elif self.connections[node]['dbtype'] == 'MSSQL':
-                self.connections[node]['dbo'] = self.pyodbc.connect('DSN=' + self.connections[node]['dsn'] + '; UID=' + self.connections[node]['userid'] + '; PWD=' + self.connections[node]['password'], autocommit=True)
+                dbo = self.pyodbc.connect('DSN=' + self.connections[node]['dsn'] + '; UID=' + self.connections[node]['userid'] + '; PWD=' + self.connections[node]['password'], autocommit=True)
             elif self.connections[node]['dbtype'] == 'OCI':
-                self.connections[node]['dbo'] = self.cx_Oracle.connect(user=self.connections[node]['userid'], password=self.connections[node]['password'], dsn=f"{self.connections[node]['host']}:{self.connections[node]['port']}/{self.connections[node]['schema']}", encoding="UTF-8")
+                dbo = self.cx_Oracle.connect(user=self.connections[node]['userid'], password=self.connections[node]['password'], dsn=f"{self.connections[node]['host']}:{self.connections[node]['port']}/{self.connections[node]['schema']}", encoding="UTF-8")
             else:
                 raise Exception('Unsupported DB Type: ' + self.connections[node]['dbtype'])
         except Exception as err:
@@ -115,15 +253,42 @@ class G2Database:
                 raise Exception('''WARNING: SQLITE3 doesn't support schema URI argument''')
             try:
                 if self.connections[node]['dbtype'] == 'MYSQL':
-                    self.sqlExec('use ' + self.connections[node]['schema'])
+                    dbo.cursor().execute('use ' + self.connections[node]['schema'])
                 elif self.connections[node]['dbtype'] == 'DB2':
-                    self.sqlExec('set current schema ' + self.connections[node]['schema'])
+                    dbo.cursor().execute('set current schema ' + self.connections[node]['schema'])
                     # --note: for some reason pyodbc not throwing error with set to invalid schema!
                 elif self.connections[node]['dbtype'] == 'POSTGRESQL':
-                    self.sqlExec('SET search_path TO ' + self.connections[node]['schema'])
+                    dbo.cursor().execute('SET search_path TO ' + self.connections[node]['schema'])
             except Exception as err:
                 raise Exception(err)
 
+        return dbo
+
+    # ----------------------------------------
+    def checkConnection(self, node, dbo):
+        """ True if a connection is still alive """
+        try:
+            cursor = dbo.cursor()
+            cursor.execute(self.CHECK_SQL.get(self.connections[node]['dbtype'], 'SELECT 1'))
+            cursor.fetchall()
+            cursor.close()
+        except Exception:
+            return False
+        return True
+
+    # ----------------------------------------
+    def getConnection(self, node='MAIN'):
+        """ the calling thread's connection to a node """
+        return self.connections[node]['pool'].checkout()
+
+    # ----------------------------------------
+    def releaseConnections(self):
+        """ return the calling thread's connections to the pools, call when a thread is done with the database,
+            e.g. at the end of a task run in a ThreadPoolExecutor. Connections are also returned when a thread ends
+        """
+        for node in self.connections.keys():
+            self.connections[node]['pool'].release()
+
 
     def set_node(self, sql):
         if len(self.connections) == 1:
@@ -161,7 +326,7 @@ class G2Database:
     # ----------------------------------------
     def close(self):
         for node in self.connections.keys():
-            self.connections[node]['dbo'].close()
+            self.connections[node]['pool'].close()
 
         return
 
@@ -212,20 +377,26 @@ class G2Database:
         cursorData['NAME'] = kwargs['name'] if 'name' in kwargs else None
         cursorData['ITERSIZE'] = kwargs['itersize'] if 'itersize' in kwargs else None
 
-        try:
-            if cursorData['NAME'] and self.connections[node]['psycopg2']:
-                exec_cursor = self.connections[node]['dbo'].cursor(cursorData['NAME'])
-                if cursorData['ITERSIZE']:
-                    exec_cursor.itersize = cursorData['ITERSIZE']
-            else:
-                exec_cursor = self.connections[node]['dbo'].cursor()
-            if parmList:
-                exec_cursor.execute(sql, parmList)
-            else:
-                exec_cursor.execute(sql)
+        # --run once more on a new connection if the connection was lost
+        for attempt in range(2):
+            dbo = self.getConnection(node)
+            try:
+                if cursorData['NAME'] and self.connections[node]['psycopg2']:
+                    exec_cursor = dbo.cursor(cursorData['NAME'])
+                    if cursorData['ITERSIZE']:
+                        exec_cursor.itersize = cursorData['ITERSIZE']
+                else:
+                    exec_cursor = dbo.cursor()
+                if parmList:
+                    exec_cursor.execute(sql, parmList)
+                else:
+                    exec_cursor.execute(sql)
+                break
 
-        except Exception as err:
-            raise Exception(f"sqlerror: {err}\n{sql}\n")
+            except Exception as err:
+                if attempt == 0 and self.connections[node]['pool'].reconnect():
+                    continue
+                raise Exception(f"sqlerror: {err}\n{sql}\n")
 
         if exec_cursor:
             cursorData['CURSOR'] = exec_cursor
@@ -17,6 +17,7 @@ import subprocess
 import readline
 import atexit
 from io import StringIO
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import suppress
 from datetime import datetime
 
@@ -40,6 +41,7 @@ except Exception as err:
     sys.exit(1)
 
 with suppress(Exception):
+    import G2Json
     import G2Paths
     from G2Database import G2Database
     from G2IniParams import G2IniParams
@@ -67,7 +69,7 @@ def execute_api_call(api_name, flag_list, parm_list):
     try:
         api_call = getattr(g2Engine, api_name)
         api_call(*parm_list)
-        response_data = json.loads(response)
+        response_data = G2Json.loads(response)
         if debugOutput:
             showDebug(
                 called_by,
@@ -2990,14 +2992,25 @@ class G2CmdShell(cmd.Cmd):
         tblColumns.append({"name": "Feature", "width": 25, "align": "left"})
         tblColumns.append({"name": "Description", "width": 75, "align": "left"})
 
+        # Entities of each feature are queried at once, each thread on its own database connection
+        def feature_entity_ids(lib_feat_id):
+            try:
+                sql = f"select distinct RES_ENT_ID from RES_FEAT_EKEY where LIB_FEAT_ID = {lib_feat_id} order by RES_ENT_ID"
+                return [row[0] for row in g2Dbo.fetchAllRows(g2Dbo.sqlExec(sql))]
+            finally:
+                g2Dbo.releaseConnections()
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            feat_entity_ids = list(executor.map(feature_entity_ids, feat_cache))
+
         entityCnt = 0
         entity_cache = {}
         tblRows = []
-        for lib_feat_id, feat_desc in feat_cache.items():
+        for (lib_feat_id, feat_desc), entity_ids in zip(
+            feat_cache.items(), feat_entity_ids
+        ):
 
-            sql = f"select distinct RES_ENT_ID from RES_FEAT_EKEY where LIB_FEAT_ID = {lib_feat_id} order by RES_ENT_ID"
-            for row in g2Dbo.fetchAllRows(g2Dbo.sqlExec(sql)):
-                entity_id = row[0]
+            for entity_id in entity_ids:
                 if entity_id in entity_cache:
                     continue
                 entity_cache[entity_id] = True
@@ -0,0 +1,147 @@
+"""JSON encoding and decoding for the Senzing python tools using the fastest module installed, orjson or ujson,
+falling back to the standard json module
+
+Anything the faster modules reject is retried with the standard json module, the results and errors are the same as
+using json directly. orjson reads integers wider than 64 bits as floats and writes NaN and Infinity as null, documents
+with either use the standard json module too. Keys are sorted the same as json.dumps(sort_keys=True), output from
+orjson and ujson is compact and non-ASCII characters aren't escaped, the decoded data is the same.
+
+Run this module to compare the installed modules with the standard json module.
+"""
+
+import json
+import math
+import re
+from importlib import import_module
+
+BACKEND = "json"
+
+try:
+    orjson = import_module("orjson")
+    BACKEND = "orjson"
+except ImportError:
+    try:
+        ujson = import_module("ujson")
+        BACKEND = "ujson"
+    except ImportError:
+        pass
+
+# Integers of 19 or more digits can be beyond the 64 bit range orjson reads exactly
+WIDE_INT = re.compile("[0-9]{19}")
+WIDE_INT_BYTES = re.compile(b"[0-9]{19}")
+
+
+def non_finite(obj):
+    """True if obj holds a NaN or infinite float"""
+
+    if isinstance(obj, float):
+        return not math.isfinite(obj)
+    if isinstance(obj, dict):
+        return any(non_finite(value) for value in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return any(non_finite(value) for value in obj)
+
+    return False
+
+
+def loads(data):
+    """Decode a JSON document from str, bytes or bytearray"""
+
+    if BACKEND == "orjson":
+        wide_int = WIDE_INT if isinstance(data, str) else WIDE_INT_BYTES
+        if not wide_int.search(data):
+            try:
+                return orjson.loads(data)
+            except orjson.JSONDecodeError:
+                pass
+    elif BACKEND == "ujson":
+        try:
+            return ujson.loads(data)
+        except (ValueError, TypeError):
+            pass
+
+    return json.loads(data)
+
+
+def dumps(obj, sort_keys=False, indent=None):
+    """Encode to a JSON str, indent is only used by the standard json module"""
+
+    if indent is None:
+        if BACKEND == "orjson":
+            try:
+                encoded = orjson.dumps(
+                    obj, option=orjson.OPT_SORT_KEYS if sort_keys else 0
+                )
+                # orjson writes NaN and Infinity as null, only looked for when there is a null
+                if b"null" not in encoded or not non_finite(obj):
+                    return encoded.decode()
+            except TypeError:
+                pass
+        elif BACKEND == "ujson":
+            try:
+                return ujson.dumps(
+                    obj,
+                    sort_keys=sort_keys,
+                    ensure_ascii=False,
+                    escape_forward_slashes=False,
+                )
+            except (TypeError, OverflowError):
+                pass
+
+    return json.dumps(obj, sort_keys=sort_keys, indent=indent)
+
+
+if __name__ == "__main__":
+
+    def result(func, *args, **kwargs):
+        """repr of the result of func, or the type of exception raised, to compare the modules"""
+
+        try:
+            return repr(func(*args, **kwargs))
+        except Exception as ex:
+            return type(ex).__name__
+
+    # Compare each installed module with the standard json module on the input the faster modules handle differently
+    documents = [
+        '{"A": 12345678901234567890123}',
+        '{"A": -9999999999999999999, "B": 18446744073709551616}',
+        '{"A": NaN, "B": Infinity, "C": -Infinity, "D": 1e400}',
+        '{"A": "\\ud800", "B": "\\u00e9", "C": "a/b", "D": null}',
+        '{"A": 1.5e16, "B": 0.1, "C": -0.0, "D": [1, 2.0, true, false]}',
+        '{"B": 1, "A": {"D": 2, "C": [3, {"F": 4, "E": 5}]}}',
+        '{"A": 1,}',
+    ]
+    objects = [json.loads(document) for document in documents[:-1]] + [
+        {1: "int key", None: "None key"},
+        {True: "bool key", 1.5: "float key"},
+        {"A": 2**70, "B": -(2**70), "C": (1, 2)},
+        {"A": [float("nan"), float("inf"), None]},
+        {"A": {1, 2}},
+    ]
+
+    failed = 0
+    for BACKEND in ("orjson", "ujson"):
+        try:
+            globals()[BACKEND] = import_module(BACKEND)
+        except ImportError:
+            print(f"{BACKEND}: not installed")
+            continue
+
+        backend_failed = 0
+        for document in documents:
+            for data in (document, document.encode()):
+                if result(loads, data) != result(json.loads, data):
+                    backend_failed += 1
+                    print(f"{BACKEND} loads differs from json: {data!r}")
+        for obj in objects:
+            for sort_keys in (False, True):
+                if result(lambda: json.loads(dumps(obj, sort_keys))) != result(
+                    lambda: json.loads(json.dumps(obj, sort_keys=sort_keys))
+                ):
+                    backend_failed += 1
+                    print(f"{BACKEND} dumps differs from json: {obj!r}")
+
+        print(f"{BACKEND}: {'differs from' if backend_failed else 'same as'} json")
+        failed += backend_failed
+
+    raise SystemExit(1 if failed else 0)
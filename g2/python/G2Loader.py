@@ -6,6 +6,8 @@ import json
 import math
 import os
 import pathlib
+import pickle
+import random
 import select
 import signal
 import subprocess
@@ -14,18 +16,37 @@ import tempfile
 import textwrap
 import threading
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from contextlib import suppress
 from datetime import datetime
 from glob import glob
-from multiprocessing import Process, Queue, Value, Manager
+from multiprocessing import Array, Process, Queue, Value, Manager
 from queue import Empty, Full
+from queue import Queue as ThreadQueue
 
 import DumpStack
+import G2Json
 import G2Paths
-from CompressedFile import fileRowParser, isCompressedFile, openPossiblyCompressedFile
+from CompressedFile import (
+    DelimitedRowReader,
+    LineRangeReader,
+    MappedLineReader,
+    PassThroughRecord,
+    ShuffledLineReader,
+    fileRowParser,
+    fileRowPassThrough,
+    isCompressedFile,
+    isDelimitedRowFile,
+    lineAlignedRanges,
+    openPossiblyCompressedFile,
+    rowSize,
+)
 from G2ConfigTables import G2ConfigTables
 from G2IniParams import G2IniParams
+from G2LoaderMetrics import CallTimings, LoaderMetrics
 from G2Project import G2Project
+from G2S3 import G2S3, S3Prefetcher
 
 from senzing import (
     G2Config,
@@ -73,6 +94,379 @@ class Governor:
         """Main function to trigger action(s)"""
         return
 
+    def tick_interval(self):
+        """Records and seconds between calls to tick(), never called when both are None"""
+        return None, None
+
+    def tick(self, records):
+        """Called with the number of records read since the last tick, in place of govern() for each record"""
+        return
+
+
+# -----------------------------------------------------------------------------
+# Class: GovernorTicker
+#
+# Calls a record governor every so many records or seconds instead of for each
+# record, governors without tick() are called for each record as before. Time
+# paused in the governor is totalled locally and added to the load stats
+# periodically. Governors with target_rate() can throttle the reader to a rate in
+# records per second instead of pausing it. A reader counts records with:
+#
+#     ticker.countdown -= 1
+#     if ticker.countdown <= 0:
+#         ticker.check()
+# -----------------------------------------------------------------------------
+
+
+class GovernorTicker:
+
+    # Records between checks of the clock for governors ticked every so many seconds
+    CLOCK_RECORDS = 100
+    # Seconds paused to total before adding to the load stats
+    PUBLISH_SECS = 0.5
+    # Calls to total before adding to the load stats
+    PUBLISH_CALLS = 1000
+    # Seconds of records between checks when throttled
+    PACE_SECS = 0.1
+
+    def __init__(self, record_governor):
+        self.governor = record_governor
+        self.per_record = not hasattr(record_governor, "tick")
+        self.records, self.seconds = (
+            (1, None) if self.per_record else record_governor.tick_interval()
+        )
+        self.pending = 0
+        self.next_time = (
+            time.monotonic() + self.seconds if self.seconds is not None else None
+        )
+        self.paused = 0.0
+        self.calls = 0
+        # Records counted and the time since throttling started, or since the rate changed
+        self.rate = None
+        self.rate_records = 0
+        self.rate_start = None
+        self.reset_countdown()
+
+    def reset_countdown(self):
+        """Set the records to count before the next check"""
+
+        countdown = (
+            self.records - self.pending if self.records is not None else sys.maxsize
+        )
+        if self.seconds is not None:
+            countdown = min(countdown, self.CLOCK_RECORDS)
+        if self.rate:
+            countdown = min(countdown, int(self.rate * self.PACE_SECS))
+        self.countdown = self.countdown_start = max(countdown, 1)
+
+    def check(self):
+        """Call the governor if enough records have been counted or time has passed, returns seconds paused"""
+
+        counted = self.countdown_start - self.countdown
+        self.pending += counted
+        secs = 0.0
+
+        if (self.records is not None and self.pending >= self.records) or (
+            self.next_time is not None and time.monotonic() >= self.next_time
+        ):
+            gov_start = time.perf_counter()
+            if self.per_record:
+                for _ in range(self.pending):
+                    self.governor.govern()
+            else:
+                self.governor.tick(self.pending)
+            secs = time.perf_counter() - gov_start
+
+            self.pending = 0
+            if self.seconds is not None:
+                self.next_time = time.monotonic() + self.seconds
+
+            self.paused += secs
+            self.calls += 1
+
+        # Throttled time isn't counted as paused, rates reported are the throttled rates
+        if hasattr(self.governor, "target_rate"):
+            self.throttle(counted)
+
+        if self.paused >= self.PUBLISH_SECS or self.calls >= self.PUBLISH_CALLS:
+            self.publish()
+
+        self.reset_countdown()
+        return secs
+
+    def throttle(self, counted):
+        """Sleep to keep to the governor's target rate"""
+
+        rate = self.governor.target_rate()
+        if rate != self.rate:
+            self.rate = rate
+            self.rate_records = 0
+            self.rate_start = time.monotonic()
+        if not rate:
+            return
+
+        self.rate_records += counted
+        secs = self.rate_start + self.rate_records / rate - time.monotonic()
+        if secs > 0:
+            time.sleep(secs)
+
+    def publish(self):
+        """Add the time paused since the last publish to the load stats and metrics"""
+
+        if self.calls:
+            add_governing_time(self.paused)
+            self.paused = 0.0
+            self.calls = 0
+
+
+# -----------------------------------------------------------------------------
+# Class: WorkQueue
+#
+# Separate ingest and redo queues for the processing threads, redo can be worked
+# down alongside ingest without waiting for the ingest queue to empty
+# -----------------------------------------------------------------------------
+
+
+class WorkQueue:
+
+    def __init__(self, maxsize, redo_ratio):
+        self.ingest = Queue(maxsize)
+        self.redo = Queue(maxsize)
+        self.redo_ratio = redo_ratio
+        # Ingest batches taken since the last redo batch, shared by the threads of a process without a lock so the
+        # ratio is approximate
+        self.ingest_taken = 0
+
+    def put(self, item, block=True, timeout=None):
+        self.ingest.put(item, block, timeout)
+
+    def put_redo(self, item, block=True, timeout=None):
+        self.redo.put(item, block, timeout)
+
+    def get(self, block=True, timeout=None):
+        """Next batch, a redo batch is taken after redo_ratio ingest batches when both are waiting, or first
+        when redo_ratio is 0"""
+
+        if self.redo_ratio == 0 or self.ingest_taken >= self.redo_ratio:
+            preferred, other = self.redo, self.ingest
+        else:
+            preferred, other = self.ingest, self.redo
+
+        # Wait on the other queue when only it has batches waiting
+        if preferred.empty() and not other.empty():
+            preferred, other = other, preferred
+
+        # Only the preferred queue is waited on. A non-blocking get fails while another thread waits in a blocking
+        # get on the same queue, that thread takes the batch instead
+        for work_queue, queue_block in ((preferred, block), (other, False)):
+            try:
+                item = work_queue.get(queue_block, timeout)
+            except Empty:
+                continue
+
+            self.ingest_taken = 0 if work_queue is self.redo else self.ingest_taken + 1
+            return item
+
+        raise Empty
+
+    def empty(self):
+        return self.ingest.empty() and self.redo.empty()
+
+    def ingest_empty(self):
+        return self.ingest.empty()
+
+    def qsize(self):
+        return self.ingest.qsize() + self.redo.qsize()
+
+    def close(self):
+        self.ingest.close()
+        self.redo.close()
+
+
+# -----------------------------------------------------------------------------
+# Class: StageTimes
+#
+# Read and parse times accumulated by a reader or thread, published to the
+# shared metrics (--metricsPort, --metricsFile) once per batch instead of per row
+# -----------------------------------------------------------------------------
+
+
+class StageTimes:
+
+    def __init__(self):
+        self.rows = self.errors = 0
+        self.read_secs = self.parse_secs = 0.0
+
+    def add_read(self, start, bad=False):
+        self.rows += 1
+        self.errors += bad
+        self.read_secs += time.perf_counter() - start
+
+    def add_parse(self, start, bad=False):
+        self.errors += bad
+        self.parse_secs += time.perf_counter() - start
+
+    def publish(self):
+        if metrics:
+            if self.rows:
+                metrics.rows_read.inc(self.rows)
+                metrics.read_seconds.inc(self.read_secs)
+            if self.parse_secs:
+                metrics.parse_seconds.inc(self.parse_secs)
+            if self.errors:
+                metrics.parse_errors.inc(self.errors)
+
+        self.rows = self.errors = 0
+        self.read_secs = self.parse_secs = 0.0
+
+
+# -----------------------------------------------------------------------------
+# Class: Checkpoint
+#
+# Rows of each source file acknowledged as processed by the processing threads,
+# written periodically so an interrupted load can be resumed (--resume)
+# -----------------------------------------------------------------------------
+
+
+class Checkpoint:
+
+    def __init__(self, file_path, resume):
+        self.file_path = file_path
+        self.lock = threading.Lock()
+        # Writers take turns from taking the state to renaming the file, the last written is the latest state
+        self.write_lock = threading.Lock()
+        self.files = {}
+        # Per source index, the checkpoint key and batches sent but not yet covered by the checkpoint
+        self.keys = {}
+        self.sent = {}
+        self.acked = {}
+
+        if resume:
+            with open(file_path, "r") as checkpoint_file:
+                self.files = json.load(checkpoint_file)["files"]
+
+        threading.Thread(target=self.collect_acks, daemon=True).start()
+
+    @staticmethod
+    def source_key(source_dict):
+        return source_path(source_dict)
+
+    def is_complete(self, source_dict):
+        with self.lock:
+            return self.files.get(self.source_key(source_dict), {}).get(
+                "complete", False
+            )
+
+    def start_file(self, source_idx, source_dict):
+        """Start tracking a source file, returns its checkpoint with the rows to resume after"""
+
+        key = self.source_key(source_dict)
+        with self.lock:
+            self.keys[source_idx] = key
+            self.sent[source_idx] = deque()
+            self.acked[source_idx] = set()
+            # Shuffling while reading uses the same seed when resuming, rows are read in the same order
+            entry = self.files.setdefault(
+                key,
+                {"rows": 0, "complete": False, "shuffle_seed": random.getrandbits(32)},
+            )
+            entry = dict(entry)
+
+        self.write()
+        return entry
+
+    def batch_sent(self, source_idx, end_row):
+        with self.lock:
+            self.sent[source_idx].append(end_row)
+
+    def batch_acked(self, source_idx, end_row):
+        """Batches are processed out of order, the checkpoint moves on when all earlier batches are processed"""
+
+        with self.lock:
+            sent = self.sent[source_idx]
+            acked = self.acked[source_idx]
+            acked.add(end_row)
+            while sent and sent[0] in acked:
+                row = sent.popleft()
+                acked.discard(row)
+                self.files[self.keys[source_idx]]["rows"] = row
+
+    def file_complete(self, source_idx):
+        with self.lock:
+            self.files[self.keys[source_idx]]["complete"] = True
+        self.write()
+
+    def collect_acks(self):
+        """Thread recording batches processed by the processing threads and writing the checkpoint periodically"""
+
+        last_write = time.monotonic()
+        while True:
+            with suppress(Empty):
+                self.batch_acked(*batch_ack_queue.get(True, 1))
+
+            if time.monotonic() - last_write >= cli_args.checkpointInterval:
+                self.write()
+                last_write = time.monotonic()
+
+    def flush(self):
+        """Record remaining acknowledgements once the processing threads have stopped and write the checkpoint"""
+
+        while True:
+            try:
+                self.batch_acked(*batch_ack_queue.get(True, 0.1))
+            except Empty:
+                break
+        self.write()
+
+    def write(self):
+        """Write to a temporary file and rename it, a crash never leaves a partial checkpoint"""
+
+        with self.write_lock:
+            with self.lock:
+                checkpoint = json.dumps(
+                    {
+                        "arguments": " ".join(sys.argv[1:]),
+                        "updated": str(datetime.now()),
+                        "files": self.files,
+                    },
+                    indent=2,
+                )
+
+            temp_path = f"{self.file_path}.tmp"
+            try:
+                with open(temp_path, "w") as temp_file:
+                    temp_file.write(checkpoint)
+                    temp_file.flush()
+                    os.fsync(temp_file.fileno())
+                os.replace(temp_path, self.file_path)
+            except IOError as ex:
+                print(f"\nWARNING: Unable to write checkpoint file {self.file_path}")
+                print(f"         {ex}", flush=True)
+
+
+# -----------------------------------------------------------------------------
+# Class: SplitRangeQueue
+#
+# Work queue for the threads of a process reading its own range of a file (-sp)
+# -----------------------------------------------------------------------------
+
+
+class SplitRangeQueue:
+
+    def __init__(self, range_queue, work_queue, range_done):
+        self.range_queue = range_queue
+        self.work_queue = work_queue
+        self.range_done = range_done
+
+    def get(self, block=True, timeout=None):
+        """Rows from the range until it has been read, then the shared work queue used for redo"""
+        if not self.range_done.is_set() or not self.range_queue.empty():
+            return self.range_queue.get(block, timeout)
+        return self.work_queue.get(block, timeout)
+
+    def empty(self):
+        return self.range_queue.empty() and self.work_queue.empty()
+
 
 # ---------------------------------------------------------------------
 # G2Loader
@@ -314,9 +708,25 @@ def check_resources_and_startup(return_queue, thread_count, do_purge):
             sqlite_limit_msg = f" - Default is {max_sqlite_threads} when using SQLite, test higher/lower with -nt argument"
 
     # 2.5GB per process - .5GB per thread
+    def recommend_mem(threads):
+        return (
+            math.ceil(threads / cli_args.max_threads_per_process) * 2.5 + threads * 0.5
+        )
+
     min_recommend_cores = math.ceil(thread_count / 4 + 1)
     num_processes = math.ceil(float(thread_count) / cli_args.max_threads_per_process)
-    min_recommend_mem = num_processes * 2.5 + thread_count * 0.5
+    min_recommend_mem = recommend_mem(thread_count)
+
+    # Autotuning (-at) starts up to twice the threads, no more than fit the memory threads are calculated from and the
+    # SQLite limit. Parked threads keep their engine and memory
+    autotune_mem = available_mem / 100 * (cli_args.threadCountMem or calc_max_avail_mem)
+    autotune_max_threads = thread_count
+    while autotune_max_threads < thread_count * 2:
+        if recommend_mem(autotune_max_threads + 1) > autotune_mem:
+            break
+        if "SQLITE3" in ini_db_types and autotune_max_threads + 1 > max_sqlite_threads:
+            break
+        autotune_max_threads += 1
 
     print(
         textwrap.dedent(
@@ -423,12 +833,13 @@ def check_resources_and_startup(return_queue, thread_count, do_purge):
 
     # Return values are put in a queue
     return_queue.put(thread_count)
+    return_queue.put(autotune_max_threads)
 
 
 def perform_load():
     """Main processing when not in redo only mode"""
 
-    exit_code = 0
+    exit_code = cnt_bad_parse = 0
     DumpStack.listen()
     proc_start_time = time.time()
 
@@ -459,6 +870,20 @@ def perform_load():
     if not g2_project.success:
         return 1, 0
 
+    # Open S3 files ahead of loading them, streams of the next files fetch their first parts while a file loads
+    s3_uris = [
+        sourceDict["FILE_PATH"]
+        for sourceDict in g2_project.sourceList
+        if sourceDict["FILE_SOURCE"] == "S3"
+        and not (checkpoint and checkpoint.is_complete(sourceDict))
+    ]
+    if s3_uris and cli_args.s3Prefetch > 0:
+        G2S3.prefetcher = S3Prefetcher(
+            s3_uris,
+            maxFiles=cli_args.s3Prefetch,
+            memoryBudget=cli_args.s3PrefetchMemory * 1024 * 1024,
+        )
+
     # Enhance the G2 configuration, by adding data sources and entity types
     if not cli_args.testMode:
         temp_queue = Queue()
@@ -479,14 +904,37 @@ def perform_load():
         if not result_of_enhance_g2_config:
             return 1, 0
 
+    # Read several source files at once into one set of processing threads, instead of one file at a time
+    concurrent_load = (
+        cli_args.parallelFiles > 1
+        and not cli_args.testMode
+        and len(g2_project.sourceList) > 1
+    )
+    if concurrent_load:
+        exit_code, cnt_bad_parse = perform_concurrent_load(g2_project)
+
     # Start loading
-    for sourceDict in g2_project.sourceList:
+    for source_idx, sourceDict in enumerate(
+        g2_project.sourceList if not concurrent_load else []
+    ):
 
         file_path = sourceDict["FILE_PATH"]
         orig_file_path = file_path
-        shuf_detected = False
+
+        # Skip files completed in the run being resumed (--resume)
+        file_checkpoint = (
+            checkpoint.start_file(source_idx, sourceDict) if checkpoint else None
+        )
+        if file_checkpoint and file_checkpoint["complete"]:
+            print(
+                f"\nINFO: Skipping {file_path}, completed in the run being resumed (--resume)"
+            )
+            continue
+        shuf_detected = stream_shuffle = split_unshuffled = False
+        shuf_file_path = None
 
         cnt_rows = cnt_bad_parse = cnt_bad_umf = cnt_good_umf = api_errors.value = 0
+        worker_bad_parse.value = 0
         dsrc_action_add_count.value = dsrc_action_del_count.value = (
             dsrc_action_reeval_count.value
         ) = 0
@@ -504,7 +952,7 @@ def perform_load():
                 print(f'\n{"-"*30}  Loading  {"-"*30}\n')
 
         # Drop to a single thread for files under 500k
-        if os.path.getsize(file_path) < (
+        if source_file_size(sourceDict) < (
             100000 if isCompressedFile(file_path) else 500000
         ):
             print("  Dropping to single thread due to small file size")
@@ -512,6 +960,16 @@ def perform_load():
         else:
             transport_thread_count = default_thread_count
 
+        # Each processing process reads its own byte range of a large uncompressed local file (-sp)
+        split_file = (
+            cli_args.splitRead
+            and not cli_args.testMode
+            and transport_thread_count > 1
+            and sourceDict["FILE_SOURCE"] != "S3"
+            and sourceDict["FILE_FORMAT"] != "UMF"
+            and not isCompressedFile(file_path)
+        )
+
         # Shuffle the source file for performance, unless directed not to or in test mode or single threaded
         if (
             not cli_args.noShuffle
@@ -519,13 +977,8 @@ def perform_load():
             and transport_thread_count > 1
         ):
 
-            if isCompressedFile(file_path):
-                print(
-                    "INFO: Not shuffling compressed file. Please ensure the data was shuffled before compressing!\n"
-                )
-
             # If it looks like source file was previously shuffled by G2Loader don't do it again
-            elif SHUF_NO_DEL_TAG in file_path or SHUF_TAG in file_path:
+            if SHUF_NO_DEL_TAG in file_path or SHUF_TAG in file_path:
 
                 shuf_detected = True
                 print(
@@ -537,6 +990,32 @@ def perform_load():
                     )
                 time.sleep(10)
 
+            # Shuffle records as they are read, no shuffled copy of the file is written. Not when splitting the
+            # file, each range is read in source order so row numbers match the source lines
+            elif cli_args.shuffleMode == "stream":
+                if split_file:
+                    split_unshuffled = True
+                    print(
+                        "INFO: Not shuffling records while reading when splitting the file (-sp), each process reads its own range\n"
+                    )
+                else:
+                    stream_shuffle = True
+                    print(
+                        f"INFO: Shuffling records while reading, using a window of {cli_args.shuffleWindow:,} records or {cli_args.shuffleWindowMemory:,} MB\n"
+                    )
+
+            # S3 files are streamed, there's no local file to shuffle
+            elif sourceDict["FILE_SOURCE"] == "S3":
+                stream_shuffle = True
+                print(
+                    f"INFO: Shuffling records from S3 while reading, using a window of {cli_args.shuffleWindow:,} records or {cli_args.shuffleWindowMemory:,} MB\n"
+                )
+
+            elif isCompressedFile(file_path):
+                print(
+                    "INFO: Not shuffling compressed file with --shuffleMode file. Please ensure the data was shuffled before compressing!\n"
+                )
+
             else:
 
                 # Add timestamp to no delete shuffled files
@@ -633,16 +1112,39 @@ def perform_load():
 
                 file_path = str(shuf_file_path)
 
-        file_reader = openPossiblyCompressedFile(file_path, "r")
-        # --file_reader = safe_csv_reader(csv.reader(csvFile, fileFormat), cnt_bad_parse)
+        split_read = None
+        if split_file:
+            split_read = create_split_read(
+                sourceDict, file_path, transport_thread_count
+            )
+            print(
+                f"INFO: Splitting source file into {len(split_read['ranges'])} ranges, each read by a processing process\n"
+            )
+
+        file_reader = (
+            open_source_reader(
+                file_path,
+                sourceDict,
+                stream_shuffle,
+                file_checkpoint["shuffle_seed"] if file_checkpoint else None,
+            )
+            if not split_read
+            else None
+        )
 
-        # Use previously stored header row, so get rid of this one
-        if sourceDict["FILE_FORMAT"] not in ("JSON", "UMF"):
-            next(file_reader)
+        # Parse in the processing threads instead of this reader? Not used for raw UMF or in test mode
+        worker_parse = (
+            cli_args.workerParse
+            and not cli_args.testMode
+            and sourceDict["FILE_FORMAT"] != "UMF"
+            and not split_read
+        )
 
         # Start processes and threads for this file
         thread_list, work_queue = start_loader_process_and_threads(
-            transport_thread_count
+            transport_thread_count,
+            g2_project.sourceList if worker_parse else None,
+            split_read,
         )
 
         if thread_stop.value != 0:
@@ -650,170 +1152,31 @@ def perform_load():
 
         # Start processing rows from source file
         file_start_time = time.time()
-        batch_start_time = time.perf_counter()
-
-        cnt_rows = batch_time_governing = time_redo.value = time_governing.value = (
-            dsrc_action_diff.value
-        ) = 0
-
-        while True:
-
-            try:
-                row = next(file_reader)
-            except StopIteration:
-                break
-            except Exception as ex:
-                cnt_rows += 1
-                cnt_bad_parse += 1
-                print(f"WARNING: Could not read row {cnt_rows}, {ex}")
-                continue
-
-            # Increment row count to agree with line count and references to bad rows are correct
-            cnt_rows += 1
 
-            # Skip records
-            if (
-                not cli_args.redoMode
-                and cli_args.skipRecords
-                and cnt_rows < cli_args.skipRecords + 1
-            ):
-                if cnt_rows == 1:
-                    print(f"INFO: Skipping the first {cli_args.skipRecords} records...")
-                continue
+        time_redo.value = time_governing.value = dsrc_action_diff.value = 0
 
-            # Skip blank or records that error, errors written to errors file if not disabled
-            row_data = fileRowParser(
-                row,
+        if split_read:
+            read_stats = wait_for_split_read(split_read, thread_list)
+        else:
+            read_stats = read_source_file(
+                source_idx,
                 sourceDict,
-                cnt_rows,
-                errors_file=errors_file,
-                errors_short=cli_args.errorsShort,
-                errors_disable=cli_args.errorsFileDisable,
+                file_reader,
+                work_queue,
+                thread_list,
+                worker_parse,
+                g2_project,
+                resume_rows=file_checkpoint["rows"] if file_checkpoint else 0,
             )
-            if not row_data:
-                cnt_bad_parse += 1
-                continue
-
-            # Don't do any transformation if this is raw UMF
-            ok_to_continue = True
-            if sourceDict["FILE_FORMAT"] != "UMF":
-
-                # Update with file defaults
-                if "DATA_SOURCE" not in row_data and "DATA_SOURCE" in sourceDict:
-                    row_data["DATA_SOURCE"] = sourceDict["DATA_SOURCE"]
-
-                if cli_args.testMode:
-                    mapping_response = g2_project.testJsonRecord(
-                        row_data, cnt_rows, sourceDict
-                    )
-                    if mapping_response[0]:
-                        cnt_bad_umf += 1
-                        ok_to_continue = False
-
-                # --only add force a load_id if not in test mode (why do we do this??)
-                if "LOAD_ID" not in row_data:
-                    row_data["LOAD_ID"] = sourceDict["FILE_NAME"]
-
-            # Put the record on the queue
-            if ok_to_continue:
-                cnt_good_umf += 1
-                if not cli_args.testMode:
-                    while True:
-                        try:
-                            # Assist in indicating what type of record this is for processing thread
-                            # Detect and set here if dsrc action was set as reeval on args
-                            work_queue.put(
-                                (row_data, True if dsrcAction == "X" else False),
-                                True,
-                                1,
-                            )
-                        except Full:
-                            # Check to see if any threads have died
-                            if not all((thread.is_alive() for thread in thread_list)):
-                                print(
-                                    textwrap.dedent(
-                                        """\n\
-                                    ERROR: Thread(s) have shutdown unexpectedly!
-
-                                           - This typically happens when memory resources are exhausted and the system randomly kills processes.
-
-                                           - Please review: https://senzing.zendesk.com/hc/en-us/articles/115000856453
-
-                                           - Check output from the following command for out of memory messages.
-
-                                                - dmesg -e
-                                """
-                                    )
-                                )
-                                return 1, cnt_bad_parse
-                            continue
-                        break
-
-            if cnt_rows % cli_args.loadOutputFrequency == 0:
-                batch_speed = (
-                    int(
-                        cli_args.loadOutputFrequency
-                        / (
-                            time.perf_counter()
-                            - (batch_start_time - batch_time_governing)
-                        )
-                    )
-                    if time.perf_counter() - batch_start_time != 0
-                    else 1
-                )
-                print(
-                    f'  {cnt_rows:,} rows processed at {time_now()}, {batch_speed:,} records per second{f", {api_errors.value:,} API errors" if api_errors.value > 0 else ""}',
-                    flush=True,
-                )
-
-                batch_start_time = time.perf_counter()
-                batch_time_governing = 0
-
-            # Process redo during ingestion
-            if (
-                cnt_rows % cli_args.redoInterruptFrequency == 0
-                and not cli_args.testMode
-                and not cli_args.noRedo
-            ):
-                if process_redo(
-                    work_queue,
-                    True,
-                    "Waiting for processing queue to empty to start redo...",
-                ):
-                    print("\nERROR: Could not process redo record!\n")
-
-            # Check to see if any threads threw errors or control-c pressed and shut down
-            if thread_stop.value != 0:
-                exit_code = thread_stop.value
-                break
-
-            # Check if any of the threads died without throwing errors
-            if not all((thread.is_alive() for thread in thread_list)):
-                print("\nERROR: Thread failure!")
-                break
 
-            # Governor called for each record
-            # Called here instead of when reading from queue to allow queue to act as a small buffer
-            try:
-                rec_gov_start = time.perf_counter()
-                record_governor.govern()
-                rec_gov_stop = time.perf_counter()
-                with time_governing.get_lock():
-                    time_governing.value += rec_gov_stop - rec_gov_start
-                batch_time_governing += rec_gov_stop - rec_gov_start
-            except Exception as err:
-                shutdown(f"\nERROR: Calling per record governor: {err}")
+        if read_stats["threads_failed"]:
+            return 1, read_stats["bad_parse"]
 
-            # Break this file if stop on record value
-            if (
-                not cli_args.redoMode
-                and cli_args.stopOnRecord
-                and cnt_rows >= cli_args.stopOnRecord
-            ):
-                print(
-                    f"\nINFO: Stopping at record {cnt_rows}, --stopOnRecord (-sr) argument was set"
-                )
-                break
+        exit_code = read_stats["exit_code"]
+        cnt_rows = read_stats["rows"]
+        cnt_good_umf = read_stats["good"]
+        cnt_bad_parse = read_stats["bad_parse"]
+        cnt_bad_umf = read_stats["bad_umf"]
 
         # Process redo at end of processing a source. Wait for queue to empty of ingest records first
         if thread_stop.value == 0 and not cli_args.testMode and not cli_args.noRedo:
@@ -828,16 +1191,16 @@ def perform_load():
         end_time_str = time_now(True)
 
         # Close input file
-        file_reader.close()
-
-        if sourceDict["FILE_SOURCE"] == "S3":
-            print(" Removing temporary file created by S3 download " + file_path)
-            os.remove(file_path)
+        if file_reader:
+            file_reader.close()
 
         # Remove shuffled file unless run with -snd or prior shuffle detected and not small file/low thread count
         if (
-            not cli_args.shuffleNoDelete
+            shuf_file_path
+            and not cli_args.shuffleNoDelete
             and not shuf_detected
+            and not stream_shuffle
+            and not split_unshuffled
             and not cli_args.noShuffle
             and not cli_args.testMode
             and transport_thread_count > 1
@@ -847,7 +1210,15 @@ def perform_load():
                 os.remove(shuf_file_path)
 
         # Stop processes and threads
-        stop_loader_process_and_threads(thread_list, work_queue)
+        call_timings = stop_loader_process_and_threads(thread_list, work_queue)
+        slow_records_file = write_slow_records(call_timings, source_path(sourceDict))
+
+        if checkpoint and exit_code == 0 and read_stats["complete"]:
+            checkpoint.file_complete(source_idx)
+
+        # Rows that failed parsing in the processing threads were counted as good when read
+        cnt_bad_parse += worker_bad_parse.value
+        cnt_good_umf -= worker_bad_parse.value
 
         # Print load stats if not error or ctrl-c
         if exit_code in (0, 9):
@@ -878,10 +1249,14 @@ def perform_load():
             elif transport_thread_count > 1:
                 if cli_args.noShuffle:
                     shuf_msg = "Not shuffled (-ns was specified)"
+                elif stream_shuffle:
+                    shuf_msg = f"Shuffled while reading, window of {cli_args.shuffleWindow:,} records"
+                elif split_unshuffled:
+                    shuf_msg = "Not shuffled, file split across processes (-sp)"
                 else:
                     shuf_msg = (
                         shuf_file_path
-                        if cli_args.shuffleNoDelete and "shuf_file_path" in locals()
+                        if cli_args.shuffleNoDelete and shuf_file_path
                         else "Shuffled file deleted (-snd to keep after load)"
                     )
             else:
@@ -908,21 +1283,7 @@ def perform_load():
             if cli_args.errorsFileDisable:
                 errors_log_file = "Disabled with -ed"
 
-            rec_dsrc_action = (
-                dsrc_action_add_count.value
-                + dsrc_action_del_count.value
-                + dsrc_action_reeval_count.value
-                if dsrc_action_diff.value
-                else 0
-            )
-            if dsrcAction != "A":
-                rec_dsrc_action = f"Not considered, explicit mode specified ({dsrc_action_names[dsrcAction]})"
-
-            rec_dsrc_action = (
-                rec_dsrc_action
-                if isinstance(rec_dsrc_action, str)
-                else f"{rec_dsrc_action:,}"
-            )
+            rec_dsrc_action = dsrc_action_summary()
 
             print(
                 textwrap.dedent(
@@ -933,7 +1294,7 @@ def perform_load():
                         Arguments:                       {" ".join(sys.argv[1:])}
                         Action:                          {dsrc_action_names[dsrcAction]}
                         Repository purged:               {'Yes' if (cli_args.purgeFirst or cli_args.forcePurge) else 'No'}
-                        Source File:                     {pathlib.Path(orig_file_path).resolve()}
+                        Source File:                     {source_path(sourceDict)}
                         Shuffled into:                   {shuf_msg}
                         Total records:                   {cnt_good_umf + cnt_bad_parse + cnt_bad_umf:,}
                         \tGood records:                {cnt_good_umf:,}
@@ -946,6 +1307,7 @@ def perform_load():
                         Errors:
                         \tErrors log file:             {errors_log_file}
                         \tFailed API calls:            {api_errors.value:,}
+                        Slowest records log:             {slow_records_file if slow_records_file else 'Not written'}
                         Skipped records:                 {skip_records + ' (-skr was specified)' if cli_args.skipRecords else 'Not requested'}
                         Stop on record:                  {stop_on_record + ' (-sr was specified)' if cli_args.stopOnRecord else 'Not requested'}
                         Total elapsed time:              {elapsed_mins} mins
@@ -1017,7 +1379,11 @@ def perform_load():
     return exit_code, cnt_bad_parse
 
 
-def start_loader_process_and_threads(transport_thread_count):
+def start_loader_process_and_threads(
+    transport_thread_count, source_list=None, split_read=None
+):
+    """Start processing threads. With a source_list raw rows on the queue are parsed in the threads, with
+    split_read each process reads its own range of the source file"""
 
     thread_list = []
     work_queue = None
@@ -1026,7 +1392,23 @@ def start_loader_process_and_threads(transport_thread_count):
     if not cli_args.testMode:
 
         thread_stop.value = 0
-        work_queue = Queue(transport_thread_count * 10)
+        active_threads.value = 0
+        autotune = False
+
+        # Autotuning (-at) starts up to twice the threads within the resources available, those not in use are
+        # parked. Once tuned use the tuned count
+        if cli_args.autoTune and transport_thread_count > 1:
+            if autotune_threads.value:
+                transport_thread_count = autotune_threads.value
+            else:
+                autotune = True
+                active_threads.value = transport_thread_count
+                transport_thread_count = max(
+                    transport_thread_count,
+                    min(transport_thread_count * 2, autotune_max_threads),
+                )
+
+        work_queue = WorkQueue(transport_thread_count * 10, cli_args.redoRatio)
         num_threads_left = transport_thread_count
         thread_id = 0
 
@@ -1043,957 +1425,2610 @@ def start_loader_process_and_threads(transport_thread_count):
                         thread_stop,
                         cli_args.noWorkloadStats,
                         dsrcAction,
+                        source_list,
+                        split_read,
                     ),
                 )
             )
             num_threads_left -= cli_args.max_threads_per_process
 
+        # Long running redo feeder processing redo alongside ingest, stopped with the processing threads (-cr)
+        if cli_args.concurrentRedo and not cli_args.redoMode and not cli_args.noRedo:
+            redo_in_flight.value = 0
+            redo_feeder_state.value = REDO_FEEDER_RUNNING
+            thread_list.append(
+                Process(
+                    target=redo_feed,
+                    args=(
+                        work_queue,
+                        cli_args.debugTrace,
+                        False,
+                        cli_args.redoModeInterval,
+                        max(1, transport_thread_count * cli_args.concurrentRedo // 100),
+                    ),
+                )
+            )
+
         for thread in thread_list:
             thread.start()
 
+        if autotune:
+            threading.Thread(
+                target=autotune_thread_count,
+                args=(transport_thread_count,),
+                daemon=True,
+            ).start()
+
     return thread_list, work_queue
 
 
-def send_to_g2(
-    thread_id_,
-    work_queue_,
-    num_threads_,
-    debug_trace,
-    thread_stop,
-    no_workload_stats,
-    dsrc_action,
-):
-
-    g2_engines = []
-
-    try:
-        g2_engine = init_engine(
-            f"pyG2Engine{thread_id_}",
-            g2module_params,
-            debug_trace,
-            prime_engine=True,
-            add_start_time=True,
-        )
-        g2_engines.append(g2_engine)
-    except G2Exception as ex:
-        print("ERROR: Could not start the G2 engine for sendToG2()")
-        print(f"       {ex}")
-
-        with thread_stop.get_lock():
-            thread_stop.value = 1
-        return
-
-    try:
+def autotune_thread_count(max_threads):
+    """Adjust the number of active processing threads while throughput improves (-at), threads above the limit
+    are parked. Runs as a thread in the main process"""
 
-        thread_list = []
+    end_time = time.time() + cli_args.autoTune * 60
+    step = max(1, max_threads // 10)
 
-        for myid in range(num_threads_):
-            thread_list.append(
-                threading.Thread(
-                    target=g2_thread,
-                    args=(
-                        f"{thread_id_}-{myid}",
-                        work_queue_,
-                        g2_engine,
-                        thread_stop,
-                        dsrc_action,
-                    ),
-                )
-            )
+    def measure(threads):
+        """Records per second with a number of active threads, None if processing is stopping"""
 
-        for thread in thread_list:
-            thread.start()
+        active_threads.value = threads
+        start_count = records_processed.value
+        start_time = time.perf_counter()
 
-        # Periodically output engine workload stats
-        if not no_workload_stats:
-            break_stop = False
+        for _ in range(cli_args.autoTuneInterval):
+            if thread_stop.value != 0:
+                return None
+            time.sleep(1)
 
-            while thread_stop.value == 0:
+        rate = int(
+            (records_processed.value - start_count) / (time.perf_counter() - start_time)
+        )
+        print(f"  Autotune: {threads} threads, {rate:,} records per second", flush=True)
 
-                start_time = time.time()
-                while (time.time() - start_time) <= cli_args.workloadOutputFrequency:
-                    # Check if stopping between sleeping, set break_stop to prevent workload stats
-                    if thread_stop.value != 0:
-                        break_stop = True
-                        break
+        return rate
 
-                    # Sleep in small period, don't sleep the full amount or can block StopLoaderAndThreads() finishing
-                    time.sleep(2)
+    best_threads = active_threads.value
+    best_rate = measure(best_threads)
 
-                if break_stop:
-                    break
+    # Step up while throughput improves, if stepping up didn't help try stepping down
+    for direction in (1, -1):
+        start_threads = best_threads
 
-                for engine in g2_engines:
-                    dump_workload_stats(engine)
+        while best_rate is not None and time.time() < end_time:
+            threads = min(max(best_threads + direction * step, 1), max_threads)
+            if threads == best_threads:
+                break
 
-        for thread in thread_list:
-            thread.join()
+            rate = measure(threads)
+            if rate is None:
+                best_rate = None
+            elif rate > best_rate * AUTOTUNE_MIN_GAIN:
+                best_threads, best_rate = threads, rate
+                continue
+            break
 
-    except Exception:
-        with thread_stop.get_lock():
-            thread_stop.value = 1
-        pass
+        if best_threads != start_threads:
+            break
 
-    # Final workload stats as finishing up
-    if not no_workload_stats:
-        dump_workload_stats(g2_engine)
+    active_threads.value = best_threads
 
-    with suppress(Exception):
-        g2_engine.destroy()
-        del g2_engine
+    # Processing stopped before tuning completed, tune again with the next processing threads
+    if best_rate is None:
+        return
 
-    return
+    autotune_threads.value = best_threads
+    print(
+        textwrap.dedent(
+            f"""\n\
+            Autotune complete
+            -----------------
+                Threads:                 {best_threads} (-nt {best_threads})
+                Processes:               {math.ceil(best_threads / cli_args.max_threads_per_process)} (-mtp {cli_args.max_threads_per_process})
+                Records per second:      {best_rate:,}
+        """
+        ),
+        flush=True,
+    )
 
 
-def g2_thread(_, work_queue_, g2_engine_, thread_stop, dsrc_action_args):
-    """g2 thread function"""
+def perform_concurrent_load(g2_project):
+    """Read several source files at once, the processing threads and engines are started once for all files"""
 
-    def g2thread_error(msg, action):
-        """Write out errors during processing"""
+    exit_code = 0
+    source_list = g2_project.sourceList
+
+    api_errors.value = worker_bad_parse.value = 0
+    dsrc_action_add_count.value = dsrc_action_del_count.value = (
+        dsrc_action_reeval_count.value
+    ) = 0
+    time_redo.value = time_governing.value = dsrc_action_diff.value = 0
+
+    if dsrcAction == "D":
+        print(f'\n{"-"*30}  Deleting  {"-"*30}\n')
+    elif dsrcAction == "X":
+        print(f'\n{"-"*30}  Reevaluating  {"-"*30}\n')
+    else:
+        print(f'\n{"-"*30}  Loading  {"-"*30}\n')
 
-        call_error = textwrap.dedent(
-            f"""
-            {str(datetime.now())} ERROR: {action} - {msg}
-                Data source: {data_source}
-                Record ID: {record_id}
-                Record Type: {"Redo" if is_redo_record else "Ingest"}
+    print(
+        f"  Reading {len(source_list)} source files, {min(cli_args.parallelFiles, len(source_list))} at a time\n"
+    )
 
-                {row if not cli_args.errorsShort else " "}
-           """
-        )
+    # Sources to parse in the processing threads (-wp), raw UMF is always parsed by the reader
+    worker_sources = [
+        source if cli_args.workerParse and source["FILE_FORMAT"] != "UMF" else None
+        for source in source_list
+    ]
 
-        # If logging to error file is disabled print instead
-        if cli_args.errorsFileDisable:
-            print(
-                call_error,
-                flush=True,
-                end="\033[F\033[F" if cli_args.errorsShort else "\n",
-            )
+    thread_list, work_queue = start_loader_process_and_threads(
+        default_thread_count, worker_sources if any(worker_sources) else None
+    )
 
-        if not cli_args.errorsFileDisable:
+    if thread_stop.value != 0:
+        return exit_code, 0
+
+    load_start_time = time.time()
+    file_stats = [None] * len(source_list)
+    read_failed = False
+
+    with ThreadPoolExecutor(max_workers=cli_args.parallelFiles) as executor:
+        futures = {
+            executor.submit(
+                read_concurrent_source_file,
+                source_idx,
+                source_dict,
+                work_queue,
+                thread_list,
+                worker_sources[source_idx] is not None,
+                g2_project,
+            ): source_idx
+            for source_idx, source_dict in enumerate(source_list)
+        }
+        for future in as_completed(futures):
             try:
-                errors_file.write(f"\n\n{call_error.strip()}")
-                errors_file.flush()
+                file_stats[futures[future]] = future.result()
             except Exception as ex:
-                print(f"\nWARNING: Unable to write API error to {errors_file.name}")
-                print(f"         {ex}", flush=True)
-                # If can't write to file, write to terminal
+                # Stop the other readers and the processing threads, they are stopped below
                 print(
-                    call_error,
+                    f"\nERROR: Reading {source_list[futures[future]]['FILE_PATH']}: {ex}",
                     flush=True,
-                    end="\033[F\033[F" if cli_args.errorsShort else "\n",
                 )
+                read_failed = True
+                with thread_stop.get_lock():
+                    thread_stop.value = 1
 
-        # Increment value to report at end of processing each source
-        with api_errors.get_lock():
-            api_errors.value += 1
+    read_stats = [stats for stats in file_stats if stats]
 
-    # For each work queue item
-    while thread_stop.value == 0 or work_queue_.empty() is False:
+    if read_failed:
+        stop_loader_process_and_threads(thread_list, work_queue)
+        return 1, sum(stats["bad_parse"] for stats in read_stats)
 
-        try:
-            row = work_queue_.get(True, 1)
-        except Empty:
-            row = None
-            continue
+    if any(stats["threads_failed"] for stats in read_stats):
+        return 1, sum(stats["bad_parse"] for stats in read_stats)
 
-        # Unpack tuple from the work queue into the data and indicator for being a redo record
-        row, is_redo_record = row
+    exit_code = next(
+        (stats["exit_code"] for stats in read_stats if stats["exit_code"]), 0
+    )
 
-        dsrc_action_str = None
+    # Process redo once all sources have been read. Wait for queue to empty of ingest records first
+    if thread_stop.value == 0 and not cli_args.noRedo:
+        if process_redo(
+            work_queue,
+            True,
+            "Source files processed, waiting for processing queue to empty to start redo...",
+        ):
+            print("\nERROR: Could not process redo record!\n")
 
-        # Start with dsrc_action set to what was used as the CLI arg or default of add
-        dsrc_action = dsrc_action_args
+    end_time = time.time()
+    end_time_str = time_now(True)
 
-        # Record is JSON
-        data_source = row.get("DATA_SOURCE", "")
-        record_id = str(row.get("RECORD_ID", ""))
+    # Stop processes and threads
+    call_timings = stop_loader_process_and_threads(thread_list, work_queue)
+    slow_records_file = write_slow_records(
+        call_timings, f"{len(source_list)} source files read at once (-pf)"
+    )
 
-        # Is the record from the work queue specifically a redo record to be processed during redo time/mode?
-        if is_redo_record:
-            dsrc_action = "X"
+    if checkpoint and exit_code == 0:
+        for stats in read_stats:
+            if stats["complete"]:
+                checkpoint.file_complete(stats["source_idx"])
 
-        # If not, it's a normal ingestion record from file or project
-        else:
-            # If -D and -X were not specified, check each record for dsrc_action and use it instead of default add mode
-            # Consideration of dsrc_action is only valid in default add mode
-            if not cli_args.deleteMode and not cli_args.reprocessMode:
-
-                # Use the DSRC_ACTION from inbound row?
-                # Check if the inbound row specifies dsrc_action, use it and override CLI args (X, D, default is A) if present
-                # This provides functionality of sending in input file with multiple dsrc actions
-                row_dsrc_action = row.get("DSRC_ACTION", None)
-                dsrc_action = row_dsrc_action if row_dsrc_action else dsrc_action
-                dsrc_action = (
-                    dsrc_action.upper() if isinstance(dsrc_action, str) else dsrc_action
+    # Rows that failed parsing in the processing threads were counted as good when read
+    cnt_good_umf = sum(stats["good"] for stats in read_stats) - worker_bad_parse.value
+    cnt_bad_parse = (
+        sum(stats["bad_parse"] for stats in read_stats) + worker_bad_parse.value
+    )
+    cnt_bad_umf = sum(stats["bad_umf"] for stats in read_stats)
+
+    # Print load stats if not error or ctrl-c
+    if exit_code in (0, 9):
+        processing_secs = end_time - load_start_time
+        elapsed_mins = round((time.time() - load_start_time) / 60, 1)
+
+        # Calculate approximate transactions/sec, remove timings that aren't part of ingest
+        load_tps = (
+            int(
+                (cnt_good_umf + cnt_bad_parse + cnt_bad_umf)
+                / (
+                    processing_secs
+                    - time_governing.value
+                    - time_starting_engines.value
+                    - time_redo.value
                 )
+            )
+            if processing_secs > 0
+            else 0
+        )
+        load_tps = load_tps if load_tps > 0 else cnt_good_umf
 
-                # If the row dsrc_action differs from the CLI ARGs dsrc_action mode, log the fact to print info at end of data source
-                if dsrc_action != dsrc_action_args:
-                    # Not enabled, could quickly fill up redirected logging files
-                    if dsrc_action_diff.value != 1:
-                        with dsrc_action_diff.get_lock():
-                            dsrc_action_diff.value = 1
+        errors_log_file = errors_file.name if errors_file else ""
 
-                    if dsrc_action == "A":
-                        with dsrc_action_add_count.get_lock():
-                            dsrc_action_add_count.value += 1
+        if not api_errors.value and not cnt_bad_parse:
+            errors_log_file = "No errors"
 
-                    if dsrc_action == "D":
-                        with dsrc_action_del_count.get_lock():
-                            dsrc_action_del_count.value += 1
+        if cli_args.errorsFileDisable:
+            errors_log_file = "Disabled with -ed"
 
-                    if dsrc_action == "X":
-                        with dsrc_action_reeval_count.get_lock():
-                            dsrc_action_reeval_count.value += 1
+        print(
+            textwrap.dedent(
+                f"""\n\
+                Processing Information
+                ----------------------
+
+                    Arguments:                       {" ".join(sys.argv[1:])}
+                    Action:                          {dsrc_action_names[dsrcAction]}
+                    Repository purged:               {'Yes' if (cli_args.purgeFirst or cli_args.forcePurge) else 'No'}
+                    Source files:                    {len(read_stats):,} read, {cli_args.parallelFiles} at a time (-pf)
+                    Total records:                   {cnt_good_umf + cnt_bad_parse + cnt_bad_umf:,}
+                    \tGood records:                {cnt_good_umf:,}
+                    \tBad records:                 {cnt_bad_parse:,}
+                    \tIncomplete records:          {cnt_bad_umf:,}
+                    Records specifying action:       {dsrc_action_summary()}
+                    \tAdds:                        {dsrc_action_add_count.value:,}
+                    \tDeletes:                     {dsrc_action_del_count.value:,}
+                    \tReeval:                      {dsrc_action_reeval_count.value:,}
+                    Errors:
+                    \tErrors log file:             {errors_log_file}
+                    \tFailed API calls:            {api_errors.value:,}
+                    Slowest records log:             {slow_records_file if slow_records_file else 'Not written'}
+                    Total elapsed time:              {elapsed_mins} mins
+                    \tStart time:                  {datetime.fromtimestamp(load_start_time).strftime('%I:%M:%S%p').lower()}
+                    \tEnd time:                    {end_time_str}
+                    \tTime processing redo:        {str(round(time_redo.value / 60, 1)) + ' mins' if not cli_args.noRedo else 'Redo disabled (-n)'}
+                    \tTime paused in governor(s):  {round(time_governing.value / 60, 1)} mins
+                    Records per second:              {load_tps:,}
+
+                Source Files
+                ------------
+                """
+            )
+        )
 
-        try:
-            # Catch invalid dsrc_actions and push to error log and log as an API error
-            if dsrc_action not in ("A", "D", "X"):
-                g2thread_error("Unknown dsrc_action", dsrc_action)
+        for source_dict, stats in zip(source_list, file_stats):
+            if not stats:
+                print(f"    {source_dict['FILE_PATH']}\n\tNot read\n")
                 continue
 
-            if dsrc_action == "A":
-                dsrc_action_str = "addRecord()"
-                g2_engine_.addRecord(
-                    data_source, record_id, json.dumps(row, sort_keys=True)
+            read_secs = stats["end_time"] - stats["start_time"]
+            print(
+                textwrap.indent(
+                    textwrap.dedent(
+                        f"""\
+                        {source_path(source_dict)}
+                            Records read:       {stats["rows"]:,}
+                            Good records:       {stats["good"]:,}
+                            Bad records:        {stats["bad_parse"]:,}{" (parse errors in processing threads are in the total only)" if worker_sources[stats["source_idx"]] else ""}
+                            Incomplete records: {stats["bad_umf"]:,}
+                            Read time:          {round(read_secs / 60, 1)} mins
+                            Records per second: {int(stats["rows"] / read_secs) if read_secs > 0 else stats["rows"]:,}
+                        """
+                    ),
+                    "    ",
                 )
+            )
 
-            if dsrc_action == "D":
-                dsrc_action_str = "deleteRecord()"
-                g2_engine_.deleteRecord(data_source, record_id)
-
-            if dsrc_action == "X":
-                dsrc_action_str = "reevaluateRecord()"
-                # Check if the redo record is a REPAIR_ENTITY one, call reevaluateEntity() if so
-                # {'UMF_PROC': {'NAME': 'REPAIR_ENTITY', 'PARAMS': [{'PARAM': {'NAME': 'ENTITY_ID', 'VALUE': '32705738'}}]}}
-                if not data_source and not record_id:
-                    entity_id = (
-                        row.get("UMF_PROC", {})
-                        .get("PARAMS", {})[0]
-                        .get("PARAM", {})
-                        .get("VALUE", None)
-                    )
-                    if entity_id:
-                        g2_engine_.reevaluateEntity(entity_id)
-                    else:
-                        g2thread_error(
-                            "Unable to process redo record format!", dsrc_action_str
-                        )
-                else:
-                    g2_engine_.reevaluateRecord(data_source, record_id, 0)
-
-        except G2LicenseException as ex:
-            print("\nERROR: G2Engine licensing error!")
-            print(f"       {ex}")
-            with thread_stop.get_lock():
-                thread_stop.value = 1
-            return
-        except G2NotFoundException as ex:
-            # Don't error if record for redo can't be located
-            if is_redo_record:
-                pass
-            else:
-                g2thread_error(ex, dsrc_action_str)
-        except G2Exception as ex:
-            g2thread_error(ex, dsrc_action_str)
+    return exit_code, cnt_bad_parse
 
 
-def stop_loader_process_and_threads(thread_list, work_queue):
+def read_concurrent_source_file(
+    source_idx, source_dict, work_queue, thread_list, worker_parse, g2_project
+):
+    """Read one of the source files being loaded at once, returns the read stats or None if stopping"""
 
-    if not cli_args.testMode:
+    if thread_stop.value != 0:
+        return None
 
-        print()
+    file_path = source_dict["FILE_PATH"]
 
-        # It is possible to reach here and the processes be shut down. This can happen when using PostgreSQL and the
-        # Governor is paused waiting for a vacuum and CTRL-C is sent. Thus, ensure there are processes/threads alive
-        # or the while will never exit
-        while work_queue.empty() is False and any(
-            (thread.is_alive() for thread in thread_list)
-        ):
-            print(
-                f"Waiting for remaining records on the queue to be read, remaining: {work_queue.qsize()}",
-                flush=True,
-            )
-            time.sleep(2)
+    # Skip files completed in the run being resumed (--resume)
+    file_checkpoint = (
+        checkpoint.start_file(source_idx, source_dict) if checkpoint else None
+    )
+    if file_checkpoint and file_checkpoint["complete"]:
+        print(
+            f"  Skipping {file_path}, completed in the run being resumed (--resume)",
+            flush=True,
+        )
+        return None
+
+    # Files are interleaved and shuffled while reading, shuffled copies of files aren't written
+    stream_shuffle = (
+        not cli_args.noShuffle
+        and default_thread_count > 1
+        and SHUF_NO_DEL_TAG not in file_path
+        and SHUF_TAG not in file_path
+    )
 
-        with thread_stop.get_lock():
-            thread_stop.value = 1
+    print(f"  Starting to read {file_path}", flush=True)
 
-        print("Waiting for processing threads to finish...\n", flush=True)
-        for thread in thread_list:
-            thread.join()
+    start_time = time.time()
+    file_reader = open_source_reader(
+        file_path,
+        source_dict,
+        stream_shuffle,
+        file_checkpoint["shuffle_seed"] if file_checkpoint else None,
+    )
 
-        work_queue.close()
+    stats = read_source_file(
+        source_idx,
+        source_dict,
+        file_reader,
+        work_queue,
+        thread_list,
+        worker_parse,
+        g2_project,
+        concurrent=True,
+        resume_rows=file_checkpoint["rows"] if file_checkpoint else 0,
+    )
 
+    file_reader.close()
 
-def dump_workload_stats(engine):
-    """Print JSON workload stats"""
+    stats["source_idx"] = source_idx
+    stats["start_time"] = start_time
+    stats["end_time"] = time.time()
 
-    response = bytearray()
-    engine.stats(response)
+    print(
+        f"  Finished reading {source_dict['FILE_NAME']}, {stats['rows']:,} rows at {time_now()}",
+        flush=True,
+    )
 
-    print(f"\n{json.dumps(json.loads(response.decode()))}\n", flush=True)
+    return stats
 
 
-def init_engine(
-    name, config_parms, debug_trace, prime_engine=True, add_start_time=False
-):
-    """Initialize an engine. add_start_time is for redo engines only"""
+def source_path(source_dict):
+    """Full path of a source file, or its URI for S3"""
 
-    if add_start_time:
-        engine_start_time = time.perf_counter()
+    if source_dict["FILE_SOURCE"] == "S3":
+        return source_dict["FILE_PATH"]
+    return str(pathlib.Path(source_dict["FILE_PATH"]).resolve())
 
-    try:
-        engine = G2Engine()
-        engine.init(name, config_parms, debug_trace)
-        if prime_engine:
-            engine.primeEngine()
-    except G2Exception:
-        raise
 
-    if add_start_time:
-        with time_starting_engines.get_lock():
-            time_starting_engines.value += time.perf_counter() - engine_start_time
+def source_file_size(source_dict):
+    """Size of a source file in bytes, S3 files are read from S3 and not downloaded"""
 
-    return engine
+    if source_dict["FILE_SOURCE"] == "S3":
+        return G2S3(source_dict["FILE_PATH"]).getSize()
+    return os.path.getsize(source_dict["FILE_PATH"])
 
 
-def process_redo(q, empty_q_wait=False, empty_q_msg="", sleep_interval=1):
-    """Called in normal and redo only mode (-R) to process redo records that need re-evaluation"""
+def open_source_reader(file_path, source_dict, stream_shuffle, shuffle_seed=None):
+    """Open a source file for reading, skip the header row and shuffle while reading if requested"""
 
-    # Drain the processing queue of ingest records before starting to process redo
-    if empty_q_wait:
-        print(f"\n{empty_q_msg}") if empty_q_msg else print("", end="")
-        while not q.empty():
-            time.sleep(sleep_interval)
+    # Uncompressed local files are memory mapped and rows are read as bytes, decoded only when parsed
+    if (
+        not cli_args.noMmap
+        and source_dict["FILE_SOURCE"] != "S3"
+        and not isCompressedFile(file_path)
+    ):
+        file_reader = MappedLineReader(file_path)
+    else:
+        file_reader = openPossiblyCompressedFile(
+            file_path, "r", threadedDecompress_=not cli_args.noThreadedDecompress
+        )
 
-    # This may look weird but ctypes/ffi have problems with the native code and fork.
-    setup_process = Process(
-        target=redo_feed,
-        args=(q, cli_args.debugTrace, cli_args.redoMode, cli_args.redoModeInterval),
-    )
+    # Delimited files are parsed by one csv reader over the file, rows are lists of fields
+    if isDelimitedRowFile(source_dict):
+        file_reader = DelimitedRowReader(file_reader, source_dict["DELIMITER"])
+
+    # Use previously stored header row, so get rid of this one
+    if source_dict["FILE_FORMAT"] not in ("JSON", "UMF"):
+        next(file_reader)
+
+    if stream_shuffle:
+        # Rows skipped (-skr) or stopped at (-sr) are counted in source order, before shuffling
+        file_reader = ShuffledLineReader(
+            file_reader,
+            cli_args.shuffleWindow,
+            shuffle_seed,
+            cli_args.shuffleWindowMemory * 1024 * 1024,
+            cli_args.skipRecords if not cli_args.redoMode else 0,
+            cli_args.stopOnRecord,
+        )
 
-    redo_start_time = time.perf_counter()
+    return file_reader
 
-    setup_process.start()
-    setup_process.join()
 
-    with time_redo.get_lock():
-        time_redo.value += time.perf_counter() - redo_start_time
+def read_source_file(
+    source_idx,
+    source_dict,
+    file_reader,
+    work_queue,
+    thread_list,
+    worker_parse,
+    g2_project,
+    concurrent=False,
+    resume_rows=0,
+):
+    """Read the rows of a source file onto the work queue. Returns the exit code and row counts for the file,
+    complete is set when the end of the file was reached"""
+
+    def file_stats(threads_failed=False):
+        return {
+            "exit_code": exit_code,
+            "threads_failed": threads_failed,
+            "complete": complete,
+            "rows": cnt_rows,
+            "good": cnt_good_umf,
+            "bad_parse": cnt_bad_parse,
+            "bad_umf": cnt_bad_umf,
+        }
 
-    return setup_process.exitcode
+    exit_code = 0
+    cnt_rows = cnt_bad_parse = cnt_bad_umf = cnt_good_umf = batch_time_governing = 0
+    batch_start_time = time.perf_counter()
+    read_stage = StageTimes()
+    rec_ticker = GovernorTicker(record_governor)
+    complete = False
 
+    if resume_rows:
+        print(
+            f"INFO: Resuming {source_dict['FILE_NAME']} after row {resume_rows:,}, rows up to it were processed in the run being resumed"
+        )
 
-def redo_feed(q, debug_trace, redo_mode, redo_mode_interval):
-    """Process records in the redo queue"""
+    work_batch = []
+    work_batch_size = 0
 
-    pass_num = cnt_rows = batch_time_governing = 0
-    batch_start_time = time.time()
-    rec_bytes = bytearray()
-    rec = None
-    test_get_redo = False
+    # Identify the file in progress messages when several files are read at once
+    file_msg = f" from {source_dict['FILE_NAME']}" if concurrent else ""
 
-    try:
-        redo_engine = init_engine(
-            "pyG2Redo",
-            g2module_params,
-            debug_trace,
-            prime_engine=False,
-            add_start_time=False,
-        )
+    # Records are checked by parsing them in test mode, never passed through
+    pass_through = cli_args.passThrough and not cli_args.testMode
 
-        # Only do initial count if in redo mode, counting large redo can be expensive
-        if redo_mode:
-            redo_count = redo_engine.countRedoRecords()
-            print(f"Redo records: {redo_count:,}")
+    while True:
 
-        # Test if there is anything on redo queue
-        else:
-            try:
-                redo_engine.getRedoRecord(rec_bytes)
-                rec = rec_bytes.decode()
-                test_get_redo = True
-            except G2Exception as ex:
-                print("ERROR: Could not get redo record for redoFeed()")
-                print(f"       {ex}")
-                exit(1)
+        read_start = time.perf_counter()
+        try:
+            row = next(file_reader)
+        except StopIteration:
+            complete = True
+            break
+        except Exception as ex:
+            cnt_rows += 1
+            if cnt_rows <= resume_rows:
+                continue
+            cnt_bad_parse += 1
+            read_stage.add_read(read_start, bad=True)
+            report_read_error(cnt_rows, ex)
+            continue
+        read_stage.add_read(read_start)
 
-    except G2Exception as ex:
-        print("ERROR: Could not start the G2 engine for redoFeed()")
-        print(f"       {ex}")
-        exit(1)
+        # Increment row count to agree with line count and references to bad rows are correct
+        cnt_rows += 1
 
-    # If test didn't return a redo record, exit early
-    if not rec and not redo_mode:
-        print("\n  No redo to perform, resuming loading...\n")
-        return
+        # Rows processed in the run being resumed (--resume)
+        if cnt_rows <= resume_rows:
+            continue
 
-    # Init redo governor in this process, trying to use DB connection in forked process created outside will cause errors when using
-    # PostgreSQL governor such as: psycopg2.OperationalError: SSL error: decryption failed or bad record mac
-    redo_governor = Governor()
-    if governor:
-        redo_governor = governor.Governor(
-            thread_stop,
-            type="Redo per redo record",
-            g2module_params=g2module_params,
-            frequency="record",
-            pre_post_msgs=False,
-        )
+        # Skip records
+        if (
+            not cli_args.redoMode
+            and cli_args.skipRecords
+            and cnt_rows < cli_args.skipRecords + 1
+        ):
+            if cnt_rows == 1:
+                print(f"INFO: Skipping the first {cli_args.skipRecords} records...")
+            continue
 
-    if not redo_mode:
-        print("\n  Pausing loading to process redo records...")
+        # Raw rows are sent in worker parse mode, parsing and file defaults are applied by the processing threads
+        if worker_parse:
+            row_data = row
+            ok_to_continue = True
 
-    while thread_stop.value == 0:
+        else:
+            # Skip blank or records that error, errors written to errors file if not disabled
+            # JSON rows are sent as read when the keys needed are found without parsing (-pt)
+            parse_start = time.perf_counter()
+            pass_through_row = (
+                fileRowPassThrough(row, source_dict) if pass_through else None
+            )
+            row_data = pass_through_row or fileRowParser(
+                row,
+                source_dict,
+                cnt_rows,
+                errors_file=errors_file,
+                errors_short=cli_args.errorsShort,
+                errors_disable=cli_args.errorsFileDisable,
+            )
+            read_stage.add_parse(parse_start, bad=not row_data)
+            if not row_data:
+                cnt_bad_parse += 1
+                continue
 
-        # Don't get another redo record if fetched one during test of redo queue
-        if not test_get_redo:
-            try:
-                redo_engine.getRedoRecord(rec_bytes)
-                rec = rec_bytes.decode()
-            except G2Exception as ex:
-                print("ERROR: Could not get redo record for redoFeed()")
-                print(f"       {ex}")
-                exit(1)
+            # Don't do any transformation if this is raw UMF or passed through
+            ok_to_continue = True
+            if source_dict["FILE_FORMAT"] != "UMF" and not pass_through_row:
 
-        test_get_redo = False
+                # Update with file defaults
+                if "DATA_SOURCE" not in row_data and "DATA_SOURCE" in source_dict:
+                    row_data["DATA_SOURCE"] = source_dict["DATA_SOURCE"]
 
-        if not rec:
-            pass_num += 1
-            if pass_num > 10:
-                if redo_mode:
-                    print(
-                        f"  Redo queue empty, {cnt_rows:,} total records processed. Waiting {redo_mode_interval} seconds for next cycle at {time_now(True)} (CTRL-C to quit)..."
+                if cli_args.testMode:
+                    mapping_response = g2_project.testJsonRecord(
+                        row_data, cnt_rows, source_dict
                     )
-                    # Sleep in 1 second increments to respond to user input
-                    for x in range(1, redo_mode_interval):
-                        if thread_stop.value == 9:
-                            break
-                        time.sleep(1.0)
-                else:
-                    break
-            time.sleep(0.05)
-            continue
-        else:
-            pass_num = 0
+                    if mapping_response[0]:
+                        cnt_bad_umf += 1
+                        ok_to_continue = False
 
-        cnt_rows += 1
+                # --only add force a load_id if not in test mode (why do we do this??)
+                if "LOAD_ID" not in row_data:
+                    row_data["LOAD_ID"] = source_dict["FILE_NAME"]
+
+        # Add the record to the batch for the queue, send when the batch is full by record count or size
+        if ok_to_continue:
+            cnt_good_umf += 1
+            if not cli_args.testMode:
+                # Assist in indicating what type of record this is for processing thread
+                # Detect and set here if dsrc action was set as reeval on args
+                work_batch.append(
+                    (row_data, True if dsrcAction == "X" else False, cnt_rows)
+                )
+                work_batch_size += rowSize(row)
 
-        while True:
-            try:
-                # Tuple to indicate if a record on work queue is redo - (rec, True == this is redo)
-                q.put((json.loads(rec), True), True, 1)
-            except Full:
-                if thread_stop.value != 0:
-                    break
-                continue
-            break
+                if (
+                    len(work_batch) >= cli_args.queueBatchSize
+                    or work_batch_size >= QUEUE_BATCH_MAX_SIZE
+                ):
+                    read_stage.publish()
+                    if not put_work_queue(
+                        work_queue, (source_idx, work_batch), thread_list
+                    ):
+                        return file_stats(threads_failed=True)
+                    work_batch = []
+                    work_batch_size = 0
 
         if cnt_rows % cli_args.loadOutputFrequency == 0:
-            redo_speed = (
+            batch_speed = (
                 int(
                     cli_args.loadOutputFrequency
-                    / (time.time() - batch_start_time - batch_time_governing)
+                    / (time.perf_counter() - (batch_start_time - batch_time_governing))
                 )
-                if time.time() - batch_start_time != 0
+                if time.perf_counter() - batch_start_time != 0
                 else 1
             )
             print(
-                f"  {cnt_rows:,} redo records processed at {time_now()}, {redo_speed:,} records per second"
+                f'  {cnt_rows:,} rows processed{file_msg} at {time_now()}, {batch_speed:,} records per second{f", {api_errors.value:,} API errors" if api_errors.value > 0 else ""}',
+                flush=True,
             )
-            batch_start_time = time.time()
+
+            batch_start_time = time.perf_counter()
             batch_time_governing = 0
 
-        # Governor called for each redo record
-        try:
-            redo_gov_start = time.perf_counter()
-            redo_governor.govern()
-            redo_gov_stop = time.perf_counter()
-            time_governing.value += redo_gov_stop - redo_gov_start
-            batch_time_governing += redo_gov_stop - redo_gov_start
-        except Exception as ex:
-            shutdown(f"\nERROR: Calling per redo governor: {ex}")
+        # Process redo during ingestion, not when several files are being read at once or redo runs alongside (-cr)
+        if (
+            cnt_rows % cli_args.redoInterruptFrequency == 0
+            and not concurrent
+            and not cli_args.concurrentRedo
+            and not cli_args.testMode
+            and not cli_args.noRedo
+        ):
+            # Send the partial batch so it's processed before redo
+            if work_batch:
+                if not put_work_queue(
+                    work_queue, (source_idx, work_batch), thread_list
+                ):
+                    return file_stats(threads_failed=True)
+                work_batch = []
+                work_batch_size = 0
 
-    if cnt_rows > 0:
-        print(f"\t{cnt_rows:,} reevaluations completed\n")
+            if process_redo(
+                work_queue,
+                True,
+                "Waiting for processing queue to empty to start redo...",
+            ):
+                print("\nERROR: Could not process redo record!\n")
 
-    redo_engine.destroy()
-    del redo_engine
+        # Check to see if any threads threw errors or control-c pressed and shut down
+        if thread_stop.value != 0:
+            exit_code = thread_stop.value
+            break
 
-    if not redo_mode:
-        print("  Redo processing complete resuming loading...\n")
+        # Check if any of the threads died without throwing errors
+        if not all((thread.is_alive() for thread in thread_list)):
+            print("\nERROR: Thread failure!")
+            break
 
-    return
+        # Governor called every so many records, as the governor requests
+        # Called here instead of when reading from queue to allow queue to act as a small buffer
+        rec_ticker.countdown -= 1
+        if rec_ticker.countdown <= 0:
+            try:
+                batch_time_governing += rec_ticker.check()
+            except Exception as err:
+                shutdown(f"\nERROR: Calling per record governor: {err}")
 
+        # Break this file if stop on record value
+        if (
+            not cli_args.redoMode
+            and cli_args.stopOnRecord
+            and cnt_rows >= cli_args.stopOnRecord
+        ):
+            print(
+                f"\nINFO: Stopping at record {cnt_rows}, --stopOnRecord (-sr) argument was set"
+            )
+            break
 
-def load_redo_queue_and_process():
+    # Send any remaining partial batch
+    read_stage.publish()
+    rec_ticker.publish()
+    if work_batch:
+        if not put_work_queue(work_queue, (source_idx, work_batch), thread_list):
+            return file_stats(threads_failed=True)
 
-    exit_code = 0
-    DumpStack.listen()
-    proc_start_time = time.time()
+    return file_stats()
 
-    thread_list, work_queue = start_loader_process_and_threads(default_thread_count)
-    if thread_stop.value != 0:
-        return exit_code
 
-    if thread_stop.value == 0 and not cli_args.testMode and not cli_args.noRedo:
-        exit_code = process_redo(work_queue)
+def create_split_read(source_dict, file_path, transport_thread_count):
+    """Split a source file into a line aligned byte range for each processing process and create the shared
+    counters the processes report their reading through"""
 
-    stop_loader_process_and_threads(thread_list, work_queue)
+    num_ranges = math.ceil(transport_thread_count / cli_args.max_threads_per_process)
 
-    elapsed_mins = round((time.time() - proc_start_time) / 60, 1)
-    if exit_code:
-        print(f"\nRedo processing cycle aborted after {elapsed_mins} minutes")
-    else:
-        print(
-            f"\nRedo processing cycle completed successfully in {elapsed_mins} minutes"
-        )
+    # Header row is read from the start of the file, ranges start after it
+    header_size = 0
+    if source_dict["FILE_FORMAT"] not in ("JSON", "UMF"):
+        with open(file_path, "rb") as f:
+            header_size = len(f.readline())
 
-    return exit_code
+    ranges = lineAlignedRanges(file_path, num_ranges, header_size)
 
+    # Each process only updates its own slot in the counters, no locks are required
+    return {
+        "source_dict": source_dict,
+        "file_path": file_path,
+        "ranges": ranges,
+        "line_counts": Array("q", [-1] * len(ranges), lock=False),
+        "rows": Array("q", len(ranges), lock=False),
+        "good": Array("q", len(ranges), lock=False),
+        "bad_parse": Array("q", len(ranges), lock=False),
+        "done": Array("i", len(ranges), lock=False),
+    }
 
-def addDataSource(
-    g2_config_module, config_doc, data_source, configured_datasources_only
-):
-    """Adds a data source if does not exist"""
 
-    return_code = 0  # 1=inserted, 2=updated
+def wait_for_split_read(split_read, thread_list):
+    """Report progress while the processing processes read their ranges of the source file (-sp). Returns the
+    exit code and row counts for the file, as read_source_file()"""
 
-    config_handle = g2_config_module.load(config_doc)
-    dsrc_exists = False
-    dsrc_list_doc_string = bytearray()
-    g2_config_module.listDataSources(config_handle, dsrc_list_doc_string)
-    dsrc_list_doc = json.loads(dsrc_list_doc_string.decode())
-    dsrc_list_node = dsrc_list_doc["DATA_SOURCES"]
+    exit_code = 0
+    next_output = cli_args.loadOutputFrequency
+    batch_start_rows = 0
+    batch_start_time = time.perf_counter()
 
-    for dsrcNode in dsrc_list_node:
-        if dsrcNode["DSRC_CODE"].upper() == data_source:
-            dsrc_exists = True
+    while not all(split_read["done"]):
 
-    if dsrc_exists is False:
-        if configured_datasources_only is False:
-            add_data_source_json = '{"DSRC_CODE":"%s"}' % data_source
-            add_data_source_result_buf = bytearray()
-            g2_config_module.addDataSource(
-                config_handle, add_data_source_json, add_data_source_result_buf
+        time.sleep(1)
+
+        cnt_rows = sum(split_read["rows"])
+        if cnt_rows >= next_output:
+            batch_speed = int(
+                (cnt_rows - batch_start_rows) / (time.perf_counter() - batch_start_time)
             )
-            new_config = bytearray()
-            g2_config_module.save(config_handle, new_config)
-            config_doc[::] = b""
-            config_doc += new_config
-            return_code = 1
-        else:
-            raise UnconfiguredDataSourceException(data_source)
+            print(
+                f'  {cnt_rows:,} rows processed at {time_now()}, {batch_speed:,} records per second{f", {api_errors.value:,} API errors" if api_errors.value > 0 else ""}',
+                flush=True,
+            )
+            next_output = (
+                cnt_rows // cli_args.loadOutputFrequency + 1
+            ) * cli_args.loadOutputFrequency
+            batch_start_rows = cnt_rows
+            batch_start_time = time.perf_counter()
 
-    g2_config_module.close(config_handle)
+        # Check to see if any threads threw errors or control-c pressed and shut down
+        if thread_stop.value != 0:
+            exit_code = thread_stop.value
+            break
 
-    return return_code
+        # Check if any of the processes died without throwing errors
+        if not all((thread.is_alive() for thread in thread_list)):
+            print("\nERROR: Thread failure!")
+            break
 
+    return {
+        "exit_code": exit_code,
+        "threads_failed": False,
+        "rows": sum(split_read["rows"]),
+        "good": sum(split_read["good"]),
+        "bad_parse": sum(split_read["bad_parse"]),
+        "bad_umf": 0,
+        "complete": exit_code == 0 and all(split_read["done"]),
+    }
 
-def get_initial_g2_config_process_wrapper(return_queue, params, g2_config_json):
-    result = get_initial_g2_config(params, g2_config_json)
-    # Return values are put in a queue
-    return_queue.put(g2_config_json)
-    return_queue.put(result)
 
+def split_range_offset(split_read, range_idx):
+    """Rows in the ranges of a split file (-sp) before range_idx, None until they have all been read. Each range
+    reports its row count when it finishes reading"""
 
-def get_initial_g2_config(params, g2_config_json):
+    counts = split_read["line_counts"][:range_idx]
+    return None if any(count < 0 for count in counts) else sum(counts)
 
-    # Get the current configuration from the database
-    g2_config_mgr = G2ConfigMgr()
-    g2_config_mgr.init("g2ConfigMgr", params, False)
-    default_config_id = bytearray()
-    g2_config_mgr.getDefaultConfigID(default_config_id)
 
-    if len(default_config_id) == 0:
-        print(
-            "ERROR: No default config stored in database. (see https://senzing.zendesk.com/hc/en-us/articles/360036587313)"
-        )
-        return False
-    default_config_doc = bytearray()
-    g2_config_mgr.getConfig(default_config_id, default_config_doc)
+def read_split_range(split_read, range_idx, range_queue, range_done, thread_stop):
+    """Read and parse the rows in a processing process's range of the source file onto its local queue (-sp)"""
 
-    if len(default_config_doc) == 0:
-        print(
-            "ERROR: No default config stored in database. (see https://senzing.zendesk.com/hc/en-us/articles/360036587313)"
-        )
-        return False
-    g2_config_json[::] = b""
-    g2_config_json += default_config_doc
-    g2_config_mgr.destroy()
-    del g2_config_mgr
+    def put_range_queue(work_batch):
+        put_start = time.perf_counter()
+        while thread_stop.value == 0:
+            try:
+                range_queue.put((0, work_batch), True, 1)
+                break
+            except Full:
+                continue
+        if metrics:
+            metrics.queue_put_wait_seconds.inc(time.perf_counter() - put_start)
 
-    return True
+    def bad_row(range_row, row, read_error=None):
+        """Report a row that couldn't be read or parsed with its row number in the source file, kept until the
+        rows before this range have been read"""
 
+        nonlocal offset, deferred_rows
 
-def enhance_g2_config_process_wrapper(
-    return_queue, g2_project, params, g2_config_json, configured_datasources_only
-):
-    result = enhance_g2_config(
-        g2_project, params, g2_config_json, configured_datasources_only
-    )
-    # Return values are put in a queue
-    return_queue.put(g2_config_json)
-    return_queue.put(result)
+        if offset is None:
+            offset = split_range_offset(split_read, range_idx)
+            if offset is None:
+                if not deferred_rows:
+                    deferred_rows = tempfile.TemporaryFile()
+                pickle.dump((range_row, row, read_error), deferred_rows)
+                return
+            report_deferred_rows()
 
+        report_bad_row(offset + range_row, row, read_error)
 
-def enhance_g2_config(g2_project, params, g2_config_json, configured_datasources_only):
+    def report_bad_row(row_num, row, read_error):
+        if read_error:
+            report_read_error(row_num, read_error)
+        else:
+            parse_source_row(row, source_dict, row_num)
 
-    # Define variables for where the config is stored.
+    def report_deferred_rows():
+        """Report the bad rows kept, with row numbers within the range if stopped before the prior ranges were read"""
 
-    g2_config = G2Config()
-    g2_config.init("g2Config", params, False)
+        nonlocal deferred_rows
 
-    # Add any missing source codes and entity types to the g2 config
-    g2_new_config_required = False
-    for sourceDict in g2_project.sourceList:
-        if "DATA_SOURCE" in sourceDict:
+        if not deferred_rows:
+            return
+
+        deferred_rows.seek(0)
+        while True:
             try:
-                if (
-                    addDataSource(
-                        g2_config,
-                        g2_config_json,
-                        sourceDict["DATA_SOURCE"],
-                        configured_datasources_only,
-                    )
-                    == 1
-                ):  # inserted
-                    g2_new_config_required = True
-            except UnconfiguredDataSourceException as err:
-                print(err)
-                return False
+                range_row, row, read_error = pickle.load(deferred_rows)
+            except EOFError:
+                break
+            report_bad_row(
+                (
+                    offset + range_row
+                    if offset is not None
+                    else f"{range_row} of split range {range_idx + 1}"
+                ),
+                row,
+                read_error,
+            )
 
-    # Add a new config, if we made changes
-    if g2_new_config_required is True:
-        g2_config_mgr = G2ConfigMgr()
-        g2_config_mgr.init("g2ConfigMgr", params, False)
-        new_config_id = bytearray()
+        deferred_rows.close()
+        deferred_rows = None
 
-        try:
-            g2_config_mgr.addConfig(
-                g2_config_json.decode(), "Updated From G2Loader", new_config_id
-            )
-        except G2Exception:
-            print("Error: Failed to add new config to the datastore")
-            return False
+    source_dict = split_read["source_dict"]
+    file_path = split_read["file_path"]
+    range_start, range_end = split_read["ranges"][range_idx]
+
+    # Rows are numbered from the start of the range, to number them in the source file the rows of the ranges
+    # before it are added once they have been read. Bad rows found before then are reported when they have
+    cnt_rows = 0
+    offset = split_range_offset(split_read, range_idx)
+    deferred_rows = None
+
+    # Init record governor in this process, see redo_feed()
+    range_governor = Governor()
+    if governor:
+        range_governor = governor.Governor(
+            thread_stop,
+            type="Ingest per source record",
+            g2module_params=g2module_params,
+            frequency="record",
+            pre_post_msgs=False,
+            **governor_throttle_args(),
+        )
+    range_ticker = GovernorTicker(range_governor)
+
+    file_reader = (
+        MappedLineReader(file_path, range_start, range_end)
+        if not cli_args.noMmap
+        else LineRangeReader(file_path, range_start, range_end)
+    )
 
+    work_batch = []
+    work_batch_size = 0
+    read_stage = StageTimes()
+    complete = False
+
+    while thread_stop.value == 0:
+
+        read_start = time.perf_counter()
         try:
-            g2_config_mgr.setDefaultConfigID(new_config_id)
-        except G2Exception:
-            print("Error: Failed to set new config as default")
-            return False
-        g2_config_mgr.destroy()
-        del g2_config_mgr
+            row = next(file_reader)
+        except StopIteration:
+            complete = True
+            break
+        except Exception as ex:
+            cnt_rows += 1
+            split_read["rows"][range_idx] += 1
+            split_read["bad_parse"][range_idx] += 1
+            read_stage.add_read(read_start, bad=True)
+            bad_row(cnt_rows, None, str(ex))
+            continue
+        read_stage.add_read(read_start)
 
-    g2_config.destroy()
-    del g2_config
+        cnt_rows += 1
+        split_read["rows"][range_idx] += 1
+
+        parse_start = time.perf_counter()
+        row_data = parse_source_row(
+            row,
+            source_dict,
+            offset + cnt_rows if offset is not None else cnt_rows,
+            quiet=offset is None,
+        )
+        read_stage.add_parse(parse_start, bad=not row_data)
+        if not row_data:
+            split_read["bad_parse"][range_idx] += 1
+            if offset is None:
+                bad_row(cnt_rows, row)
+            continue
 
-    return True
+        split_read["good"][range_idx] += 1
+        work_batch.append((row_data, True if dsrcAction == "X" else False, cnt_rows))
+        work_batch_size += rowSize(row)
 
+        if (
+            len(work_batch) >= cli_args.queueBatchSize
+            or work_batch_size >= QUEUE_BATCH_MAX_SIZE
+        ):
+            read_stage.publish()
+            put_range_queue(work_batch)
+            work_batch = []
+            work_batch_size = 0
 
-def time_now(add_secs=False):
-    """Date time now for processing messages"""
+        range_ticker.countdown -= 1
+        if range_ticker.countdown <= 0:
+            try:
+                range_ticker.check()
+            except Exception as err:
+                shutdown(f"\nERROR: Calling per record governor: {err}")
 
-    fmt_string = "%I:%M%p"
-    if add_secs:
-        fmt_string = "%I:%M:%S%p"
+    read_stage.publish()
+    range_ticker.publish()
+    if work_batch:
+        put_range_queue(work_batch)
 
-    return datetime.now().strftime(fmt_string).lower()
+    file_reader.close()
 
+    # Processing threads switch to the shared work queue once the range queue is empty
+    if complete:
+        split_read["line_counts"][range_idx] = cnt_rows
+    range_done.set()
 
-def signal_int(sig, frame):
-    """Signal interrupt handler"""
+    # Bad rows kept are reported once the ranges before this one have been read
+    if deferred_rows:
+        while thread_stop.value == 0 and offset is None:
+            time.sleep(0.1)
+            offset = split_range_offset(split_read, range_idx)
+        report_deferred_rows()
 
-    shutdown(
-        f"USER INTERRUPT ({sig}) - Stopping threads, please be patient this can take a number of minutes..."
-    )
+    # The range is only reported done to the main process when its records have been taken for processing
+    while thread_stop.value == 0 and not range_queue.empty():
+        time.sleep(0.1)
+    split_read["done"][range_idx] = 1
 
 
-def shutdown(msg=None):
-    """Shutdown threads and exit cleanly from Governor if in use and clean up Governor"""
+def governor_throttle_args():
+    """Keyword arguments asking record governors to throttle instead of only pausing (-gt), not passed otherwise
+    as custom governors may not accept them"""
 
-    if msg:
-        print(f"{msg}")
+    return (
+        {"throttle_rate": cli_args.governorThrottle}
+        if cli_args.governorThrottle
+        else {}
+    )
 
-    print("Shutting down...\n")
 
-    with thread_stop.get_lock():
-        thread_stop.value = 9
+def add_governing_time(secs):
+    """Add time paused in a governor to the load stats and metrics"""
 
-    return
+    with time_governing.get_lock():
+        time_governing.value += secs
 
+    if metrics:
+        metrics.governor_pause_seconds.inc(secs)
 
-def governor_setup():
-    """Import and create governors"""
 
-    # Create default governors, replace if using a real governor for PostgreSQL
-    rec_governor = Governor()
-    src_governor = Governor()
+def dsrc_action_summary():
+    """Count of records specifying their own dsrc action, formatted for the load stats"""
 
-    # When Postgres always import the Postgres governor - unless requested disabled (e.g., getting started and no native driver)
-    if (
-        not cli_args.governor
-        and "POSTGRESQL" in ini_db_types
-        and not cli_args.governorDisable
-    ):
-        print(
-            f"\nUsing PostgreSQL, loading default governor: {DEFAULT_POSTGRES_GOVERNOR}\n"
-        )
-        import_governor = (
-            DEFAULT_POSTGRES_GOVERNOR[:-3]
-            if DEFAULT_POSTGRES_GOVERNOR.endswith(".py")
-            else DEFAULT_POSTGRES_GOVERNOR
-        )
-    # If a governor was specified import it
-    elif cli_args.governor:
-        import_governor = (
-            cli_args.governor[0][:-3]
-            if cli_args.governor[0].endswith(".py")
-            else cli_args.governor[0]
+    if dsrcAction != "A":
+        return (
+            f"Not considered, explicit mode specified ({dsrc_action_names[dsrcAction]})"
         )
-        print(f"\nLoading governor {import_governor}\n")
-    # Otherwise use dummy governors
-    else:
-        return rec_governor, src_governor, False
 
+    rec_dsrc_action = (
+        dsrc_action_add_count.value
+        + dsrc_action_del_count.value
+        + dsrc_action_reeval_count.value
+        if dsrc_action_diff.value
+        else 0
+    )
+
+    return f"{rec_dsrc_action:,}"
+
+
+def put_work_queue(work_queue, work_item, thread_list):
+    """Put a source index and batch of records on the work queue, returns False if the processing threads have died"""
+
+    # Ingest batches are tracked for checkpoints (-cp) by the row number of their last record
+    source_idx, batch = work_item
+    if checkpoint and source_idx is not None:
+        checkpoint.batch_sent(source_idx, batch[-1][2])
+
+    put_start = time.perf_counter()
     try:
-        gov = importlib.import_module(import_governor)
-    except ImportError as ex:
-        print(f"\nERROR: Unable to import governor {import_governor}")
-        print(f"       {ex}")
-        sys.exit(1)
+        return put_work_queue_wait(work_queue, work_item, thread_list)
+    finally:
+        if metrics:
+            metrics.queue_put_wait_seconds.inc(time.perf_counter() - put_start)
 
-    # If not in redo mode create all governors we may call upon
-    if not cli_args.redoMode:
 
-        # Init governors for each record, each source. Governor creation sets defaults, can override. See sample governor-postgresXID.py
-        # Minimum keyword args: g2module_params, frequency
-        # Example of overriding governor init parms
-        # rec_governor = governor.Governor(type='Ingest per source record', g2module_params=g2module_params, frequency='record', wait_time=20, resume_age=5000, xid_age=1500000)
-        rec_governor = gov.Governor(
-            thread_stop,
-            type="Ingest per source record",
-            g2module_params=g2module_params,
-            frequency="record",
-        )
-        src_governor = gov.Governor(
-            thread_stop,
-            type="Ingest per source",
-            g2module_params=g2module_params,
-            frequency="source",
-        )
+def put_work_queue_wait(work_queue, work_item, thread_list):
+    """Wait for space on the work queue, see put_work_queue()"""
 
-    # If in redo mode only create a redo governor
-    if cli_args.redoMode or not cli_args.noRedo:
-        # Redo governor created and destroyed here only to produce startup output, real redo governor is created in redo process
-        gov.Governor(
-            thread_stop,
-            type="Redo per redo record",
-            g2module_params=g2module_params,
-            frequency="record",
+    while True:
+        try:
+            work_queue.put(work_item, True, 1)
+        except Full:
+            # Check to see if any threads have died
+            if not all((thread.is_alive() for thread in thread_list)):
+                print(
+                    textwrap.dedent(
+                        """\n\
+                    ERROR: Thread(s) have shutdown unexpectedly!
+
+                           - This typically happens when memory resources are exhausted and the system randomly kills processes.
+
+                           - Please review: https://senzing.zendesk.com/hc/en-us/articles/115000856453
+
+                           - Check output from the following command for out of memory messages.
+
+                                - dmesg -e
+                """
+                    )
+                )
+                return False
+            continue
+        return True
+
+
+def send_to_g2(
+    thread_id_,
+    work_queue_,
+    num_threads_,
+    debug_trace,
+    thread_stop,
+    no_workload_stats,
+    dsrc_action,
+    source_list,
+    split_read=None,
+):
+
+    g2_engines = []
+
+    try:
+        g2_engine = init_engine(
+            f"pyG2Engine{thread_id_}",
+            g2module_params,
+            debug_trace,
+            prime_engine=True,
+            add_start_time=True,
         )
+        g2_engines.append(g2_engine)
+    except G2Exception as ex:
+        print("ERROR: Could not start the G2 engine for sendToG2()")
+        print(f"       {ex}")
 
-    return rec_governor, src_governor, gov
+        with thread_stop.get_lock():
+            thread_stop.value = 1
+        return
 
+    try:
 
-if __name__ == "__main__":
+        thread_list = []
+        thread_work_queue = work_queue_
+        range_reader = None
+
+        # Engine call timings kept by each thread, merged and sent to the main process when finished
+        thread_timings = [
+            CallTimings(cli_args.slowRecordsCount) for _ in range(num_threads_)
+        ]
+
+        # Read this process's range of the source file (-sp), the shared work queue is still used for redo
+        if split_read:
+            range_queue = ThreadQueue(num_threads_ * 10)
+            range_done = threading.Event()
+            thread_work_queue = SplitRangeQueue(range_queue, work_queue_, range_done)
+            range_reader = threading.Thread(
+                target=read_split_range,
+                args=(split_read, thread_id_ - 1, range_queue, range_done, thread_stop),
+            )
 
-    DEFAULT_POSTGRES_GOVERNOR = "governor_postgres_xid.py"
-    SHUF_NO_DEL_TAG = "_-_SzShufNoDel_-_"
-    SHUF_TAG = "_-_SzShuf_-_"
-    SHUF_TAG_GLOB = "_-_SzShuf*"
-    SHUF_RESPONSE_TIMEOUT = 30
+        for myid in range(num_threads_):
+            thread_list.append(
+                threading.Thread(
+                    target=g2_thread,
+                    args=(
+                        f"{thread_id_}-{myid}",
+                        thread_work_queue,
+                        g2_engine,
+                        thread_stop,
+                        dsrc_action,
+                        source_list,
+                        (thread_id_ - 1) * cli_args.max_threads_per_process + myid,
+                        thread_timings[myid],
+                    ),
+                )
+            )
 
-    exit_code = 0
+        for thread in thread_list:
+            thread.start()
 
-    thread_stop = Value("i", 0)
-    time_starting_engines = Value("d", 0)
-    time_governing = Value("d", 0)
-    time_redo = Value("d", 0)
-    api_errors = Value("i", 0)
-    dsrc_action_diff = Value("i", 0)
+        if range_reader:
+            range_reader.start()
 
-    # Human friendly names
-    dsrc_action_names = {"A": "Add", "D": "Delete", "X": "Reevaluate"}
+        # Periodically output engine workload stats
+        if not no_workload_stats:
+            break_stop = False
 
-    # Counts for records using different dsrc action
-    dsrc_action_add_count = Value("i", 0)
-    dsrc_action_del_count = Value("i", 0)
-    dsrc_action_reeval_count = Value("i", 0)
+            while thread_stop.value == 0:
 
-    manager = Manager()
-    ini_db_types = manager.list()
+                start_time = time.time()
+                while (time.time() - start_time) <= cli_args.workloadOutputFrequency:
+                    # Check if stopping between sleeping, set break_stop to prevent workload stats
+                    if thread_stop.value != 0:
+                        break_stop = True
+                        break
 
-    signal.signal(signal.SIGINT, signal_int)
-    signal.signal(signal.SIGTERM, signal_int)
-    DumpStack.listen()
+                    # Sleep in small period, don't sleep the full amount or can block StopLoaderAndThreads() finishing
+                    time.sleep(2)
+
+                if break_stop:
+                    break
+
+                for engine in g2_engines:
+                    dump_workload_stats(engine)
+
+        if range_reader:
+            range_reader.join()
+
+        for thread in thread_list:
+            thread.join()
+
+        process_timings = CallTimings(cli_args.slowRecordsCount)
+        for timings in thread_timings:
+            process_timings.merge(timings)
+        if split_read:
+            process_timings.offset_rows(split_range_offset(split_read, thread_id_ - 1))
+        call_timings_queue.put(process_timings)
+
+    except Exception:
+        with thread_stop.get_lock():
+            thread_stop.value = 1
+        pass
+
+    # Final workload stats as finishing up
+    if not no_workload_stats:
+        dump_workload_stats(g2_engine)
+
+    with suppress(Exception):
+        g2_engine.destroy()
+        del g2_engine
+
+    return
+
+
+def g2_thread(
+    _,
+    work_queue_,
+    g2_engine_,
+    thread_stop,
+    dsrc_action_args,
+    source_list_=None,
+    thread_num_=0,
+    call_timings_=None,
+):
+    """g2 thread function"""
+
+    def g2thread_error(msg, action):
+        """Write out errors during processing"""
+
+        call_error = textwrap.dedent(
+            f"""
+            {str(datetime.now())} ERROR: {action} - {msg}
+                Data source: {data_source}
+                Record ID: {record_id}
+                Record Type: {"Redo" if is_redo_record else "Ingest"}
+
+                {row if not cli_args.errorsShort else " "}
+           """
+        )
+
+        # If logging to error file is disabled print instead
+        if cli_args.errorsFileDisable:
+            print(
+                call_error,
+                flush=True,
+                end="\033[F\033[F" if cli_args.errorsShort else "\n",
+            )
+
+        if not cli_args.errorsFileDisable:
+            try:
+                errors_file.write(f"\n\n{call_error.strip()}")
+                errors_file.flush()
+            except Exception as ex:
+                print(f"\nWARNING: Unable to write API error to {errors_file.name}")
+                print(f"         {ex}", flush=True)
+                # If can't write to file, write to terminal
+                print(
+                    call_error,
+                    flush=True,
+                    end="\033[F\033[F" if cli_args.errorsShort else "\n",
+                )
+
+        # Increment value to report at end of processing each source
+        with api_errors.get_lock():
+            api_errors.value += 1
+        if metrics:
+            metrics.api_errors.inc()
+
+    # For each work queue item
+    while thread_stop.value == 0 or work_queue_.empty() is False:
+
+        # Parked by the autotuner (-at)
+        if 0 < active_threads.value <= thread_num_:
+            time.sleep(0.5)
+            continue
+
+        get_start = time.perf_counter()
+        try:
+            source_idx, batch = work_queue_.get(True, 1)
+        except Empty:
+            if metrics:
+                metrics.queue_get_wait_seconds.inc(time.perf_counter() - get_start)
+            continue
+
+        with records_processed.get_lock():
+            records_processed.value += len(batch)
+        if metrics:
+            metrics.queue_get_wait_seconds.inc(time.perf_counter() - get_start)
+            metrics.records_processed.inc(len(batch))
+        parse_stage = StageTimes()
+
+        # Source the batch was read from when parsing in the threads (-wp), redo batches have no source
+        source_dict_ = (
+            source_list_[source_idx]
+            if source_list_ and source_idx is not None
+            else None
+        )
+
+        # Each work queue item is a batch of tuples of the data, indicator for being a redo record and source row number
+        for row, is_redo_record, row_num in batch:
+
+            # Redo records are the raw JSON from getRedoRecord(), parsed here instead of in the redo feeder
+            if source_idx is None and isinstance(row, str):
+                try:
+                    row = G2Json.loads(row)
+                except ValueError as ex:
+                    data_source = record_id = ""
+                    g2thread_error(ex, "Parsing redo record")
+                    continue
+
+            # Raw row from the reader in worker parse mode (-wp), parse and apply file defaults
+            if source_dict_ and isinstance(row, (str, bytes, list)):
+                parse_start = time.perf_counter()
+                row = parse_source_row(row, source_dict_, row_num)
+                parse_stage.add_parse(parse_start, bad=not row)
+                if not row:
+                    with worker_bad_parse.get_lock():
+                        worker_bad_parse.value += 1
+                    continue
+
+            dsrc_action_str = None
+
+            # Start with dsrc_action set to what was used as the CLI arg or default of add
+            dsrc_action = dsrc_action_args
+
+            # Record is JSON, or a source row passed through unparsed (-pt)
+            pass_through_row = isinstance(row, PassThroughRecord)
+            if pass_through_row:
+                data_source = row.DATA_SOURCE
+                record_id = row.RECORD_ID
+            else:
+                data_source = row.get("DATA_SOURCE", "")
+                record_id = str(row.get("RECORD_ID", ""))
+
+            # Is the record from the work queue specifically a redo record to be processed during redo time/mode?
+            if is_redo_record:
+                dsrc_action = "X"
+
+            # If not, it's a normal ingestion record from file or project
+            else:
+                # If -D and -X were not specified, check each record for dsrc_action and use it instead of default add mode
+                # Consideration of dsrc_action is only valid in default add mode
+                if not cli_args.deleteMode and not cli_args.reprocessMode:
+
+                    # Use the DSRC_ACTION from inbound row?
+                    # Check if the inbound row specifies dsrc_action, use it and override CLI args (X, D, default is A) if present
+                    # This provides functionality of sending in input file with multiple dsrc actions
+                    row_dsrc_action = (
+                        row.get("DSRC_ACTION", None) if not pass_through_row else None
+                    )
+                    dsrc_action = row_dsrc_action if row_dsrc_action else dsrc_action
+                    dsrc_action = (
+                        dsrc_action.upper()
+                        if isinstance(dsrc_action, str)
+                        else dsrc_action
+                    )
+
+                    # If the row dsrc_action differs from the CLI ARGs dsrc_action mode, log the fact to print info at end of data source
+                    if dsrc_action != dsrc_action_args:
+                        # Not enabled, could quickly fill up redirected logging files
+                        if dsrc_action_diff.value != 1:
+                            with dsrc_action_diff.get_lock():
+                                dsrc_action_diff.value = 1
+
+                        if dsrc_action == "A":
+                            with dsrc_action_add_count.get_lock():
+                                dsrc_action_add_count.value += 1
+
+                        if dsrc_action == "D":
+                            with dsrc_action_del_count.get_lock():
+                                dsrc_action_del_count.value += 1
+
+                        if dsrc_action == "X":
+                            with dsrc_action_reeval_count.get_lock():
+                                dsrc_action_reeval_count.value += 1
+
+            engine_api = None
+            call_start = time.perf_counter()
+            try:
+                # Catch invalid dsrc_actions and push to error log and log as an API error
+                if dsrc_action not in ("A", "D", "X"):
+                    g2thread_error("Unknown dsrc_action", dsrc_action)
+                    continue
+
+                if dsrc_action == "A":
+                    dsrc_action_str = "addRecord()"
+                    engine_api = "addRecord"
+                    g2_engine_.addRecord(
+                        data_source,
+                        record_id,
+                        (
+                            row.JSON
+                            if pass_through_row
+                            else G2Json.dumps(row, sort_keys=True)
+                        ),
+                    )
+
+                if dsrc_action == "D":
+                    dsrc_action_str = "deleteRecord()"
+                    engine_api = "deleteRecord"
+                    g2_engine_.deleteRecord(data_source, record_id)
+
+                if dsrc_action == "X":
+                    dsrc_action_str = "reevaluateRecord()"
+                    # Check if the redo record is a REPAIR_ENTITY one, call reevaluateEntity() if so
+                    # {'UMF_PROC': {'NAME': 'REPAIR_ENTITY', 'PARAMS': [{'PARAM': {'NAME': 'ENTITY_ID', 'VALUE': '32705738'}}]}}
+                    if not data_source and not record_id:
+                        entity_id = (
+                            row.get("UMF_PROC", {})
+                            .get("PARAMS", {})[0]
+                            .get("PARAM", {})
+                            .get("VALUE", None)
+                        )
+                        if entity_id:
+                            engine_api = "reevaluateEntity"
+                            g2_engine_.reevaluateEntity(entity_id)
+                        else:
+                            g2thread_error(
+                                "Unable to process redo record format!",
+                                dsrc_action_str,
+                            )
+                    else:
+                        engine_api = "reevaluateRecord"
+                        g2_engine_.reevaluateRecord(data_source, record_id, 0)
+
+            except G2LicenseException as ex:
+                print("\nERROR: G2Engine licensing error!")
+                print(f"       {ex}")
+                with thread_stop.get_lock():
+                    thread_stop.value = 1
+                return
+            except G2NotFoundException as ex:
+                # Don't error if record for redo can't be located
+                if is_redo_record:
+                    pass
+                else:
+                    g2thread_error(ex, dsrc_action_str)
+            except G2Exception as ex:
+                g2thread_error(ex, dsrc_action_str)
+            finally:
+                if engine_api:
+                    call_secs = time.perf_counter() - call_start
+                    if call_timings_:
+                        call_timings_.add(
+                            engine_api,
+                            call_secs,
+                            data_source,
+                            record_id,
+                            row_num,
+                            is_redo_record,
+                        )
+                    if metrics:
+                        metrics.engine_call_seconds.observe(engine_api, call_secs)
+
+        parse_stage.publish()
+
+        # Acknowledge the ingest batch is processed for checkpoints (-cp)
+        if batch_ack_queue and source_idx is not None:
+            batch_ack_queue.put((source_idx, batch[-1][2]))
+
+        # Redo batches have no source, count them as done for the concurrent redo share (-cr)
+        if source_idx is None:
+            with redo_in_flight.get_lock():
+                redo_in_flight.value -= len(batch)
+
+
+def parse_source_row(row, source_dict, row_num, quiet=False):
+    """Parse a raw source row and apply the file defaults, returns None for bad or blank rows. Bad and blank rows
+    aren't reported when quiet"""
+
+    # JSON rows are sent as read when the keys needed are found without parsing (-pt)
+    if cli_args.passThrough:
+        pass_through_row = fileRowPassThrough(row, source_dict)
+        if pass_through_row:
+            return pass_through_row
+
+    row_data = fileRowParser(
+        row,
+        source_dict,
+        row_num,
+        errors_file=errors_file,
+        errors_short=cli_args.errorsShort,
+        errors_disable=cli_args.errorsFileDisable,
+        quiet=quiet,
+    )
+    if not row_data:
+        return None
+
+    if "DATA_SOURCE" not in row_data and "DATA_SOURCE" in source_dict:
+        row_data["DATA_SOURCE"] = source_dict["DATA_SOURCE"]
+
+    if "LOAD_ID" not in row_data:
+        row_data["LOAD_ID"] = source_dict["FILE_NAME"]
+
+    return row_data
+
+
+def report_read_error(row_num, error):
+    """Report a row the file reader couldn't return, written to the errors file like rows that can't be parsed"""
+
+    print(f"WARNING: Could not read row {row_num}, {error}", flush=True)
+
+    if errors_file and not cli_args.errorsFileDisable:
+        if not cli_args.errorsShort:
+            errors_file.write(
+                f"\n{str(datetime.now())} ERROR: Could not read row {row_num}\n\t{error}\n"
+            )
+        else:
+            errors_file.write(
+                f"\n{str(datetime.now())} ERROR: Could not read row {row_num}\n"
+            )
+        errors_file.flush()
+
+
+def stop_loader_process_and_threads(thread_list, work_queue):
+    """Stop the processing threads, returns their merged engine call timings"""
+
+    call_timings = CallTimings(cli_args.slowRecordsCount)
+
+    if not cli_args.testMode:
+
+        print()
+
+        # Stop a concurrent redo feeder (-cr) fetching more redo, any fetched is put on the queue before it exits
+        if redo_feeder_state.value != REDO_FEEDER_NONE:
+            redo_feeder_state.value = REDO_FEEDER_STOP
+
+        # It is possible to reach here and the processes be shut down. This can happen when using PostgreSQL and the
+        # Governor is paused waiting for a vacuum and CTRL-C is sent. Thus, ensure there are processes/threads alive
+        # or the while will never exit
+        while work_queue.empty() is False and any(
+            (thread.is_alive() for thread in thread_list)
+        ):
+            print(
+                f"Waiting for remaining records on the queue to be read, remaining batches: {work_queue.qsize()}",
+                flush=True,
+            )
+            time.sleep(2)
+
+        with thread_stop.get_lock():
+            thread_stop.value = 1
+
+        print("Waiting for processing threads to finish...\n", flush=True)
+
+        # Drain the call timings while waiting, a process can't exit until what it put on the queue is read
+        while any((thread.is_alive() for thread in thread_list)):
+            try:
+                call_timings.merge(call_timings_queue.get(True, 0.1))
+            except Empty:
+                pass
+
+        for thread in thread_list:
+            thread.join()
+
+        work_queue.close()
+
+        while True:
+            try:
+                call_timings.merge(call_timings_queue.get(True, 0.1))
+            except Empty:
+                break
+
+    return call_timings
+
+
+def write_slow_records(call_timings, title):
+    """Append the engine call latency and slowest records to the slow records file, returns the file name or
+    None if nothing was written"""
+
+    if not cli_args.slowRecordsCount or not call_timings.apis:
+        return None
+
+    try:
+        with open(cli_args.slowRecordsFile, "a") as slow_file:
+            slow_file.write(call_timings.report(title))
+    except IOError as ex:
+        print(f"\nWARNING: Unable to write slow records to {cli_args.slowRecordsFile}")
+        print(f"         {ex}", flush=True)
+        return None
+
+    return cli_args.slowRecordsFile
+
+
+def dump_workload_stats(engine):
+    """Print JSON workload stats"""
+
+    response = bytearray()
+    engine.stats(response)
+
+    print(f"\n{json.dumps(json.loads(response.decode()))}\n", flush=True)
+
+
+def init_engine(
+    name, config_parms, debug_trace, prime_engine=True, add_start_time=False
+):
+    """Initialize an engine. add_start_time is for redo engines only"""
+
+    if add_start_time:
+        engine_start_time = time.perf_counter()
+
+    try:
+        engine = G2Engine()
+        engine.init(name, config_parms, debug_trace)
+        if prime_engine:
+            engine.primeEngine()
+    except G2Exception:
+        raise
+
+    if add_start_time:
+        with time_starting_engines.get_lock():
+            time_starting_engines.value += time.perf_counter() - engine_start_time
+
+    return engine
+
+
+def process_redo(q, empty_q_wait=False, empty_q_msg="", sleep_interval=1):
+    """Called in normal and redo only mode (-R) to process redo records that need re-evaluation"""
+
+    # Drain the processing queue of ingest records before starting to process redo
+    if empty_q_wait:
+        print(f"\n{empty_q_msg}") if empty_q_msg else print("", end="")
+        while not q.ingest_empty():
+            time.sleep(sleep_interval)
+
+    # A concurrent redo feeder (-cr) is already running, have it work down all redo then resume sharing
+    if redo_feeder_state.value == REDO_FEEDER_RUNNING:
+        redo_start_time = time.perf_counter()
+        redo_feeder_state.value = REDO_FEEDER_DRAIN
+
+        while redo_feeder_state.value == REDO_FEEDER_DRAIN and thread_stop.value == 0:
+            time.sleep(sleep_interval)
+
+        with time_redo.get_lock():
+            time_redo.value += time.perf_counter() - redo_start_time
+
+        return 0 if redo_feeder_state.value != REDO_FEEDER_NONE else 1
+
+    # This may look weird but ctypes/ffi have problems with the native code and fork.
+    setup_process = Process(
+        target=redo_feed,
+        args=(q, cli_args.debugTrace, cli_args.redoMode, cli_args.redoModeInterval),
+    )
+
+    redo_start_time = time.perf_counter()
+
+    setup_process.start()
+    setup_process.join()
+
+    with time_redo.get_lock():
+        time_redo.value += time.perf_counter() - redo_start_time
+
+    return setup_process.exitcode
+
+
+def redo_feed(q, debug_trace, redo_mode, redo_mode_interval, concurrent_threads=0):
+    """Process records in the redo queue. With concurrent_threads the feeder runs alongside ingest for the
+    life of the processing threads (-cr), with up to concurrent_threads redo records in flight
+    """
+
+    cnt_rows = batch_start_rows = batch_time_governing = idle_secs = 0
+    backoff = REDO_BACKOFF_MIN
+    draining = False
+    batch_start_time = time.time()
+    rec_bytes = bytearray()
+    rec = None
+    redo_batch = []
+
+    try:
+        redo_engine = init_engine(
+            "pyG2Redo",
+            g2module_params,
+            debug_trace,
+            prime_engine=False,
+            add_start_time=False,
+        )
+
+        # Only do initial count if in redo mode, counting large redo can be expensive
+        if redo_mode:
+            redo_count = redo_engine.countRedoRecords()
+            print(f"Redo records: {redo_count:,}")
+
+        # Test if there is anything on redo queue, a concurrent feeder waits for redo to arrive
+        elif not concurrent_threads:
+            try:
+                redo_engine.getRedoRecord(rec_bytes)
+                rec = rec_bytes.decode()
+            except G2Exception as ex:
+                print("ERROR: Could not get redo record for redoFeed()")
+                print(f"       {ex}")
+                exit(1)
+
+    except G2Exception as ex:
+        print("ERROR: Could not start the G2 engine for redoFeed()")
+        print(f"       {ex}")
+        if concurrent_threads:
+            redo_feeder_state.value = REDO_FEEDER_NONE
+        exit(1)
+
+    # If test didn't return a redo record, exit early
+    if not rec and not redo_mode and not concurrent_threads:
+        print("\n  No redo to perform, resuming loading...\n")
+        return
+
+    # Init redo governor in this process, trying to use DB connection in forked process created outside will cause errors when using
+    # PostgreSQL governor such as: psycopg2.OperationalError: SSL error: decryption failed or bad record mac
+    redo_governor = Governor()
+    if governor:
+        redo_governor = governor.Governor(
+            thread_stop,
+            type="Redo per redo record",
+            g2module_params=g2module_params,
+            frequency="record",
+            pre_post_msgs=False,
+            **governor_throttle_args(),
+        )
+    redo_ticker = GovernorTicker(redo_governor)
+
+    if concurrent_threads:
+        print(
+            f"\n  Processing redo while loading, up to {concurrent_threads} redo records at a time...\n"
+        )
+    elif not redo_mode:
+        print("\n  Pausing loading to process redo records...")
+
+    # Redo record fetched testing the redo queue starts the first batch
+    if rec:
+        redo_batch.append((rec, True, 0))
+
+    while thread_stop.value == 0 and redo_feeder_state.value != REDO_FEEDER_STOP:
+
+        # Restart the empty checks when asked to work down all redo
+        if redo_feeder_state.value == REDO_FEEDER_DRAIN and not draining:
+            draining = True
+            idle_secs = 0
+
+        # Concurrent redo is limited to its share of the processing threads unless draining
+        fetch_limit = cli_args.queueBatchSize
+        if concurrent_threads and not draining:
+            fetch_limit = min(fetch_limit, concurrent_threads - redo_in_flight.value)
+            if fetch_limit <= 0:
+                time.sleep(REDO_BACKOFF_MIN)
+                continue
+
+        # Fetch a batch of redo records, a partial batch is sent as soon as the redo queue is empty
+        while len(redo_batch) < fetch_limit:
+            try:
+                redo_engine.getRedoRecord(rec_bytes)
+                rec = rec_bytes.decode()
+            except G2Exception as ex:
+                print("ERROR: Could not get redo record for redoFeed()")
+                print(f"       {ex}")
+                if concurrent_threads:
+                    redo_feeder_state.value = REDO_FEEDER_NONE
+                exit(1)
+
+            if not rec:
+                break
+            redo_batch.append((rec, True, 0))
+
+        # No redo, back off while none arrives. Redo is empty when none has arrived for REDO_EMPTY_SECS
+        if not redo_batch:
+            if idle_secs >= REDO_EMPTY_SECS:
+
+                # Concurrent feeder keeps waiting for redo, signal the drain is complete
+                if concurrent_threads:
+                    if draining:
+                        draining = False
+                        redo_feeder_state.value = REDO_FEEDER_RUNNING
+
+                elif redo_mode:
+                    print(
+                        f"  Redo queue empty, {cnt_rows:,} total records processed. Waiting {redo_mode_interval} seconds for next cycle at {time_now(True)} (CTRL-C to quit)..."
+                    )
+                    # Sleep in 1 second increments to respond to user input
+                    for x in range(1, redo_mode_interval):
+                        if thread_stop.value == 9:
+                            break
+                        time.sleep(1.0)
+                    idle_secs = 0
+                    backoff = REDO_BACKOFF_MIN
+                    continue
+
+                else:
+                    break
+
+            time.sleep(backoff)
+            idle_secs += backoff
+            backoff = min(backoff * 2, REDO_BACKOFF_MAX)
+            continue
+
+        idle_secs = 0
+        backoff = REDO_BACKOFF_MIN
+
+        queued = False
+        while True:
+            try:
+                # Batch of tuples to indicate if a record on work queue is redo - (rec, True == this is redo, row number)
+                # No source index for redo records, the raw redo JSON is parsed by the processing threads
+                q.put_redo((None, redo_batch), True, 1)
+            except Full:
+                if thread_stop.value != 0:
+                    break
+                continue
+            with redo_in_flight.get_lock():
+                redo_in_flight.value += len(redo_batch)
+            queued = True
+            break
+
+        # Stopping with the work queue full, the batch is reported below
+        if not queued:
+            break
+
+        batch_records = len(redo_batch)
+        cnt_rows += batch_records
+        redo_batch = []
+        if metrics:
+            metrics.redo_records.inc(batch_records)
+
+        if cnt_rows - batch_start_rows >= cli_args.loadOutputFrequency:
+            redo_speed = (
+                int(
+                    (cnt_rows - batch_start_rows)
+                    / (time.time() - batch_start_time - batch_time_governing)
+                )
+                if time.time() - batch_start_time != 0
+                else 1
+            )
+            print(
+                f"  {cnt_rows:,} redo records processed at {time_now()}, {redo_speed:,} records per second"
+            )
+            batch_start_time = time.time()
+            batch_start_rows = cnt_rows
+            batch_time_governing = 0
+
+        # Governor called every so many redo records, as the governor requests
+        redo_ticker.countdown -= batch_records
+        if redo_ticker.countdown <= 0:
+            try:
+                batch_time_governing += redo_ticker.check()
+            except Exception as ex:
+                shutdown(f"\nERROR: Calling per redo governor: {ex}")
+
+    redo_ticker.publish()
+
+    # Redo records fetched are removed from the redo queue, those not queued when stopping aren't processed
+    if redo_batch:
+        print(
+            f"\nWARNING: {len(redo_batch):,} redo records fetched from the redo queue were not processed, stopped before they could be queued"
+        )
+
+    if cnt_rows > 0:
+        print(f"\t{cnt_rows:,} reevaluations completed\n")
+
+    redo_engine.destroy()
+    del redo_engine
+
+    if concurrent_threads:
+        redo_feeder_state.value = REDO_FEEDER_NONE
+    elif not redo_mode:
+        print("  Redo processing complete resuming loading...\n")
+
+    return
+
+
+def load_redo_queue_and_process():
+
+    exit_code = 0
+    DumpStack.listen()
+    proc_start_time = time.time()
+
+    thread_list, work_queue = start_loader_process_and_threads(default_thread_count)
+    if thread_stop.value != 0:
+        return exit_code
+
+    if thread_stop.value == 0 and not cli_args.testMode and not cli_args.noRedo:
+        exit_code = process_redo(work_queue)
+
+    call_timings = stop_loader_process_and_threads(thread_list, work_queue)
+    slow_records_file = write_slow_records(call_timings, "redo processing cycle")
+    if slow_records_file:
+        print(f"\nSlowest redo records written to {slow_records_file}")
+
+    elapsed_mins = round((time.time() - proc_start_time) / 60, 1)
+    if exit_code:
+        print(f"\nRedo processing cycle aborted after {elapsed_mins} minutes")
+    else:
+        print(
+            f"\nRedo processing cycle completed successfully in {elapsed_mins} minutes"
+        )
+
+    return exit_code
+
+
+def addDataSource(
+    g2_config_module, config_doc, data_source, configured_datasources_only
+):
+    """Adds a data source if does not exist"""
+
+    return_code = 0  # 1=inserted, 2=updated
+
+    config_handle = g2_config_module.load(config_doc)
+    dsrc_exists = False
+    dsrc_list_doc_string = bytearray()
+    g2_config_module.listDataSources(config_handle, dsrc_list_doc_string)
+    dsrc_list_doc = json.loads(dsrc_list_doc_string.decode())
+    dsrc_list_node = dsrc_list_doc["DATA_SOURCES"]
+
+    for dsrcNode in dsrc_list_node:
+        if dsrcNode["DSRC_CODE"].upper() == data_source:
+            dsrc_exists = True
+
+    if dsrc_exists is False:
+        if configured_datasources_only is False:
+            add_data_source_json = '{"DSRC_CODE":"%s"}' % data_source
+            add_data_source_result_buf = bytearray()
+            g2_config_module.addDataSource(
+                config_handle, add_data_source_json, add_data_source_result_buf
+            )
+            new_config = bytearray()
+            g2_config_module.save(config_handle, new_config)
+            config_doc[::] = b""
+            config_doc += new_config
+            return_code = 1
+        else:
+            raise UnconfiguredDataSourceException(data_source)
+
+    g2_config_module.close(config_handle)
+
+    return return_code
+
+
+def get_initial_g2_config_process_wrapper(return_queue, params, g2_config_json):
+    result = get_initial_g2_config(params, g2_config_json)
+    # Return values are put in a queue
+    return_queue.put(g2_config_json)
+    return_queue.put(result)
+
+
+def get_initial_g2_config(params, g2_config_json):
+
+    # Get the current configuration from the database
+    g2_config_mgr = G2ConfigMgr()
+    g2_config_mgr.init("g2ConfigMgr", params, False)
+    default_config_id = bytearray()
+    g2_config_mgr.getDefaultConfigID(default_config_id)
+
+    if len(default_config_id) == 0:
+        print(
+            "ERROR: No default config stored in database. (see https://senzing.zendesk.com/hc/en-us/articles/360036587313)"
+        )
+        return False
+    default_config_doc = bytearray()
+    g2_config_mgr.getConfig(default_config_id, default_config_doc)
+
+    if len(default_config_doc) == 0:
+        print(
+            "ERROR: No default config stored in database. (see https://senzing.zendesk.com/hc/en-us/articles/360036587313)"
+        )
+        return False
+    g2_config_json[::] = b""
+    g2_config_json += default_config_doc
+    g2_config_mgr.destroy()
+    del g2_config_mgr
+
+    return True
+
+
+def enhance_g2_config_process_wrapper(
+    return_queue, g2_project, params, g2_config_json, configured_datasources_only
+):
+    result = enhance_g2_config(
+        g2_project, params, g2_config_json, configured_datasources_only
+    )
+    # Return values are put in a queue
+    return_queue.put(g2_config_json)
+    return_queue.put(result)
+
+
+def enhance_g2_config(g2_project, params, g2_config_json, configured_datasources_only):
+
+    # Define variables for where the config is stored.
+
+    g2_config = G2Config()
+    g2_config.init("g2Config", params, False)
+
+    # Add any missing source codes and entity types to the g2 config
+    g2_new_config_required = False
+    for sourceDict in g2_project.sourceList:
+        if "DATA_SOURCE" in sourceDict:
+            try:
+                if (
+                    addDataSource(
+                        g2_config,
+                        g2_config_json,
+                        sourceDict["DATA_SOURCE"],
+                        configured_datasources_only,
+                    )
+                    == 1
+                ):  # inserted
+                    g2_new_config_required = True
+            except UnconfiguredDataSourceException as err:
+                print(err)
+                return False
+
+    # Add a new config, if we made changes
+    if g2_new_config_required is True:
+        g2_config_mgr = G2ConfigMgr()
+        g2_config_mgr.init("g2ConfigMgr", params, False)
+        new_config_id = bytearray()
+
+        try:
+            g2_config_mgr.addConfig(
+                g2_config_json.decode(), "Updated From G2Loader", new_config_id
+            )
+        except G2Exception:
+            print("Error: Failed to add new config to the datastore")
+            return False
+
+        try:
+            g2_config_mgr.setDefaultConfigID(new_config_id)
+        except G2Exception:
+            print("Error: Failed to set new config as default")
+            return False
+        g2_config_mgr.destroy()
+        del g2_config_mgr
+
+    g2_config.destroy()
+    del g2_config
+
+    return True
+
+
+def time_now(add_secs=False):
+    """Date time now for processing messages"""
+
+    fmt_string = "%I:%M%p"
+    if add_secs:
+        fmt_string = "%I:%M:%S%p"
+
+    return datetime.now().strftime(fmt_string).lower()
+
+
+def signal_int(sig, frame):
+    """Signal interrupt handler"""
+
+    shutdown(
+        f"USER INTERRUPT ({sig}) - Stopping threads, please be patient this can take a number of minutes..."
+    )
+
+
+def shutdown(msg=None):
+    """Shutdown threads and exit cleanly from Governor if in use and clean up Governor"""
+
+    if msg:
+        print(f"{msg}")
+
+    print("Shutting down...\n")
+
+    with thread_stop.get_lock():
+        thread_stop.value = 9
+
+    return
+
+
+def governor_setup():
+    """Import and create governors"""
+
+    # Create default governors, replace if using a real governor for PostgreSQL
+    rec_governor = Governor()
+    src_governor = Governor()
+
+    # When Postgres always import the Postgres governor - unless requested disabled (e.g., getting started and no native driver)
+    if (
+        not cli_args.governor
+        and "POSTGRESQL" in ini_db_types
+        and not cli_args.governorDisable
+    ):
+        print(
+            f"\nUsing PostgreSQL, loading default governor: {DEFAULT_POSTGRES_GOVERNOR}\n"
+        )
+        import_governor = (
+            DEFAULT_POSTGRES_GOVERNOR[:-3]
+            if DEFAULT_POSTGRES_GOVERNOR.endswith(".py")
+            else DEFAULT_POSTGRES_GOVERNOR
+        )
+    # If a governor was specified import it
+    elif cli_args.governor:
+        import_governor = (
+            cli_args.governor[0][:-3]
+            if cli_args.governor[0].endswith(".py")
+            else cli_args.governor[0]
+        )
+        print(f"\nLoading governor {import_governor}\n")
+    # Otherwise use dummy governors
+    else:
+        return rec_governor, src_governor, False
+
+    try:
+        gov = importlib.import_module(import_governor)
+    except ImportError as ex:
+        print(f"\nERROR: Unable to import governor {import_governor}")
+        print(f"       {ex}")
+        sys.exit(1)
+
+    # If not in redo mode create all governors we may call upon
+    if not cli_args.redoMode:
+
+        # Init governors for each record, each source. Governor creation sets defaults, can override. See sample governor-postgresXID.py
+        # Minimum keyword args: g2module_params, frequency
+        # Example of overriding governor init parms
+        # rec_governor = governor.Governor(type='Ingest per source record', g2module_params=g2module_params, frequency='record', wait_time=20, resume_age=5000, xid_age=1500000)
+        rec_governor = gov.Governor(
+            thread_stop,
+            type="Ingest per source record",
+            g2module_params=g2module_params,
+            frequency="record",
+            **governor_throttle_args(),
+        )
+        src_governor = gov.Governor(
+            thread_stop,
+            type="Ingest per source",
+            g2module_params=g2module_params,
+            frequency="source",
+        )
+
+    # If in redo mode only create a redo governor
+    if cli_args.redoMode or not cli_args.noRedo:
+        # Redo governor created and destroyed here only to produce startup output, real redo governor is created in redo process
+        gov.Governor(
+            thread_stop,
+            type="Redo per redo record",
+            g2module_params=g2module_params,
+            frequency="record",
+            **governor_throttle_args(),
+        )
+
+    return rec_governor, src_governor, gov
+
+
+if __name__ == "__main__":
+
+    DEFAULT_POSTGRES_GOVERNOR = "governor_postgres_xid.py"
+    SHUF_NO_DEL_TAG = "_-_SzShufNoDel_-_"
+    SHUF_TAG = "_-_SzShuf_-_"
+    SHUF_TAG_GLOB = "_-_SzShuf*"
+    SHUF_RESPONSE_TIMEOUT = 30
+    # Send a work queue batch early when its records reach this size, keeps batches of large records small
+    QUEUE_BATCH_MAX_SIZE = 1024 * 1024
+    # States of the concurrent redo feeder (-cr)
+    REDO_FEEDER_NONE = 0
+    REDO_FEEDER_RUNNING = 1
+    REDO_FEEDER_DRAIN = 2
+    REDO_FEEDER_STOP = 3
+    # Redo feeder waits between empty redo fetches, doubling while no redo arrives. Redo is empty after REDO_EMPTY_SECS
+    REDO_BACKOFF_MIN = 0.01
+    REDO_BACKOFF_MAX = 1.0
+    REDO_EMPTY_SECS = 0.5
+    # Autotune (-at) keeps a thread count change that improves records per second by more than 3%
+    AUTOTUNE_MIN_GAIN = 1.03
+
+    exit_code = 0
+
+    thread_stop = Value("i", 0)
+    time_starting_engines = Value("d", 0)
+    time_governing = Value("d", 0)
+    time_redo = Value("d", 0)
+    api_errors = Value("i", 0)
+    worker_bad_parse = Value("i", 0)
+    call_timings_queue = Queue()
+    redo_in_flight = Value("i", 0)
+    redo_feeder_state = Value("i", 0)
+    records_processed = Value("q", 0)
+    active_threads = Value("i", 0)
+    autotune_threads = Value("i", 0)
+    dsrc_action_diff = Value("i", 0)
+
+    # Human friendly names
+    dsrc_action_names = {"A": "Add", "D": "Delete", "X": "Reevaluate"}
+
+    # Counts for records using different dsrc action
+    dsrc_action_add_count = Value("i", 0)
+    dsrc_action_del_count = Value("i", 0)
+    dsrc_action_reeval_count = Value("i", 0)
+
+    manager = Manager()
+    ini_db_types = manager.list()
+
+    signal.signal(signal.SIGINT, signal_int)
+    signal.signal(signal.SIGTERM, signal_int)
+    DumpStack.listen()
+
+    tmp_path = os.path.join(tempfile.gettempdir(), "senzing", "g2")
+
+    # Set default path for errors file to current path of script to start, modify if can find a suitable var path
+    errors_file_name = (
+        f'g2loader_errors.{str(datetime.now().strftime("%Y%m%d_%H%M%S"))}'
+    )
+    errors_file_default = (
+        pathlib.Path(__file__).parent.resolve().joinpath(errors_file_name)
+    )
+
+    # Slowest records log is written alongside the errors file
+    slow_records_file_name = (
+        f'g2loader_slow_records.{str(datetime.now().strftime("%Y%m%d_%H%M%S"))}'
+    )
+    slow_records_file_default = (
+        pathlib.Path(__file__).parent.resolve().joinpath(slow_records_file_name)
+    )
+
+    senz_root = os.environ.get("SENZING_ROOT", None)
+    sys_senz_var = pathlib.Path("/var/opt/senzing")
+
+    # SENZING_ROOT is available on bare metal
+    if senz_root:
+        errors_file_default = pathlib.Path(senz_root) / "var" / errors_file_name
+        slow_records_file_default = (
+            pathlib.Path(senz_root) / "var" / slow_records_file_name
+        )
+
+    # In containers /var/opt/senzing should be available
+    elif sys_senz_var.exists() and sys_senz_var.is_dir():
+        errors_file_default = pathlib.Path(sys_senz_var) / errors_file_name
+        slow_records_file_default = pathlib.Path(sys_senz_var) / slow_records_file_name
+
+    # Don't allow argparse to create abbreviations of options
+    g2load_parser = argparse.ArgumentParser(
+        formatter_class=argparse.RawTextHelpFormatter, allow_abbrev=False
+    )
+    g2load_parser.add_argument(
+        "-c",
+        "--iniFile",
+        default=None,
+        metavar="file",
+        nargs=1,
+        help=textwrap.dedent(
+            """\
+
+                                      Path and name of optional G2Module.ini file to use.
+
+                                    """
+        ),
+    )
+
+    # Both -p and -f shouldn't be used together
+    file_project_group = g2load_parser.add_mutually_exclusive_group()
+    file_project_group.add_argument(
+        "-p",
+        "--projectFile",
+        default=None,
+        dest="projectFileName",
+        metavar="file",
+        help=textwrap.dedent(
+            """\
+
+                                           Path and name of a project CSV or JSON file.
+
+                                    """
+        ),
+    )
+
+    file_project_group.add_argument(
+        "-f",
+        "--fileSpec",
+        default=[],
+        dest="projectFileSpec",
+        metavar="file",
+        nargs="+",
+        help=textwrap.dedent(
+            """\
+
+                                           Path and name of a source file to load, such as /data/mydata.json
+
+                                           Optional parameters, generally these should not be required:
+
+                                               /data/mydata/?data_source=TEST
+                                               /data/mydata/?data_source=TEST,file_format=PIPE
+
+                                               data_source = The data source to apply to each record in the file
+                                               file_format = If not detected use one of: JSON, CSV, TAB, TSV, PIPE
+
+                                               Note: A data_source specified here will not override the data_source specified in a record.
+                                                     It is recommended to be explicit and specify data_source in the source file records.
+
+                                    """
+        ),
+    )
+
+    g2load_parser.add_argument(
+        "-T",
+        "--testMode",
+        action="store_true",
+        default=False,
+        help=textwrap.dedent(
+            """\
+
+                                      Run in test mode and collect stats without loading, CTRL-C anytime to exit early.
+
+                                    """
+        ),
+    )
+
+    g2load_parser.add_argument(
+        "-X",
+        "--reprocess",
+        action="store_true",
+        default=False,
+        dest="reprocessMode",
+        help=textwrap.dedent(
+            """\
+
+                                      Force reprocessing of previously loaded file.
+
+                                    """
+        ),
+    )
+
+    g2load_parser.add_argument(
+        "-t",
+        "--debugTrace",
+        action="store_true",
+        default=False,
+        help=textwrap.dedent(
+            """\
+
+                                      Output debug trace information.
+
+                                    """
+        ),
+    )
+
+    g2load_parser.add_argument(
+        "-nw",
+        "--noWorkloadStats",
+        action="store_true",
+        help=textwrap.dedent(
+            """\
+
+                                      Disable workload statistics information.
+
+                                    """
+        ),
+    )
+
+    g2load_parser.add_argument(
+        "-n",
+        "--noRedo",
+        action="store_true",
+        default=False,
+        help=textwrap.dedent(
+            """\
+
+                                      Disable redo processing.
+
+                                      Another instance of G2Loader can be run in redo only mode or redo can be processed after ingestion.
+
+                                    """
+        ),
+    )
+
+    g2load_parser.add_argument(
+        "-i",
+        "--redoModeInterval",
+        default=60,
+        metavar="seconds",
+        type=int,
+        help=textwrap.dedent(
+            """\
+
+                                      Time in secs to wait between redo processing checks, only used in redo mode.
+
+                                      Default: %(default)s
+
+                                    """
+        ),
+    )
+
+    g2load_parser.add_argument(
+        "-k",
+        "--knownDatasourcesOnly",
+        action="store_true",
+        default=False,
+        dest="configuredDatasourcesOnly",
+        help=textwrap.dedent(
+            """\
+
+                                      Only accepts configured and known data sources.
+
+                               """
+        ),
+    )
+
+    g2load_parser.add_argument(
+        "-mtp",
+        "--maxThreadsPerProcess",
+        default=64,
+        dest="max_threads_per_process",
+        metavar="num_threads",
+        type=int,
+        help=textwrap.dedent(
+            """\
+
+                                      Maximum threads per process.
+
+                                      Default: %(default)s
+
+                                    """
+        ),
+    )
+
+    g2load_parser.add_argument(
+        "-g",
+        "--governor",
+        default=None,
+        metavar="file",
+        nargs=1,
+        help=textwrap.dedent(
+            f"""\
+
+                                       User supplied governor to load and call during processing, used for PostgreSQL databases.
+
+                                       Default: {DEFAULT_POSTGRES_GOVERNOR}
+
+                                     """
+        ),
+    )
+
+    g2load_parser.add_argument(
+        "-gd",
+        "--governorDisable",
+        action="store_true",
+        default=False,
+        help=textwrap.dedent(
+            """\
+
+                                      Disable the Postgres governor.
+
+                              """
+        ),
+    )
+
+    g2load_parser.add_argument(
+        "-gt",
+        "--governorThrottle",
+        default=None,
+        metavar="records_per_sec",
+        type=int,
+        help=textwrap.dedent(
+            """\
+
+                                      Slow loading down before the Postgres governor pauses it, instead of only pausing.
+                                      As XID age nears the pause threshold each reader and redo feeder is throttled from
+                                      this rate down, and back up as XID age falls. Also passed to custom governors as
+                                      throttle_rate.
+
+                              """
+        ),
+    )
+
+    g2load_parser.add_argument(
+        "-tmp",
+        "--tmpPath",
+        default=tmp_path,
+        metavar="path",
+        nargs="?",
+        help=textwrap.dedent(
+            f"""\
+
+                                      Path to use instead of {tmp_path} for temporary files. S3 files are
+                                      streamed from S3 and not downloaded.
+
+                               """
+        ),
+    )
+
+    g2load_parser.add_argument(
+        "-skr",
+        "--skipRecords",
+        default=0,
+        metavar="num_recs",
+        type=int,
+        help=textwrap.dedent(
+            """\
+
+                                      Skip the first n records in a file, counted in source order when shuffling while reading.
+
+                                    """
+        ),
+    )
+
+    g2load_parser.add_argument(
+        "-sfi",
+        "--shuffFilesIgnore",
+        action="store_true",
+        default=False,
+        help=textwrap.dedent(
+            """\
 
-    tmp_path = os.path.join(tempfile.gettempdir(), "senzing", "g2")
+                                      Skip checking for previously shuffled files to use, and prompting to use them.
 
-    # Set default path for errors file to current path of script to start, modify if can find a suitable var path
-    errors_file_name = (
-        f'g2loader_errors.{str(datetime.now().strftime("%Y%m%d_%H%M%S"))}'
-    )
-    errors_file_default = (
-        pathlib.Path(__file__).parent.resolve().joinpath(errors_file_name)
+                                    """
+        ),
     )
 
-    senz_root = os.environ.get("SENZING_ROOT", None)
-    sys_senz_var = pathlib.Path("/var/opt/senzing")
+    g2load_parser.add_argument(
+        "-sfr",
+        "--shuffFileRedirect",
+        default=None,
+        metavar="path",
+        nargs="+",
+        help=textwrap.dedent(
+            """\
 
-    # SENZING_ROOT is available on bare metal
-    if senz_root:
-        errors_file_default = pathlib.Path(senz_root) / "var" / errors_file_name
+                                      Alternative path to output shuffled file to, useful for performance and device space.
 
-    # In containers /var/opt/senzing should be available
-    elif sys_senz_var.exists() and sys_senz_var.is_dir():
-        errors_file_default = pathlib.Path(sys_senz_var) / errors_file_name
+                                      Default: Same path as original file.
 
-    # Don't allow argparse to create abbreviations of options
-    g2load_parser = argparse.ArgumentParser(
-        formatter_class=argparse.RawTextHelpFormatter, allow_abbrev=False
+                                    """
+        ),
     )
+
+    # Both -ef and -ed shouldn't be used together
     g2load_parser.add_argument(
-        "-c",
-        "--iniFile",
-        default=None,
-        metavar="file",
-        nargs=1,
+        "-es",
+        "--errorsShort",
+        action="store_true",
+        default=False,
         help=textwrap.dedent(
             """\
 
-                                      Path and name of optional G2Module.ini file to use.
+                                      Reduce size of the errors file by not including the record.
 
                                     """
         ),
     )
 
-    # Both -p and -f shouldn't be used together
-    file_project_group = g2load_parser.add_mutually_exclusive_group()
-    file_project_group.add_argument(
-        "-p",
-        "--projectFile",
-        default=None,
-        dest="projectFileName",
+    error_file_group = g2load_parser.add_mutually_exclusive_group()
+    error_file_group.add_argument(
+        "-ef",
+        "--errorsFile",
+        default=errors_file_default,
         metavar="file",
+        nargs="?",
         help=textwrap.dedent(
             """\
 
-                                           Path and name of a project CSV or JSON file.
+                                         Path/file to write errors to.
 
-                                    """
+                                         Default: %(default)s
+
+                                       """
         ),
     )
 
-    file_project_group.add_argument(
-        "-f",
-        "--fileSpec",
-        default=[],
-        dest="projectFileSpec",
-        metavar="file",
-        nargs="+",
+    error_file_group.add_argument(
+        "-efd",
+        "--errorsFileDisable",
+        action="store_true",
+        default=False,
         help=textwrap.dedent(
             """\
 
-                                           Path and name of a source file to load, such as /data/mydata.json
+                                         Turn off writing errors to file, written to terminal instead.
 
-                                           Optional parameters, generally these should not be required:
+                                       """
+        ),
+    )
 
-                                               /data/mydata/?data_source=TEST
-                                               /data/mydata/?data_source=TEST,file_format=PIPE
+    # Both -nt and -ntm shouldn't be used together
+    num_threads_group = g2load_parser.add_mutually_exclusive_group()
+    num_threads_group.add_argument(
+        "-nt",
+        "--threadCount",
+        default=0,
+        dest="thread_count",
+        metavar="num_threads",
+        type=int,
+        help=textwrap.dedent(
+            """\
 
-                                               data_source = The data source to apply to each record in the file
-                                               file_format = If not detected use one of: JSON, CSV, TAB, TSV, PIPE
+                                          Total number of threads to start.
 
-                                               Note: A data_source specified here will not override the data_source specified in a record.
-                                                     It is recommended to be explicit and specify data_source in the source file records.
+                                          Default: Calculated based on hardware
 
-                                    """
+                                        """
         ),
     )
 
-    g2load_parser.add_argument(
-        "-T",
-        "--testMode",
-        action="store_true",
-        default=False,
+    num_threads_group.add_argument(
+        "-ntm",
+        "--threadCountMem",
+        choices=range(10, 81),
+        const=80,
+        default=None,
+        metavar="10 -> 80",
+        nargs="?",
+        type=int,
         help=textwrap.dedent(
             """\
 
-                                      Run in test mode and collect stats without loading, CTRL-C anytime to exit early.
+                                          Percentage of memory to use when calculating threads (when -nt not specified).
 
-                                    """
+                                          Default: %(const)s
+
+                                   """
         ),
     )
 
-    g2load_parser.add_argument(
-        "-X",
-        "--reprocess",
+    # Both -ns and -snd shouldn't be used together
+    no_shuf_shuf_no_del = g2load_parser.add_mutually_exclusive_group()
+    no_shuf_shuf_no_del.add_argument(
+        "-ns",
+        "--noShuffle",
         action="store_true",
         default=False,
-        dest="reprocessMode",
         help=textwrap.dedent(
             """\
 
-                                      Force reprocessing of previously loaded file.
+                                            Don\'t shuffle input file(s).
 
-                                    """
+                                            Shuffling improves performance and shouldn\'t be disabled unless pre-shuffled.
+
+                                     """
         ),
     )
 
-    g2load_parser.add_argument(
-        "-t",
-        "--debugTrace",
+    no_shuf_shuf_no_del.add_argument(
+        "-snd",
+        "--shuffleNoDelete",
         action="store_true",
         default=False,
         help=textwrap.dedent(
-            """\
+            f"""\
 
-                                      Output debug trace information.
+                                            Don\'t delete shuffled source file(s) after G2Loader shuffles them.
 
-                                    """
+                                            Adds {SHUF_NO_DEL_TAG} and timestamp to the shuffled file. G2Loader can detect and reuse shuffled files.
+
+                                     """
         ),
     )
 
     g2load_parser.add_argument(
-        "-nw",
-        "--noWorkloadStats",
-        action="store_true",
+        "-sm",
+        "--shuffleMode",
+        choices=("stream", "file"),
+        default="stream",
         help=textwrap.dedent(
             """\
 
-                                      Disable workload statistics information.
+                                      How to shuffle input file(s).
+
+                                      stream = Shuffle records in memory while reading, works for compressed and S3 files and no
+                                               shuffled copy of the file is written to disk. Each file being read holds a
+                                               window of records in memory, see -sw and -swm.
+                                      file   = Write a shuffled copy of the file with shuf before loading. Not available for
+                                               compressed files. Implied by -snd and -sfr.
+
+                                      Default: %(default)s
 
                                     """
         ),
     )
 
     g2load_parser.add_argument(
-        "-n",
-        "--noRedo",
-        action="store_true",
-        default=False,
+        "-sw",
+        "--shuffleWindow",
+        default=100000,
+        metavar="num_recs",
+        type=int,
         help=textwrap.dedent(
             """\
 
-                                      Disable redo processing.
+                                      Number of records held in memory to shuffle from with --shuffleMode stream. Each
+                                      file being read holds its own window, one for each file read at once with -pf.
 
-                                      Another instance of G2Loader can be run in redo only mode or redo can be processed after ingestion.
+                                      Default: %(default)s
 
                                     """
         ),
     )
 
     g2load_parser.add_argument(
-        "-i",
-        "--redoModeInterval",
-        default=60,
-        metavar="seconds",
+        "-swm",
+        "--shuffleWindowMemory",
+        default=128,
+        metavar="MB",
         type=int,
         help=textwrap.dedent(
             """\
 
-                                      Time in secs to wait between redo processing checks, only used in redo mode.
+                                      Maximum size of the records held in the window to shuffle from (-sw) for each file
+                                      being read, a window holds fewer records when they reach this size.
 
                                       Default: %(default)s
 
@@ -2001,333 +4036,347 @@ if __name__ == "__main__":
         ),
     )
 
-    g2load_parser.add_argument(
-        "-k",
-        "--knownDatasourcesOnly",
+    # Both -R and -sr shouldn't be used together
+    stop_row_redo_node = g2load_parser.add_mutually_exclusive_group()
+    stop_row_redo_node.add_argument(
+        "-R",
+        "--redoMode",
         action="store_true",
         default=False,
-        dest="configuredDatasourcesOnly",
         help=textwrap.dedent(
             """\
 
-                                      Only accepts configured and known data sources.
+                                           Run in redo only mode, processes the redo queue.
 
-                               """
+                                    """
         ),
     )
 
-    g2load_parser.add_argument(
-        "-mtp",
-        "--maxThreadsPerProcess",
-        default=64,
-        dest="max_threads_per_process",
-        metavar="num_threads",
+    stop_row_redo_node.add_argument(
+        "-sr",
+        "--stopOnRecord",
+        default=0,
+        metavar="num_recs",
         type=int,
         help=textwrap.dedent(
             """\
 
-                                      Maximum threads per process.
-
-                                      Default: %(default)s
+                                           Stop processing after n records (for testing large files), the first n in source
+                                           order when shuffling while reading.
 
                                     """
         ),
     )
 
-    g2load_parser.add_argument(
-        "-g",
-        "--governor",
-        default=None,
-        metavar="file",
-        nargs=1,
+    # Both -P and -D shouldn't be used together
+    purge_dsrc_delete = g2load_parser.add_mutually_exclusive_group()
+    purge_dsrc_delete.add_argument(
+        "-D",
+        "--delete",
+        action="store_true",
+        default=False,
+        dest="deleteMode",
         help=textwrap.dedent(
-            f"""\
-
-                                       User supplied governor to load and call during processing, used for PostgreSQL databases.
+            """\
 
-                                       Default: {DEFAULT_POSTGRES_GOVERNOR}
+                                          Force deletion of a previously loaded file.
 
-                                     """
+                                   """
         ),
     )
 
-    g2load_parser.add_argument(
-        "-gd",
-        "--governorDisable",
+    purge_dsrc_delete.add_argument(
+        "-P",
+        "--purgeFirst",
         action="store_true",
         default=False,
         help=textwrap.dedent(
             """\
 
-                                      Disable the Postgres governor.
+                                          Purge the Senzing repository before loading, confirmation prompt before purging.
 
-                              """
+                                          WARNING: This will remove all ingested data and outcomes from the Senzing repository!
+                                                   Only use if you wish to start with a clean Senzing system before loading.
+                                                   If you are unsure please contact support@senzing.com
+
+                                   """
         ),
     )
 
-    g2load_parser.add_argument(
-        "-tmp",
-        "--tmpPath",
-        default=tmp_path,
-        metavar="path",
-        nargs="?",
+    purge_dsrc_delete.add_argument(
+        "--FORCEPURGE",
+        action="store_true",
+        default=False,
+        dest="forcePurge",
         help=textwrap.dedent(
-            f"""\
+            """\
+
+                                          Purge the Senzing repository before loading, NO confirmation prompt before purging.
 
-                                      Path to use instead of {tmp_path} (For S3 files).
+                                          WARNING: This will remove all ingested data and outcomes from the Senzing repository!
+                                                   Only use if you wish to start with a clean Senzing system before loading.
+                                                   If you are unsure please contact support@senzing.com
 
-                               """
+                                   """
         ),
     )
 
     g2load_parser.add_argument(
-        "-skr",
-        "--skipRecords",
-        default=0,
+        "-qbs",
+        "--queueBatchSize",
+        default=50,
         metavar="num_recs",
         type=int,
         help=textwrap.dedent(
             """\
 
-                                      Skip the first n records in a file.
+                                      Maximum number of records sent to the processing threads in each work queue batch.
+                                      A batch is sent early when the size of its records reaches 1 MB. 1 sends each record individually.
+
+                                      Default: %(default)s
 
                                     """
         ),
     )
 
     g2load_parser.add_argument(
-        "-sfi",
-        "--shuffFilesIgnore",
+        "-wp",
+        "--workerParse",
         action="store_true",
         default=False,
         help=textwrap.dedent(
             """\
 
-                                      Skip checking for previously shuffled files to use, and prompting to use them.
+                                      Parse and validate records in the processing threads instead of the reader.
+                                      The reader only splits rows, use when the reader is a bottleneck feeding many threads.
 
                                     """
         ),
     )
 
     g2load_parser.add_argument(
-        "-sfr",
-        "--shuffFileRedirect",
-        default=None,
-        metavar="path",
-        nargs="+",
+        "-pf",
+        "--parallelFiles",
+        default=1,
+        metavar="num_files",
+        type=int,
         help=textwrap.dedent(
             """\
 
-                                      Alternative path to output shuffled file to, useful for performance and device space.
+                                      Number of source files to read at once when loading a project or multiple files.
+                                      Processing threads are started once and shared by all files instead of restarting for
+                                      each file. Redo is processed after all files have been read.
 
-                                      Default: Same path as original file.
+                                      Default: %(default)s
 
                                     """
         ),
     )
 
-    # Both -ef and -ed shouldn't be used together
     g2load_parser.add_argument(
-        "-es",
-        "--errorsShort",
-        action="store_true",
-        default=False,
+        "-s3p",
+        "--s3Prefetch",
+        default=2,
+        metavar="num_files",
+        type=int,
         help=textwrap.dedent(
             """\
 
-                                      Reduce size of the errors file by not including the record.
+                                      Number of S3 files to open ahead of loading them. The first parts of the next files
+                                      are fetched in the background while a file loads. 0 disables prefetching.
+
+                                      Default: %(default)s
 
                                     """
         ),
     )
 
-    error_file_group = g2load_parser.add_mutually_exclusive_group()
-    error_file_group.add_argument(
-        "-ef",
-        "--errorsFile",
-        default=errors_file_default,
-        metavar="file",
-        nargs="?",
+    g2load_parser.add_argument(
+        "-sp",
+        "--splitRead",
+        action="store_true",
+        default=False,
         help=textwrap.dedent(
             """\
 
-                                         Path/file to write errors to.
-
-                                         Default: %(default)s
+                                      Split a large uncompressed local source file into byte ranges, each processing process
+                                      reads and parses its own range instead of one reader feeding all processes.
+                                      Redo is processed at the end of each file instead of during reading. Records aren't
+                                      shuffled while reading (--shuffleMode stream), each range is read in source order.
 
-                                       """
+                                    """
         ),
     )
 
-    error_file_group.add_argument(
-        "-efd",
-        "--errorsFileDisable",
-        action="store_true",
-        default=False,
+    g2load_parser.add_argument(
+        "-cr",
+        "--concurrentRedo",
+        default=0,
+        metavar="percent",
+        type=int,
         help=textwrap.dedent(
             """\
 
-                                         Turn off writing errors to file, written to terminal instead.
+                                      Process redo alongside loading using up to this percentage of the processing threads,
+                                      instead of pausing loading to process redo. Remaining redo is still processed at the
+                                      end of each source file. 0 disables.
 
-                                       """
+                                      Default: %(default)s
+
+                                    """
         ),
     )
 
-    # Both -nt and -ntm shouldn't be used together
-    num_threads_group = g2load_parser.add_mutually_exclusive_group()
-    num_threads_group.add_argument(
-        "-nt",
-        "--threadCount",
+    g2load_parser.add_argument(
+        "-rr",
+        "--redoRatio",
         default=0,
-        dest="thread_count",
-        metavar="num_threads",
+        metavar="num_batches",
         type=int,
         help=textwrap.dedent(
             """\
 
-                                          Total number of threads to start.
+                                      Number of ingest batches the processing threads take for each redo batch when both
+                                      ingest and redo records are waiting, approximately as it's counted by each process.
+                                      0 always takes redo first.
 
-                                          Default: Calculated based on hardware
+                                      Default: %(default)s
 
-                                        """
+                                    """
         ),
     )
 
-    num_threads_group.add_argument(
-        "-ntm",
-        "--threadCountMem",
-        choices=range(10, 81),
-        const=80,
-        default=None,
-        metavar="10 -> 80",
-        nargs="?",
+    g2load_parser.add_argument(
+        "-at",
+        "--autoTune",
+        default=0,
+        metavar="minutes",
         type=int,
         help=textwrap.dedent(
             """\
 
-                                          Percentage of memory to use when calculating threads (when -nt not specified).
+                                      Tune the number of processing threads for this many minutes at the start of loading.
+                                      Up to twice the number of threads (-nt or calculated) are started, no more than fit the
+                                      memory threads are calculated from (-ntm) and the SQLite limit. Threads are added or
+                                      removed while records per second improves. The chosen settings are printed to use
+                                      with -nt and -mtp on later loads. 0 disables. Not used with -sp.
 
-                                          Default: %(const)s
+                                      Default: %(default)s
 
-                                   """
+                                    """
         ),
     )
 
-    # Both -ns and -snd shouldn't be used together
-    no_shuf_shuf_no_del = g2load_parser.add_mutually_exclusive_group()
-    no_shuf_shuf_no_del.add_argument(
-        "-ns",
-        "--noShuffle",
-        action="store_true",
-        default=False,
+    g2load_parser.add_argument(
+        "-mp",
+        "--metricsPort",
+        default=0,
+        metavar="port",
+        type=int,
         help=textwrap.dedent(
             """\
 
-                                            Don\'t shuffle input file(s).
-
-                                            Shuffling improves performance and shouldn\'t be disabled unless pre-shuffled.
+                                      Serve load metrics in Prometheus text format on http://127.0.0.1:<port>/metrics.
+                                      Includes rows read, read and parse time, queue waits, engine call latency per API,
+                                      governor pauses and redo records.
 
-                                     """
+                                    """
         ),
     )
 
-    no_shuf_shuf_no_del.add_argument(
-        "-snd",
-        "--shuffleNoDelete",
-        action="store_true",
-        default=False,
+    g2load_parser.add_argument(
+        "-mf",
+        "--metricsFile",
+        default=None,
+        metavar="file",
         help=textwrap.dedent(
-            f"""\
-
-                                            Don\'t delete shuffled source file(s) after G2Loader shuffles them.
+            """\
 
-                                            Adds {SHUF_NO_DEL_TAG} and timestamp to the shuffled file. G2Loader can detect and reuse shuffled files.
+                                      Write the load metrics as JSON to this file, rewritten every 10 seconds.
 
-                                     """
+                                    """
         ),
     )
 
-    # Both -R and -sr shouldn't be used together
-    stop_row_redo_node = g2load_parser.add_mutually_exclusive_group()
-    stop_row_redo_node.add_argument(
-        "-R",
-        "--redoMode",
-        action="store_true",
-        default=False,
+    g2load_parser.add_argument(
+        "-slf",
+        "--slowRecordsFile",
+        default=slow_records_file_default,
+        metavar="file",
         help=textwrap.dedent(
             """\
 
-                                           Run in redo only mode, processes the redo queue.
+                                      Path/file to append engine call latency and the slowest records to after each source file.
+
+                                      Default: %(default)s
 
                                     """
         ),
     )
 
-    stop_row_redo_node.add_argument(
-        "-sr",
-        "--stopOnRecord",
-        default=0,
-        metavar="num_recs",
+    g2load_parser.add_argument(
+        "-src",
+        "--slowRecordsCount",
+        default=20,
+        metavar="num_records",
         type=int,
         help=textwrap.dedent(
             """\
 
-                                           Stop processing after n records (for testing large files).
+                                      Number of slowest records to log for each source file, 0 disables the slow records log.
+
+                                      Default: %(default)s
 
                                     """
         ),
     )
 
-    # Both -P and -D shouldn't be used together
-    purge_dsrc_delete = g2load_parser.add_mutually_exclusive_group()
-    purge_dsrc_delete.add_argument(
-        "-D",
-        "--delete",
-        action="store_true",
-        default=False,
-        dest="deleteMode",
+    g2load_parser.add_argument(
+        "-cp",
+        "--checkpointFile",
+        default=None,
+        metavar="file",
         help=textwrap.dedent(
             """\
 
-                                          Force deletion of a previously loaded file.
+                                      Periodically write the rows of each source file processed by all processing threads
+                                      to this file. Used with --resume to restart an interrupted load.
+                                      Requires --shuffleMode stream or -ns.
 
-                                   """
+                                    """
         ),
     )
 
-    purge_dsrc_delete.add_argument(
-        "-P",
-        "--purgeFirst",
+    g2load_parser.add_argument(
+        "-rs",
+        "--resume",
         action="store_true",
         default=False,
         help=textwrap.dedent(
             """\
 
-                                          Purge the Senzing repository before loading, confirmation prompt before purging.
-
-                                          WARNING: This will remove all ingested data and outcomes from the Senzing repository!
-                                                   Only use if you wish to start with a clean Senzing system before loading.
-                                                   If you are unsure please contact support@senzing.com
+                                      Resume an interrupted load from the checkpoint file (-cp). Source files completed are
+                                      skipped, others continue after the last row processed. Use the same arguments as the
+                                      interrupted load.
 
-                                   """
+                                    """
         ),
     )
 
-    purge_dsrc_delete.add_argument(
-        "--FORCEPURGE",
+    g2load_parser.add_argument(
+        "-pt",
+        "--passThrough",
         action="store_true",
         default=False,
-        dest="forcePurge",
         help=textwrap.dedent(
             """\
 
-                                          Purge the Senzing repository before loading, NO confirmation prompt before purging.
-
-                                          WARNING: This will remove all ingested data and outcomes from the Senzing repository!
-                                                   Only use if you wish to start with a clean Senzing system before loading.
-                                                   If you are unsure please contact support@senzing.com
+                                      Send JSON records to the engine as read instead of parsing and re-encoding them, when
+                                      DATA_SOURCE, RECORD_ID and LOAD_ID are found by scanning the text. Records with
+                                      DSRC_ACTION, repeated or escaped values, or these keys in nested objects or lists are
+                                      parsed as usual.
 
-                                   """
+                                    """
         ),
     )
 
@@ -2346,6 +4395,40 @@ if __name__ == "__main__":
         help=argparse.SUPPRESS,
     )
 
+    # Read uncompressed files as text instead of memory mapping them
+    g2load_parser.add_argument(
+        "-nmm", "--noMmap", action="store_true", default=False, help=argparse.SUPPRESS
+    )
+
+    # Decompress gzip files in the reading thread instead of a separate thread
+    g2load_parser.add_argument(
+        "-ntd",
+        "--noThreadedDecompress",
+        action="store_true",
+        default=False,
+        help=argparse.SUPPRESS,
+    )
+
+    # Seconds between checkpoint file writes
+    g2load_parser.add_argument(
+        "-cpi", "--checkpointInterval", default=30, type=int, help=argparse.SUPPRESS
+    )
+
+    # Memory in MB for S3 files opened ahead (-s3p), fewer files are opened ahead if their read ahead parts exceed it
+    g2load_parser.add_argument(
+        "-s3pm", "--s3PrefetchMemory", default=256, type=int, help=argparse.SUPPRESS
+    )
+
+    # Seconds between rewrites of the metrics file
+    g2load_parser.add_argument(
+        "-mfi", "--metricsFileInterval", default=10, type=int, help=argparse.SUPPRESS
+    )
+
+    # Seconds to measure each thread count when autotuning
+    g2load_parser.add_argument(
+        "-ati", "--autoTuneInterval", default=30, type=int, help=argparse.SUPPRESS
+    )
+
     # Frequency to pause loading and perform redo
     g2load_parser.add_argument(
         "-rif",
@@ -2473,6 +4556,92 @@ if __name__ == "__main__":
                 print(f"       {ex}")
                 sys.exit(1)
 
+    # Keeping or redirecting a shuffled file only makes sense when a shuffled file is written
+    if cli_args.shuffleMode == "stream" and (
+        cli_args.shuffleNoDelete or cli_args.shuffFileRedirect
+    ):
+        print(
+            "\nINFO: -snd or -sfr was specified, using --shuffleMode file to write a shuffled file"
+        )
+        cli_args.shuffleMode = "file"
+
+    if cli_args.parallelFiles < 1:
+        print("\nERROR: The number of files to read at once (-pf) must be at least 1")
+        sys.exit(1)
+
+    if cli_args.governorThrottle is not None and cli_args.governorThrottle < 1:
+        print(
+            "\nERROR: The governor throttle rate (-gt) must be at least 1 record per second"
+        )
+        sys.exit(1)
+
+    if cli_args.s3Prefetch < 0:
+        print("\nERROR: The number of S3 files to open ahead (-s3p) can't be negative")
+        sys.exit(1)
+
+    if not 0 <= cli_args.concurrentRedo <= 100:
+        print("\nERROR: The concurrent redo percentage (-cr) must be between 0 and 100")
+        sys.exit(1)
+
+    # A shuffled file is different each time, rows couldn't be resumed
+    if (
+        cli_args.checkpointFile
+        and cli_args.shuffleMode == "file"
+        and not cli_args.noShuffle
+    ):
+        print(
+            "\nERROR: Checkpoints (-cp) require --shuffleMode stream or -ns (--noShuffle), can't be used with -snd or -sfr"
+        )
+        sys.exit(1)
+
+    if cli_args.resume and not cli_args.checkpointFile:
+        print(
+            "\nERROR: --resume requires the checkpoint file (-cp) of the load to resume"
+        )
+        sys.exit(1)
+
+    if cli_args.checkpointFile and cli_args.splitRead:
+        print(
+            "\nINFO: Checkpoints (-cp) aren't supported when splitting files (-sp), not splitting files"
+        )
+        cli_args.splitRead = False
+
+    if (cli_args.skipRecords or cli_args.stopOnRecord) and cli_args.splitRead:
+        print(
+            "\nINFO: Skipping (-skr) or stopping on (-sr) records isn't supported when splitting files (-sp), not splitting files"
+        )
+        cli_args.splitRead = False
+
+    if cli_args.autoTune and cli_args.splitRead:
+        print(
+            "\nINFO: Autotuning (-at) isn't supported when splitting files (-sp), not autotuning"
+        )
+        cli_args.autoTune = 0
+
+    if cli_args.slowRecordsCount < 0:
+        print("\nERROR: The number of slowest records (-src) can't be negative")
+        sys.exit(1)
+
+    if cli_args.autoTune < 0:
+        print("\nERROR: The autotune minutes (-at) can't be negative")
+        sys.exit(1)
+
+    if cli_args.redoRatio < 0:
+        print("\nERROR: The redo ratio (-rr) can't be negative")
+        sys.exit(1)
+
+    if cli_args.queueBatchSize < 1:
+        print("\nERROR: The queue batch size (-qbs) must be at least 1 record")
+        sys.exit(1)
+
+    if cli_args.shuffleWindow < 1:
+        print("\nERROR: The shuffle window (-sw) must be at least 1 record")
+        sys.exit(1)
+
+    if cli_args.shuffleWindowMemory < 1:
+        print("\nERROR: The shuffle window memory (-swm) must be at least 1 MB")
+        sys.exit(1)
+
     # Check early if shuffFileRedirect is accessible and is a path
     if cli_args.shuffFileRedirect:
         shuf_path_redirect = pathlib.Path(cli_args.shuffFileRedirect[0]).resolve()
@@ -2544,7 +4713,7 @@ if __name__ == "__main__":
 
     # Test mode settings
     if cli_args.testMode:
-        default_thread_count = 1
+        default_thread_count = autotune_max_threads = 1
         cli_args.loadOutputFrequency = (
             10000
             if cli_args.loadOutputFrequency == 1000
@@ -2570,10 +4739,49 @@ if __name__ == "__main__":
         # Exit if checkResourcesProcess failed to start an engine
         if default_thread_count == -1:
             sys.exit(1)
+        autotune_max_threads = temp_queue.get()
 
     # Setup the governor(s), governor object is used for redo processing
     record_governor, source_governor, governor = governor_setup()
 
+    # Checkpoints, processing threads acknowledge batches to the main process
+    checkpoint = batch_ack_queue = None
+    if cli_args.checkpointFile and not cli_args.testMode and not cli_args.redoMode:
+        batch_ack_queue = Queue()
+        try:
+            checkpoint = Checkpoint(cli_args.checkpointFile, cli_args.resume)
+        except (IOError, ValueError, KeyError) as ex:
+            print(f"\nERROR: Unable to read checkpoint file {cli_args.checkpointFile}")
+            print(f"       {ex}")
+            sys.exit(1)
+        print(
+            f"\n{'Resuming from' if cli_args.resume else 'Writing'} checkpoint file {cli_args.checkpointFile}"
+        )
+
+    # Shared metrics are created before starting any processes, processes update them
+    metrics = None
+    if cli_args.metricsPort or cli_args.metricsFile:
+        metrics = LoaderMetrics()
+
+        if cli_args.metricsPort:
+            try:
+                metrics.start_http_server(cli_args.metricsPort)
+            except OSError as ex:
+                print(
+                    f"\nERROR: Unable to serve metrics on port {cli_args.metricsPort}"
+                )
+                print(f"       {ex}")
+                sys.exit(1)
+            print(
+                f"\nServing load metrics on http://127.0.0.1:{cli_args.metricsPort}/metrics"
+            )
+
+        if cli_args.metricsFile:
+            metrics.start_json_writer(
+                cli_args.metricsFile, cli_args.metricsFileInterval
+            )
+            print(f"\nWriting load metrics to {cli_args.metricsFile}")
+
     # Set DSRC mode, can be overridden by dsrc_action on a record, see G2Thread()
     dsrcAction = "A"
     if cli_args.deleteMode:
@@ -2611,6 +4819,18 @@ if __name__ == "__main__":
 
         exit_code, bad_cnt = perform_load()
 
+        # Files opened ahead and not read when stopping early
+        if G2S3.prefetcher:
+            G2S3.prefetcher.close()
+
+    if checkpoint:
+        checkpoint.flush()
+
+    # Final metrics, the file is otherwise only rewritten periodically
+    if metrics and cli_args.metricsFile:
+        with suppress(OSError):
+            metrics.write_json(cli_args.metricsFile)
+
     with suppress(Exception):
         errors_file.close()
 
@@ -0,0 +1,372 @@
+"""Shared memory metrics for G2Loader, exported as Prometheus text over HTTP and/or a periodically rewritten JSON file"""
+
+import bisect
+import heapq
+import json
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from multiprocessing import Array, Value
+
+# Engine call latency buckets in seconds
+DEFAULT_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1,
+    2.5,
+    5,
+    10,
+    30,
+)
+
+ENGINE_APIS = ("addRecord", "deleteRecord", "reevaluateRecord", "reevaluateEntity")
+
+
+class Counter:
+    """Counter shared by all G2Loader processes, must be created before the processes are started"""
+
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help = help_text
+        self.value = Value("d", 0)
+
+    def inc(self, amount=1):
+        with self.value.get_lock():
+            self.value.value += amount
+
+
+class Histogram:
+    """Histogram with a label, shared by all G2Loader processes. Bucket counts are stored per bucket and made
+    cumulative when exported"""
+
+    def __init__(
+        self, name, help_text, label_name, label_values, buckets=DEFAULT_BUCKETS
+    ):
+        self.name = name
+        self.help = help_text
+        self.label_name = label_name
+        self.label_values = label_values
+        self.label_idx = {label: idx for idx, label in enumerate(label_values)}
+        self.buckets = buckets
+        self.num_buckets = len(buckets) + 1
+
+        # Sums and counts are guarded by the bucket counts lock
+        self.bucket_counts = Array("q", len(label_values) * self.num_buckets)
+        self.sums = Array("d", len(label_values), lock=False)
+        self.counts = Array("q", len(label_values), lock=False)
+
+    def observe(self, label, value):
+        idx = self.label_idx[label]
+        bucket = bisect.bisect_left(self.buckets, value)
+
+        with self.bucket_counts.get_lock():
+            self.bucket_counts[idx * self.num_buckets + bucket] += 1
+            self.sums[idx] += value
+            self.counts[idx] += 1
+
+    def snapshot(self):
+        """Cumulative bucket counts, sum and count for each label"""
+
+        with self.bucket_counts.get_lock():
+            bucket_counts = self.bucket_counts[:]
+            sums = self.sums[:]
+            counts = self.counts[:]
+
+        result = {}
+        for label, idx in self.label_idx.items():
+            cumulative = 0
+            label_buckets = []
+            for bucket_idx in range(self.num_buckets):
+                cumulative += bucket_counts[idx * self.num_buckets + bucket_idx]
+                label_buckets.append(cumulative)
+            result[label] = {
+                "buckets": label_buckets,
+                "sum": sums[idx],
+                "count": counts[idx],
+            }
+
+        return result
+
+
+class CallTimings:
+    """Engine call latency histogram and slowest records for one processing thread, not shared. Merged for each
+    process and sent to the main process when the processing threads finish"""
+
+    def __init__(self, top_n, buckets=DEFAULT_BUCKETS):
+        self.top_n = top_n
+        self.buckets = buckets
+        self.apis = {}
+        # Min heap of (seconds, api, data source, record id, row number, is redo)
+        self.slowest = []
+
+    def add(self, api, secs, data_source, record_id, row_num, is_redo):
+        stats = self.apis.get(api)
+        if not stats:
+            stats = self.apis[api] = {
+                "buckets": [0] * (len(self.buckets) + 1),
+                "count": 0,
+                "sum": 0.0,
+                "max": 0.0,
+            }
+
+        stats["buckets"][bisect.bisect_left(self.buckets, secs)] += 1
+        stats["count"] += 1
+        stats["sum"] += secs
+        stats["max"] = max(stats["max"], secs)
+
+        self.add_slow((secs, api, data_source, record_id, row_num, is_redo))
+
+    def add_slow(self, entry):
+        if len(self.slowest) < self.top_n:
+            heapq.heappush(self.slowest, entry)
+        elif self.slowest and entry[0] > self.slowest[0][0]:
+            heapq.heapreplace(self.slowest, entry)
+
+    def merge(self, other):
+        for api, other_stats in other.apis.items():
+            stats = self.apis.get(api)
+            if not stats:
+                self.apis[api] = {
+                    key: value[:] if key == "buckets" else value
+                    for key, value in other_stats.items()
+                }
+                continue
+
+            stats["buckets"] = [
+                a + b for a, b in zip(stats["buckets"], other_stats["buckets"])
+            ]
+            stats["count"] += other_stats["count"]
+            stats["sum"] += other_stats["sum"]
+            stats["max"] = max(stats["max"], other_stats["max"])
+
+        for entry in other.slowest:
+            self.add_slow(entry)
+
+    def offset_rows(self, offset):
+        """Move the row numbers of ingest records on by offset, split ranges (-sp) number rows from their start.
+        None blanks them, the rows before the range weren't all read"""
+
+        renumbered = []
+        for secs, api, data_source, record_id, row_num, is_redo in self.slowest:
+            if row_num and not is_redo:
+                row_num = row_num + offset if offset is not None else None
+            renumbered.append((secs, api, data_source, record_id, row_num, is_redo))
+
+        self.slowest = renumbered
+        heapq.heapify(self.slowest)
+
+    def percentile(self, api, pct):
+        """Upper bound of the bucket the percentile falls in"""
+
+        stats = self.apis[api]
+        target = stats["count"] * pct / 100
+        cumulative = 0
+        for bound, count in zip(self.buckets, stats["buckets"]):
+            cumulative += count
+            if cumulative >= target:
+                return f"<={bound}"
+
+        return f">{self.buckets[-1]}"
+
+    def report(self, title):
+        """Latency summary for each API and the slowest records"""
+
+        lines = [
+            f"{datetime.now()} Engine call latency for {title}",
+            "",
+            f'    {"API":<20} {"Calls":>12} {"Mean (s)":>10} {"p50 (s)":>10} {"p99 (s)":>10} {"Max (s)":>10}',
+        ]
+        for api, stats in sorted(self.apis.items()):
+            lines.append(
+                f'    {api:<20} {stats["count"]:>12,} {stats["sum"] / stats["count"]:>10.4f} '
+                f"{self.percentile(api, 50):>10} {self.percentile(api, 99):>10} {stats['max']:>10.4f}"
+            )
+
+        lines.extend(
+            [
+                "",
+                f"    Slowest {len(self.slowest)} records",
+                "",
+                f'    {"Seconds":>10}  {"API":<20} {"Type":<8} {"Row":>12}  {"Data source":<20} Record ID',
+            ]
+        )
+        for secs, api, data_source, record_id, row_num, is_redo in sorted(
+            self.slowest, reverse=True
+        ):
+            lines.append(
+                f'    {secs:>10.4f}  {api:<20} {"Redo" if is_redo else "Ingest":<8} '
+                f'{row_num if row_num else "":>12}  {data_source:<20} {record_id}'
+            )
+
+        return "\n".join(lines) + "\n\n"
+
+
+class LoaderMetrics:
+    """Metrics for each stage of G2Loader, create in the main process before starting processing processes"""
+
+    def __init__(self):
+        self.start_time = time.time()
+
+        # The JSON metrics file is given the usual mode for new files, the temporary file it's written to is
+        # readable only by its owner. The umask is read before threads are started as reading it sets it
+        umask = os.umask(0)
+        os.umask(umask)
+        self.file_mode = 0o666 & ~umask
+
+        self.rows_read = Counter(
+            "g2loader_rows_read_total", "Rows read from source files"
+        )
+        self.read_seconds = Counter(
+            "g2loader_read_seconds_total", "Seconds reading rows from source files"
+        )
+        self.parse_seconds = Counter(
+            "g2loader_parse_seconds_total", "Seconds parsing rows into records"
+        )
+        self.parse_errors = Counter(
+            "g2loader_parse_errors_total", "Rows that couldn't be read or parsed"
+        )
+        self.queue_put_wait_seconds = Counter(
+            "g2loader_queue_put_wait_seconds_total",
+            "Seconds readers waited for space on the work queue",
+        )
+        self.queue_get_wait_seconds = Counter(
+            "g2loader_queue_get_wait_seconds_total",
+            "Seconds processing threads waited for work",
+        )
+        self.records_processed = Counter(
+            "g2loader_records_processed_total",
+            "Ingest and redo records taken by processing threads",
+        )
+        self.redo_records = Counter(
+            "g2loader_redo_records_total", "Redo records fetched by the redo feeder"
+        )
+        self.governor_pause_seconds = Counter(
+            "g2loader_governor_pause_seconds_total", "Seconds paused in governors"
+        )
+        self.api_errors = Counter(
+            "g2loader_api_errors_total", "Failed engine API calls"
+        )
+        self.engine_call_seconds = Histogram(
+            "g2loader_engine_call_seconds",
+            "Engine API call latency in seconds",
+            "api",
+            ENGINE_APIS,
+        )
+
+        self.counters = [
+            value for value in vars(self).values() if isinstance(value, Counter)
+        ]
+        self.histograms = [self.engine_call_seconds]
+
+    def prometheus_text(self):
+        """Metrics in the Prometheus text exposition format"""
+
+        lines = []
+
+        for counter in self.counters:
+            lines.append(f"# HELP {counter.name} {counter.help}")
+            lines.append(f"# TYPE {counter.name} counter")
+            lines.append(f"{counter.name} {counter.value.value}")
+
+        for histogram in self.histograms:
+            lines.append(f"# HELP {histogram.name} {histogram.help}")
+            lines.append(f"# TYPE {histogram.name} histogram")
+            for label, data in histogram.snapshot().items():
+                for bound, count in zip(
+                    list(histogram.buckets) + ["+Inf"], data["buckets"]
+                ):
+                    lines.append(
+                        f'{histogram.name}_bucket{{{histogram.label_name}="{label}",le="{bound}"}} {count}'
+                    )
+                lines.append(
+                    f'{histogram.name}_sum{{{histogram.label_name}="{label}"}} {data["sum"]}'
+                )
+                lines.append(
+                    f'{histogram.name}_count{{{histogram.label_name}="{label}"}} {data["count"]}'
+                )
+
+        return "\n".join(lines) + "\n"
+
+    def as_dict(self):
+        """Metrics as a dictionary for the JSON metrics file"""
+
+        return {
+            "timestamp": time.time(),
+            "uptime_seconds": time.time() - self.start_time,
+            "counters": {
+                counter.name: counter.value.value for counter in self.counters
+            },
+            "histograms": {
+                histogram.name: {
+                    "bucket_bounds": list(histogram.buckets) + ["+Inf"],
+                    histogram.label_name: histogram.snapshot(),
+                }
+                for histogram in self.histograms
+            },
+        }
+
+    def write_json(self, file_path):
+        """Write the metrics to a temporary file and rename it, readers never see a partial file"""
+
+        file_dir = os.path.dirname(os.path.abspath(file_path))
+        with tempfile.NamedTemporaryFile(
+            "w", dir=file_dir, delete=False, suffix=".tmp"
+        ) as temp_file:
+            json.dump(self.as_dict(), temp_file, indent=2)
+        os.chmod(temp_file.name, self.file_mode)
+        os.replace(temp_file.name, file_path)
+
+    def start_json_writer(self, file_path, interval):
+        """Rewrite the JSON metrics file every interval seconds in a daemon thread"""
+
+        def writer():
+            while True:
+                try:
+                    self.write_json(file_path)
+                except OSError as ex:
+                    print(
+                        f"\nWARNING: Unable to write metrics file {file_path}: {ex}",
+                        flush=True,
+                    )
+                time.sleep(interval)
+
+        threading.Thread(target=writer, daemon=True).start()
+
+    def start_http_server(self, port, host="127.0.0.1"):
+        """Serve Prometheus text on http://host:port/metrics in a daemon thread"""
+
+        metrics = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+
+                body = metrics.prometheus_text().encode("utf-8")
+                self.send_response(200)
+                self.send_header(
+                    "Content-Type", "text/plain; version=0.0.4; charset=utf-8"
+                )
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                return
+
+        server = ThreadingHTTPServer((host, port), MetricsHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+        return server
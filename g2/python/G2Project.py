@@ -1,5 +1,6 @@
 #! /usr/bin/env python3
 
+import csv
 import fnmatch
 import glob
 import io
@@ -9,9 +10,10 @@ import textwrap
 from contextlib import redirect_stdout
 from operator import itemgetter
 
-from CompressedFile import (fileRowParser, isCompressedFile,
+from CompressedFile import (DelimitedRowReader, fileRowParser,
+                            hasCompressedSuffix, isDelimitedRowFile,
                             openPossiblyCompressedFile)
-from G2S3 import G2S3
+from G2S3 import G2S3, S3Prefetcher
 
 
 # ======================
@@ -466,8 +468,8 @@ class G2Project:
                         except ValueError:
                             pass
 
-                    # If looks like a compressed file, strip off the first extension (.gz, .gzip, zip) to locate the real extension (.json, .csv)
-                    if isCompressedFile(fileSpec):
+                    # If looks like a compressed file, strip off the first extension (.gz, .zip, .zst, .bz2, .xz...) to locate the real extension (.json, .csv)
+                    if hasCompressedSuffix(fileSpec):
                         remain_fileSpec, _ = os.path.splitext(fileSpec)
                         _, fileExtension = os.path.splitext(remain_fileSpec)
 
@@ -627,6 +629,12 @@ class G2Project:
         self.sourceList = []
         sourceRow = 0
 
+        # --open the S3 files ahead of validating them, only the start of each file is read
+        s3Uris = [sourceDict['FILE_NAME'].strip() for sourceDict in self.projectSourceList
+                  if G2S3.isS3Uri(str(sourceDict.get('FILE_NAME', '')).strip()) and str(sourceDict.get('ENABLED', 'Y')).upper() not in ('0', 'N', 'NO')]
+        if s3Uris:
+            G2S3.prefetcher = S3Prefetcher(s3Uris, maxFiles=8, partSize=1024 * 1024, readAhead=1)
+
         for sourceDict in self.projectSourceList:
             sourceRow += 1
 
@@ -694,11 +702,10 @@ class G2Project:
             # --validate and map the files for this source
             if self.success:
                 if G2S3.isS3Uri(sourceDict['FILE_NAME']):
-                    # --an S3 path so download the file to the temp location
-                    downloader = G2S3(sourceDict['FILE_NAME'], self.tempFolderPath)
-                    downloader.downloadFile()
-                    sourceDict['FILE_PATH'] = downloader.tempFilePath
-                    sourceDict['FILE_NAME'] = downloader.fileName
+                    # --an S3 path, the file is streamed from S3 when read and not downloaded
+                    s3File = G2S3(sourceDict['FILE_NAME'], self.tempFolderPath)
+                    sourceDict['FILE_PATH'] = sourceDict['FILE_NAME']
+                    sourceDict['FILE_NAME'] = s3File.fileName
                     sourceDict['FILE_SOURCE'] = "S3"
                 elif os.path.exists(sourceDict['FILE_NAME']):
                     # --adjustment if they gave us full path as file name
@@ -711,7 +718,7 @@ class G2Project:
 
                 print(f'\nValidating {sourceDict["FILE_PATH"]}...')
 
-                if not os.path.exists(sourceDict['FILE_PATH']):
+                if not (G2S3(sourceDict['FILE_PATH']).exists() if sourceDict['FILE_SOURCE'] == 'S3' else os.path.exists(sourceDict['FILE_PATH'])):
                     print(' ERROR: File does not exist!')
                     self.success = False
                 else:
@@ -720,17 +727,32 @@ class G2Project:
                     rowCnt = 0
                     badCnt = 0
                     fileReader = openPossiblyCompressedFile(sourceDict['FILE_PATH'], 'r', sourceDict['ENCODING'])
+                    if isDelimitedRowFile(sourceDict):
+                        fileReader = DelimitedRowReader(fileReader, sourceDict['DELIMITER'])
 
                     # --get header row if csv
                     if sourceDict['FILE_FORMAT'] not in ('JSON', 'JSONL', 'UMF'):
                         sourceDict['HEADER_ROW'] = [x.strip().upper() for x in fileRowParser(next(fileReader), sourceDict)]
 
-                    for row in fileReader:
+                    while True:
+                        try:
+                            row = next(fileReader)
+                        except StopIteration:
+                            break
+                        except csv.Error as err:
+                            # --a row the csv module can't parse is bad, the next one is read after it
+                            row = None
+                            print(f'WARNING: Could not read row {rowCnt + 1}, {err}')
+
                         rowCnt += 1
                         if rowCnt > 100:
                             rowCnt -= 1
                             break
 
+                        if row is None:
+                            badCnt += 1
+                            continue
+
                         rowData = fileRowParser(row, sourceDict, rowCnt)
                         if not rowData:
                             badCnt += 1
@@ -757,6 +779,10 @@ class G2Project:
             if self.success:
                 self.sourceList.append(sourceDict)
 
+        if G2S3.prefetcher:
+            G2S3.prefetcher.close()
+            G2S3.prefetcher = None
+
         return
 
     # ----------------------------------------
@@ -1,18 +1,32 @@
 # --python imports
+import io
 import os
+import threading
+from collections import deque
+from contextlib import suppress
+from concurrent.futures import ThreadPoolExecutor
 
 
 # ======================
 class G2S3:
 
+    # -- S3Prefetcher opening files ahead of them being read, used by openReader() when set
+    prefetcher = None
+
+    # -- S3 client shared by the threads of a process, clients are thread safe but creating them from the default
+    # -- session isn't. Created again in a forked process, the connections of the parent's client can't be shared
+    client = None
+    clientPid = None
+    clientLock = threading.Lock()
+
     # ----------------------------------------
-    def __init__(self, uri, tempFolderPath):
+    def __init__(self, uri, tempFolderPath=None):
         urlSplit = uri[5:].split('/')
         self.bucketName = G2S3.getBucketNameFromUri(uri)  # urlSplit[0]
         self.fileName = urlSplit[-1]
         self.localFilePath = os.sep.join(urlSplit[1:])
         self.s3filePath = "/".join(urlSplit[1:])
-        self.tempFilePath = os.path.join(tempFolderPath, self.localFilePath)
+        self.tempFilePath = os.path.join(tempFolderPath, self.localFilePath) if tempFolderPath else None
         self.uri = uri
 
     @staticmethod
@@ -101,3 +115,199 @@ class G2S3:
             print('Could not download ' + self.s3filePath + ' from S3')
             print(e)
             raise
+
+    # ----------------------------------------
+    @staticmethod
+    def getClient():
+        with G2S3.clientLock:
+            if G2S3.client is None or G2S3.clientPid != os.getpid():
+                try:
+                    import boto3
+                except ImportError:
+                    print ('Amazon S3 package (boto3) is not installed. Please install it and try again.')
+                    raise
+
+                G2S3.client = boto3.session.Session().client('s3')
+                G2S3.clientPid = os.getpid()
+
+            return G2S3.client
+
+    def getSize(self):
+        """ size of the object in bytes, None if it doesn't exist """
+        client = self.getClient()
+        import botocore
+
+        try:
+            return client.head_object(Bucket=self.bucketName, Key=self.s3filePath)['ContentLength']
+        except botocore.exceptions.ClientError as e:
+            if e.response['Error']['Code'] in ('404', 'NoSuchKey'):
+                return None
+            print('Could not access ' + self.s3filePath + ' in S3')
+            print(e)
+            raise
+
+    def exists(self):
+        return self.getSize() is not None
+
+    def openReader(self, partSize=8 * 1024 * 1024, readAhead=4):
+        """ binary reader streaming the object from S3, no temporary file is required """
+        reader = G2S3.prefetcher.take(self.uri) if G2S3.prefetcher else None
+        return reader if reader else self.openRangeReader(partSize, readAhead)
+
+    def openRangeReader(self, partSize, readAhead):
+        size = self.getSize()
+        if size is None:
+            raise FileNotFoundError(self.fileName + ' does not exist at the URI specified: ' + self.uri)
+
+        return S3RangeReader(self.getClient(), self.bucketName, self.s3filePath, size, partSize, readAhead)
+
+
+# ======================
+class S3RangeReader(io.RawIOBase):
+    """ seekable binary reader of an S3 object using ranged GET requests
+
+        The object is read in parts of partSize bytes, readAhead parts following the part being read are fetched in
+        parallel. Seeking outside of the parts fetched discards them and starts fetching from the new position.
+    """
+
+    # ----------------------------------------
+    def __init__(self, client, bucketName, key, size, partSize, readAhead):
+        super().__init__()
+        self.client = client
+        self.bucketName = bucketName
+        self.key = key
+        self.size = size
+        self.partSize = partSize
+        self.readAhead = max(1, readAhead)
+        self.executor = ThreadPoolExecutor(max_workers=self.readAhead)
+
+        self.pos = 0
+        # -- parts being fetched as (start offset, future), in order, and the part being read
+        self.parts = deque()
+        self.nextPart = 0
+        self.part = None
+        self.partStart = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self.pos
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self.pos
+        elif whence == io.SEEK_END:
+            offset += self.size
+        self.pos = max(0, offset)
+        return self.pos
+
+    def fetchPart(self, start):
+        end = min(start + self.partSize, self.size) - 1
+        response = self.client.get_object(Bucket=self.bucketName, Key=self.key, Range=f'bytes={start}-{end}')
+        return response['Body'].read()
+
+    def fetchAhead(self):
+        while len(self.parts) < self.readAhead and self.nextPart < self.size:
+            self.parts.append((self.nextPart, self.executor.submit(self.fetchPart, self.nextPart)))
+            self.nextPart += self.partSize
+
+    def readinto(self, b):
+        if self.pos >= self.size:
+            return 0
+
+        # -- move to the part holding the position, restart fetching if it isn't being fetched
+        if self.part is None or not self.partStart <= self.pos < self.partStart + len(self.part):
+            partStart = self.pos - self.pos % self.partSize
+            while self.parts and self.parts[0][0] < partStart:
+                self.parts.popleft()[1].cancel()
+            if not self.parts or self.parts[0][0] != partStart:
+                for _, future in self.parts:
+                    future.cancel()
+                self.parts.clear()
+                self.nextPart = partStart
+
+            self.fetchAhead()
+            self.partStart, future = self.parts.popleft()
+            self.part = memoryview(future.result())
+            self.fetchAhead()
+            if self.pos >= self.partStart + len(self.part):
+                raise EOFError('S3 object ' + self.key + ' is shorter than when opened')
+
+        offset = self.pos - self.partStart
+        size = min(len(b), len(self.part) - offset)
+        b[:size] = self.part[offset:offset + size]
+        self.pos += size
+
+        return size
+
+    def close(self):
+        if not self.closed:
+            for _, future in self.parts:
+                future.cancel()
+            self.executor.shutdown(wait=False)
+        super().close()
+
+
+# ======================
+class S3Prefetcher:
+    """ opens the S3 files of a load ahead of them being read, fetching their first parts in the background
+
+        While a file is read the next maxFiles files are opened. Each holds up to readAhead parts of partSize bytes,
+        fewer files are opened ahead if they would exceed memoryBudget bytes.
+    """
+
+    # ----------------------------------------
+    def __init__(self, uris, maxFiles=2, memoryBudget=256 * 1024 * 1024, partSize=8 * 1024 * 1024, readAhead=4):
+        self.uris = list(uris)
+        self.partSize = partSize
+        self.readAhead = readAhead
+        self.maxFiles = max(0, min(maxFiles, memoryBudget // (partSize * readAhead)))
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=max(1, self.maxFiles))
+        # -- uri: future of the opened reader, for files not yet taken
+        self.readers = {}
+
+        with self.lock:
+            self.prefetchFrom(0)
+
+    def prefetchFrom(self, idx):
+        for uri in self.uris[idx:idx + self.maxFiles]:
+            if uri not in self.readers:
+                self.readers[uri] = self.executor.submit(self.openReader, uri)
+
+    def openReader(self, uri):
+        reader = G2S3(uri).openRangeReader(self.partSize, self.readAhead)
+        reader.fetchAhead()
+        return reader
+
+    def take(self, uri):
+        """ the opened reader of a file, None if it wasn't opened ahead or couldn't be opened """
+        with self.lock:
+            if uri not in self.uris:
+                return None
+            future = self.readers.pop(uri, None)
+            self.prefetchFrom(self.uris.index(uri) + 1)
+
+        if not future:
+            return None
+        try:
+            return future.result()
+        except Exception:
+            # -- the caller opens the file again and reports the error
+            return None
+
+    def close(self):
+        with self.lock:
+            futures = list(self.readers.values())
+            self.readers.clear()
+            self.uris = []
+
+        for future in futures:
+            if not future.cancel():
+                with suppress(Exception):
+                    future.result().close()
+        self.executor.shutdown(wait=False)
@@ -15,12 +15,7 @@ from contextlib import suppress
 
 import json
 
-try:
-    import orjson
-
-    use_orjson = True
-except:
-    use_orjson = False
+import G2Json
 
 # concurrency
 from multiprocessing import Process, Queue, Value
@@ -998,7 +993,7 @@ def get_entity_features(g2Engine, esb_data):
         response = response.decode() if response else ""
     except G2Exception as err:
         return {}
-    jsonData = orjson.loads(response) if use_orjson else json.loads(response)
+    jsonData = G2Json.loads(response)
     featureInfo = {}
     for ftypeCode in jsonData["RESOLVED_ENTITY"]["FEATURES"]:
         distinctFeatureCount = 0
@@ -0,0 +1,228 @@
+# --------------------------------------------------------------------------------------------------------------
+# Class: Governor
+#
+# Governor for G2Loader watching several PostgreSQL health signals, use with: G2Loader.py -g governor_postgres_health
+#
+#   xid_age          Transaction ID (XID) age of the database, as governor_postgres_xid.py
+#   replication_lag  Seconds the slowest replica is behind replaying WAL, from pg_stat_replication
+#   wal_rate         MB per second of WAL written since the last poll
+#   connections      Percentage of max_connections used by client backends, from pg_stat_activity
+#
+# Each signal has a pause and a resume threshold, <signal>_pause and <signal>_resume keyword arguments override the
+# defaults below. A pause threshold of None only reports the signal, a signal given a pause threshold without a resume
+# threshold resumes at half of it. Loading is admitted while every signal of
+# every database is at or below its pause threshold. Once over, all threads pause until every signal is at or below
+# its resume threshold. With throttle_rate set (G2Loader --governorThrottle) readers are throttled from throttle_rate
+# records per second as a signal climbs from its resume threshold, down to throttle_min_rate at its pause threshold.
+#
+# The signals of all databases are polled at once by a background thread every check_time_interval seconds, calls
+# from G2Loader only read the latest admission decision. In a clustered database (BACKEND=HYBRID) each database is
+# checked.
+#
+# The replication_lag and connections signals see other sessions only with the pg_monitor role, without it they
+# read as 0 and not behind. Grant it to the Senzing database user with: GRANT pg_monitor TO <user>;
+#
+# To try against a local PostgreSQL, point SENZING_ENGINE_CONFIGURATION_JSON at it and create the governor:
+#
+#   python3 -c "import os; from multiprocessing import Value; import governor_postgres_health as g; \
+#       g.Governor(Value('i', 0), type='Test', frequency='record', g2module_params=os.environ['SENZING_ENGINE_CONFIGURATION_JSON']).govern()"
+#
+# This sample uses the native Python Postgres driver psycopg2.
+# Full details on installation: https://www.psycopg.org/docs/install.html
+# Basic installation: pip3 install psycopg2 --user
+#
+# --------------------------------------------------------------------------------------------------------------
+
+import textwrap
+import time
+from datetime import datetime
+
+import governor_postgres_xid
+
+# Signal name: (description, SQL, default pause threshold, default resume threshold)
+SIGNALS = {
+    'xid_age': (
+        'XID age',
+        'SELECT age(datfrozenxid) FROM pg_database WHERE datname = current_database();',
+        1500000000,
+        1200000000
+    ),
+    'replication_lag': (
+        'Replication lag (secs)',
+        'SELECT COALESCE(MAX(EXTRACT(EPOCH FROM replay_lag)), 0) FROM pg_stat_replication;',
+        300,
+        60
+    ),
+    'wal_rate': (
+        'WAL written (MB/sec)',
+        "SELECT pg_wal_lsn_diff(pg_current_wal_lsn(), '0/0');",
+        None,
+        None
+    ),
+    'connections': (
+        'Connections used (%)',
+        "SELECT 100.0 * count(*) / current_setting('max_connections')::int FROM pg_stat_activity WHERE backend_type = 'client backend';",
+        95,
+        85
+    )
+}
+
+
+# -----------------------------------------------------------------------------
+# Class: Governor
+# -----------------------------------------------------------------------------
+
+
+class Governor(governor_postgres_xid.Governor):
+    """ Uses the connections, monitor thread, logging and G2Loader calls of the XID governor, replacing what is polled """
+
+    def __init__(self, thread_stop, *args, **kwargs):
+
+        # Thresholds for each signal, a pause of None reports the signal without pausing or throttling for it. The
+        # xid_age and resume_age arguments of the XID governor are also used for the xid_age signal
+        defaults = dict(SIGNALS)
+        defaults['xid_age'] = defaults['xid_age'][:2] + (kwargs.get('xid_age', defaults['xid_age'][2]), kwargs.get('resume_age', defaults['xid_age'][3]))
+
+        self.thresholds = {}
+        for signal, (desc, sql, pause, resume) in defaults.items():
+            # A pause threshold given without a resume threshold resumes at half of it, not at the default
+            if f'{signal}_pause' in kwargs and f'{signal}_resume' not in kwargs:
+                resume = None
+            pause =kwargs.get(f'{signal}_pause', pause)
+            resume = kwargs.get(f'{signal}_resume', resume if resume is not None or pause is None else pause / 2)
+            if pause is not None and (resume is None or resume >= pause):
+                raise ValueError(f'Creating governor, {signal}_resume {resume} must be lower than {signal}_pause {pause}')
+            self.thresholds[signal] = (pause, resume)
+
+        # Latest value of each signal for each DB, signals over their pause threshold and WAL positions for the WAL rate
+        self.current_values = {}
+        self.over_pause = []
+        self.wal_positions = {}
+
+        super().__init__(thread_stop, *args, **kwargs)
+
+    def query_signals(self, db_objs):
+        """ Value of each signal for one DB, db_objs - 0 = connection, 1 = cursor, 2 = DSN """
+
+        values = {}
+        for signal, (desc, sql, pause, resume) in SIGNALS.items():
+            db_objs[1].execute(sql)
+            values[signal] = float(db_objs[1].fetchone()[0] or 0)
+
+        # WAL position to a rate since the last poll
+        wal_position, poll_time = values['wal_rate'], time.monotonic()
+        last_position, last_time = self.wal_positions.get(db_objs[2], (wal_position, poll_time))
+        values['wal_rate'] = (wal_position - last_position) / (1024 * 1024) / (poll_time - last_time) if poll_time > last_time else 0.0
+        self.wal_positions[db_objs[2]] = (wal_position, poll_time)
+
+        return db_objs[2], values
+
+    def poll(self, executor=None):
+        """ Query the signals of each DB (single or clustered), at the same time when there are several """
+
+        db_objs_list = list(self.connect_dict.values())
+        current_values = dict(executor.map(self.query_signals, db_objs_list) if executor else map(self.query_signals, db_objs_list))
+
+        self.current_values = current_values
+        self.over_pause = self.signals_over(0)
+
+        if self.throttle_rate:
+            self.update_rate()
+
+    def signals_over(self, threshold_idx):
+        """ (DB, signal, value, threshold) of signals over their pause (0) or resume (1) threshold """
+
+        over = []
+        for db_name, values in self.current_values.items():
+            for signal, value in values.items():
+                threshold = self.thresholds[signal][threshold_idx]
+                if threshold is not None and value > threshold:
+                    over.append((db_name, signal, value, threshold))
+
+        return over
+
+    def update_rate(self):
+        """ Throttle by the signal nearest its pause threshold, ramping down linearly from its resume threshold """
+
+        remaining = 1.0
+        for db_name, signal, value, resume in self.signals_over(1):
+            pause = self.thresholds[signal][0]
+            remaining = min(remaining, max(0.0, (pause - value) / (pause - resume)))
+
+        rate = max(self.throttle_min_rate, int(self.throttle_rate * remaining)) if remaining < 1.0 else None
+
+        if rate and not self.current_rate:
+            self.print_or_log(f'\nWARNING: {self.type} - Database health signal(s) over resume thresholds, throttling to {rate} records per second\n{self.status_report()}', 'WARN')
+        elif not rate and self.current_rate:
+            self.print_or_log(f'\nINFO: {self.type} - Database health signals under resume thresholds, resuming full speed\n')
+
+        self.current_rate = rate
+
+    def status_report(self):
+        """ Latest value and thresholds of each signal for each DB """
+
+        lines = [f'    {"Database":<20} {"Signal":<24} {"Value":>16} {"Pause at":>16} {"Resume at":>16}  State']
+        for db_name, values in sorted(self.current_values.items()):
+            for signal, value in values.items():
+                pause, resume = self.thresholds[signal]
+                state = 'Report only' if pause is None else 'Over pause' if value > pause else 'Over resume' if value > resume else 'OK'
+                lines.append(f'    {db_name:<20} {SIGNALS[signal][0]:<24} {value:>16,.1f} {pause if pause is not None else "-":>16} {resume if resume is not None else "-":>16}  {state}')
+
+        return '\n'.join(lines) + '\n'
+
+    def govern_post(self, *args, **kwargs):
+        """  Tasks to perform after creating governor """
+
+        if self.pre_post_msgs:
+
+            self.print_or_log(textwrap.indent(textwrap.dedent(f'''\
+                  Successfully created:
+
+                    Type:               {self.type}
+                    Frequency:          {self.frequency}
+                    Interval:           {self.interval if self.frequency == 'record' else 'None - Only used for frequency type of record'}
+                    Check n seconds:    {self.check_time_interval if self.frequency == 'record' else 'None - Only used for frequency type of record'}
+                    Wait Time(s):       {self.wait_time}
+                    Throttle:           {f'{self.throttle_rate} to {self.throttle_min_rate} records per second from resume thresholds' if self.throttle_rate and self.frequency == 'record' else 'None - Pause only'}
+                    Database(s):        {self.db_names}
+                '''), '  '))
+            if self.current_values:
+                self.print_or_log(self.status_report())
+
+        return
+
+    def record_action(self):
+        """ Action to be performed when called for records, a read of the latest admission decision unless a signal is over its pause threshold """
+
+        if self.monitor_error:
+            raise self.monitor_error
+
+        if not self.over_pause:
+            return
+
+        # Serialize threads, one reports the pause and the others wait with it
+        with self.threads_lock:
+
+            # Another thread already waited for the signals to recover
+            if not self.over_pause:
+                return
+
+            over = ', '.join(f'{SIGNALS[signal][0]} {value:,.1f} on {db_name}' for db_name, signal, value, threshold in self.over_pause)
+            self.print_or_log(f'\nWARNING: {self.type} - Ingestion paused, database health signal(s) over pause thresholds: {over}\n\n{self.status_report()}', 'WARN')
+
+            # Wait for every signal to be at or below its resume threshold, the monitor thread keeps polling
+            while self.signals_over(1):
+
+                waiting = ', '.join(f'{SIGNALS[signal][0]} {value:,.1f} > {threshold}' for db_name, signal, value, threshold in self.signals_over(1))
+                self.print_or_log(f'\t{datetime.now().strftime("%I:%M%p")} - Waiting for {waiting} - Sleeping for {self.wait_time}s...', 'WARN')
+                time.sleep(self.wait_time)
+
+                if self.monitor_error:
+                    raise self.monitor_error
+
+                # If G2Loader fails or catches CTRL-C, break to end this loop and exit governor
+                if self.thread_stop.value != 0:
+                    break
+
+            self.over_pause = []
+            print()
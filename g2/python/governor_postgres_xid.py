@@ -1,10 +1,20 @@
 # --------------------------------------------------------------------------------------------------------------
 # Class: Governor
 #
-# Sample to demonstrate G2Loader calling Govern after each record read. Detects XID age in Postgres database(s),
+# Sample to demonstrate G2Loader calling the governor as records are read. G2Loader calls tick() every interval
+# records or check_time_interval seconds, as returned by tick_interval(), governors without tick() have govern()
+# called after each record read. Detects XID age in Postgres database(s),
 # if the threshold age is detected all threads are paused until the resume age value (or less) is detected,
 # upon this detection threads and processing is resumed.
 #
+# XID age is polled for all databases at once by a background thread every check_time_interval seconds, calls from
+# G2Loader only read the latest age polled and don't query the database(s).
+#
+# With throttle_rate set (G2Loader --governorThrottle) loading slows down before the threshold instead of only
+# pausing at it. From throttle_age the target rate returned by target_rate() ramps down from throttle_rate records
+# per second to throttle_min_rate at xid_age, and back up as XID age falls. G2Loader readers keep to the target
+# rate. Processing is still paused above xid_age.
+#
 # XID age is reduced with the Postgres vacuum command. This sample doesn't attempt to issue the vacuum command;
 # the user running G2Loader may not have the privileges to do so. When the age threshold is detected and G2Loader
 # pauses, manually issue a vacuum command.
@@ -25,6 +35,8 @@ import textwrap
 import threading
 import time
 import urllib.parse
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from importlib import import_module
 
@@ -37,6 +49,31 @@ class G2DBException(Exception):
     """ Base exception for G2 DB related python code """
 
 
+# -----------------------------------------------------------------------------
+# Monitor thread
+# -----------------------------------------------------------------------------
+
+
+def monitor_polls(governor_ref, monitor_stop, interval):
+    """ Poll the database(s) every interval seconds until the governor is cleaned up or destroyed. The governor is only
+        weakly referenced between polls, the thread doesn't keep an unused governor alive
+    """
+
+    while not monitor_stop.wait(interval):
+
+        governor = governor_ref()
+        if not governor:
+            return
+
+        try:
+            governor.poll(governor.monitor_executor)
+        except Exception as ex:
+            governor.monitor_error = ex
+            return
+        finally:
+            del governor
+
+
 # -----------------------------------------------------------------------------
 # Class: Governor
 # -----------------------------------------------------------------------------
@@ -61,7 +98,6 @@ class Governor:
         self.ignore_ini_stanzas = ['PIPELINE', 'HYBRID']
         self.connect_strs = []
         self.connect_dict = {}
-        self.next_check_time = time.time()
         self.sql_stmt = "SELECT age(datfrozenxid) FROM pg_database WHERE datname = (%s);"
         self.threads_lock = threading.Lock()
 
@@ -72,10 +108,13 @@ class Governor:
         #
         # frequency = row or source. The frequency the governor runs at, this must be specified
         # interval = Governor called every row x number of records - used for per record or redo governor not per source
-        # check_time = In addition to checking every interval, check every x seconds too
+        # check_time = Seconds between polls of XID age by the monitor thread, G2Loader also calls the governor at least this often
         # xid_age = Value of Postgres XID age to pause at for a vacuum to be completed (high water mark to pause at)
         # wait_time = Period in seconds to pause processing for between each check of XID age once triggered
         # resume_age = XID age to resume processing at (low water mark lower than xid_age)
+        # throttle_rate = Records per second to slow each reader to at throttle_age, None to only pause at xid_age
+        # throttle_age = XID age to start throttling at, the rate ramps down to throttle_min_rate at xid_age
+        # throttle_min_rate = Records per second at xid_age
         # govern_debug = To call debug functions (if used)
         # use_logging = Future use
         # pre_post_msgs = Show pre and post messages?
@@ -87,6 +126,9 @@ class Governor:
         self.xid_age = kwargs.get('xid_age', 1500000000)
         self.wait_time = kwargs.get('wait_time', 60)
         self.resume_age = kwargs.get('resume_age', 1200000000)
+        self.throttle_rate = kwargs.get('throttle_rate', None)
+        self.throttle_age = kwargs.get('throttle_age', self.resume_age)
+        self.throttle_min_rate = kwargs.get('throttle_min_rate', max(1, (self.throttle_rate or 0) // 100))
         self.govern_debug = kwargs.get('govern_debug', False)
         self.use_logging = kwargs.get('use_logging', False)
         self.pre_post_msgs = kwargs.get('pre_post_msgs', True)
@@ -150,6 +192,12 @@ class Governor:
                 except:
                     raise ValueError(f'Creating governor, invalid {check[0]} {check[1]}. Should be {check[3]} not {type(check[1])}')
 
+        if self.throttle_rate is not None and (self.throttle_rate <= 0 or not 0 < self.throttle_min_rate <= self.throttle_rate):
+            raise ValueError(f'Creating governor, throttle rate {self.throttle_rate} and minimum rate {self.throttle_min_rate} must be > 0 and the minimum no higher than the rate')
+
+        if self.throttle_rate is not None and self.throttle_age >= self.xid_age:
+            raise ValueError(f'Creating governor, throttle age {self.throttle_age} must be lower than XID age {self.xid_age}')
+
         # Track number of per record calls when governor is frequency = row
         self.record_num = 1
 
@@ -187,6 +235,17 @@ class Governor:
                 # String of all the DB names without other connection details. k[2] is the dsn
                 self.db_names = ', '.join(k[2] for k in self.connect_dict.values())
 
+        # Latest XID age of each DB polled by the monitor thread, and the highest. An error polling is raised by the next call
+        self.current_ages = {}
+        self.max_age = 0
+        self.monitor_error = None
+        # Records per second readers are throttled to, None at full speed
+        self.current_rate = None
+        self.monitor_stop = threading.Event()
+
+        if self.frequency == 'record':
+            self.start_monitor()
+
         self.govern_post()
 
         return
@@ -199,14 +258,28 @@ class Governor:
 
         if self.frequency == 'record':
             self.record_num += 1
-            # If either the record interval or time_interval has passed call record_action
-            if (self.record_num % self.interval == 0) or (time.time() > self.next_check_time):
-                self.record_action()
+            self.record_action()
         elif self.frequency == 'source':
             self.source_action()
 
         return
 
+    def tick_interval(self):
+        """ Records and seconds between calls to tick() by G2Loader, used in place of govern() for each record """
+
+        if self.frequency == 'record':
+            return self.interval, self.check_time_interval
+
+        return None, None
+
+    def tick(self, records):
+        """ Called by G2Loader every interval records or check_time_interval seconds, records read since the last tick """
+
+        self.record_num += records
+        self.record_action()
+
+        return
+
     def govern_pre(self, *args, **kwargs):
         """ Tasks to perform before creating governor """
 
@@ -233,6 +306,7 @@ class Governor:
                     Check n seconds:    {self.check_time_interval if self.frequency == 'record' else 'None - Only used for frequency type of record'}
                     XID trigger age:    {self.xid_age}
                     XID resume age:     {self.resume_age}
+                    Throttle:           {f'{self.throttle_rate} to {self.throttle_min_rate} records per second from XID age {self.throttle_age}' if self.throttle_rate and self.frequency == 'record' else 'None - Only used for frequency type of record, pauses only without a throttle rate'}
                     Wait Time(s):       {self.wait_time}
                     Database(s):        {self.db_names}
                 '''), '  '))
@@ -242,59 +316,112 @@ class Governor:
     def govern_cleanup(self, *args, **kwargs):
         """  Tasks to perform when shutting down, e.g., close DB connections """
 
-        for db_objs in self.connect_dict.values():
+        # Stop the monitor thread before closing the connections it uses
+        if hasattr(self, 'monitor'):
+            self.monitor_stop.set()
+            if self.monitor is not threading.current_thread():
+                self.monitor.join()
+            self.monitor_executor.shutdown(wait=False)
+
+        # Not set if creating the governor failed
+        for db_objs in getattr(self, 'connect_dict', {}).values():
             db_objs[1].close()
             db_objs[0].close()
 
         return
 
+    def query_age(self, db_objs):
+        """ XID age of one DB, db_objs - 0 = connection, 1 = cursor, 2 = DSN """
+
+        db_objs[1].execute(self.sql_stmt, (db_objs[2],))
+        return db_objs[2], db_objs[1].fetchone()[0]
+
+    def start_monitor(self):
+        """ First poll before starting the monitor thread, connection or query errors are raised creating the governor """
+
+        self.poll()
+        self.monitor_executor = ThreadPoolExecutor(max_workers=len(self.connect_dict))
+        self.monitor = threading.Thread(target=monitor_polls, args=(weakref.ref(self), self.monitor_stop, self.check_time_interval), daemon=True)
+        self.monitor.start()
+
+    def poll(self, executor=None):
+        """ Query the XID age of each DB (single or clustered), at the same time when there are several """
+
+        db_objs_list = list(self.connect_dict.values())
+        ages = dict(executor.map(self.query_age, db_objs_list) if executor else map(self.query_age, db_objs_list))
+
+        self.current_ages = ages
+        self.max_age = max(ages.values())
+
+        if self.throttle_rate:
+            self.update_rate()
+
+    def update_rate(self):
+        """ Ramp the target rate down linearly from throttle_rate at throttle_age to throttle_min_rate at xid_age """
+
+        if self.max_age <= self.throttle_age:
+            rate = None
+        else:
+            remaining = max(0.0, (self.xid_age - self.max_age) / (self.xid_age - self.throttle_age))
+            rate = max(self.throttle_min_rate, int(self.throttle_rate * remaining))
+
+        if rate and not self.current_rate:
+            self.print_or_log(f'\nWARNING: {self.type} - XID age {self.max_age} over throttle age {self.throttle_age}, throttling to {rate} records per second\n', 'WARN')
+        elif not rate and self.current_rate:
+            self.print_or_log(f'\nINFO: {self.type} - XID age {self.max_age} back under throttle age {self.throttle_age}, resuming full speed\n')
+
+        self.current_rate = rate
+
+    def target_rate(self):
+        """ Records per second G2Loader readers should keep to, None for full speed """
+
+        return self.current_rate
+
     def record_action(self):
-        """ Action to be performed when record or time interval is met, for each DB (single or clustered)
-            db_objs - 0 = connection, 1 = cursor, 2 = DSN
-        """
+        """ Action to be performed when called for records, a read of the latest XID age polled unless over the threshold """
 
-        # Serialize threads to perform expensive work and check if a pause and vacuum is needed
+        if self.monitor_error:
+            raise self.monitor_error
+
+        if self.max_age <= self.xid_age:
+            return
+
+        # Serialize threads, one reports the pause and the others wait with it
         with self.threads_lock:
 
-            # Check each database connection, in hybrid mode will be > 1
-            for db_objs in self.connect_dict.values():
+            db_name, current_age = max(self.current_ages.items(), key=lambda db_age: db_age[1])
 
-                try:
-                    db_objs[1].execute(self.sql_stmt, (db_objs[2],))
-                    current_age = db_objs[1].fetchone()[0]
-                except self.psycopg2.DatabaseError as ex:
-                    raise ex
-                except Exception as ex:
-                    raise ex
-
-                if current_age > self.xid_age:
-                    self.print_or_log(textwrap.indent(textwrap.dedent(f'''\n\
-                        WARNING: Transaction ID (XID) age threshold reached. Ingestion paused, vacuum required on database(s) to resume
-
-                              Triggering governor:    {self.type}
-                              XID age trigger:        {self.xid_age}
-                              XID age currently:      {current_age}
-                              XID target to resume:   {self.resume_age}
-                              Triggered on DB:        {db_objs[2]}
-                              DB Clustering:          {self.connect_hybrid}
-                              DB(s) to vacuum:        {self.db_names}
-                              '''), '  '), 'WARN')
-
-                    # Wait for a manual vacuum to lower XID age < resume_age
-                    while current_age > self.resume_age:
-
-                        self.print_or_log(f'\t{datetime.now().strftime("%I:%M%p")} - Database: {db_objs[2]}, Current XID age: {current_age}, Target age: {self.resume_age} - Sleeping for {self.wait_time}s...', 'WARN')
-                        time.sleep(self.wait_time)
-                        db_objs[1].execute(self.sql_stmt, [db_objs[2]])
-                        current_age = db_objs[1].fetchone()[0]
-                        # If G2Loader fails or catches CTRL-C, break to end this loop and exit governor
-                        if self.thread_stop.value != 0:
-                            break
-
-                    print()
-
-            # Update the last checked time
-            self.next_check_time = time.time() + self.check_time_interval
+            # Another thread already waited for a vacuum
+            if current_age <= self.xid_age:
+                return
+
+            self.print_or_log(textwrap.indent(textwrap.dedent(f'''\n\
+                WARNING: Transaction ID (XID) age threshold reached. Ingestion paused, vacuum required on database(s) to resume
+
+                      Triggering governor:    {self.type}
+                      XID age trigger:        {self.xid_age}
+                      XID age currently:      {current_age}
+                      XID target to resume:   {self.resume_age}
+                      Triggered on DB:        {db_name}
+                      DB Clustering:          {self.connect_hybrid}
+                      DB(s) to vacuum:        {self.db_names}
+                      '''), '  '), 'WARN')
+
+            # Wait for a manual vacuum to lower XID age < resume_age, the monitor thread keeps polling
+            while current_age > self.resume_age:
+
+                self.print_or_log(f'\t{datetime.now().strftime("%I:%M%p")} - Database: {db_name}, Current XID age: {current_age}, Target age: {self.resume_age} - Sleeping for {self.wait_time}s...', 'WARN')
+                time.sleep(self.wait_time)
+
+                if self.monitor_error:
+                    raise self.monitor_error
+                db_name, current_age = max(self.current_ages.items(), key=lambda db_age: db_age[1])
+
+                # If G2Loader fails or catches CTRL-C, break to end this loop and exit governor
+                if self.thread_stop.value != 0:
+                    break
+
+            print()
 
     def source_action(self):
         """ Action to be performed when triggered for each source, e.g. in multi-source project  """